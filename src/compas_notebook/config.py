@@ -2,6 +2,7 @@ import json
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Literal
+from typing import Optional
 
 from compas.colors import Color
 
@@ -24,6 +25,9 @@ class ViewConfig:
     height: float = 580
     show_grid: bool = True
     show_axes: bool = True
+    culling: bool = False
+    culling_delay: float = 0.2
+    batching: bool = False
 
     camera: CameraConfig = field(init=False)
 
@@ -46,10 +50,41 @@ class UIConfig:
     sidebar = SidebarConfig()
 
 
+@dataclass
+class CacheConfig:
+    maxsize: int = 1024
+    maxbytes: int = 256 * 1024 * 1024
+    tessellation: bool = False
+    tessellation_directory: Optional[str] = None
+    tessellation_maxbytes: int = 1024 * 1024 * 1024
+
+
+@dataclass
+class ProfileConfig:
+    enabled: bool = False
+    show_statusbar: bool = True
+
+
+@dataclass
+class ParallelConfig:
+    workers: int = 1
+
+
+@dataclass
+class PlaybackConfig:
+    fps: float = 30
+    buffersize: int = 16
+    loop: bool = True
+
+
 @dataclass
 class Config:
     view = ViewConfig()
     ui = UIConfig()
+    cache = CacheConfig()
+    profile = ProfileConfig()
+    parallel = ParallelConfig()
+    playback = PlaybackConfig()
 
     @classmethod
     def from_json(cls, filepath):
@@ -60,4 +95,19 @@ class Config:
             if "sidebar" in data["ui"]:
                 config.ui.sidebar.show = data["ui"]["sidebar"].get("show")
                 config.ui.sidebar.items = data["ui"]["sidebar"].get("items")
+        if "cache" in data:
+            config.cache.maxsize = data["cache"].get("maxsize", config.cache.maxsize)
+            config.cache.maxbytes = data["cache"].get("maxbytes", config.cache.maxbytes)
+            config.cache.tessellation = data["cache"].get("tessellation", config.cache.tessellation)
+            config.cache.tessellation_directory = data["cache"].get("tessellation_directory", config.cache.tessellation_directory)
+            config.cache.tessellation_maxbytes = data["cache"].get("tessellation_maxbytes", config.cache.tessellation_maxbytes)
+        if "profile" in data:
+            config.profile.enabled = data["profile"].get("enabled", config.profile.enabled)
+            config.profile.show_statusbar = data["profile"].get("show_statusbar", config.profile.show_statusbar)
+        if "parallel" in data:
+            config.parallel.workers = data["parallel"].get("workers", config.parallel.workers)
+        if "playback" in data:
+            config.playback.fps = data["playback"].get("fps", config.playback.fps)
+            config.playback.buffersize = data["playback"].get("buffersize", config.playback.buffersize)
+            config.playback.loop = data["playback"].get("loop", config.playback.loop)
         return config
@@ -5,6 +5,8 @@ if typing.TYPE_CHECKING:
 
 from compas.geometry import Point
 
+from .scene import ThreePointcloudObject
+
 
 class Controller:
     def __init__(self, viewer: "Viewer"):
@@ -83,6 +85,7 @@ class Controller:
         direction = position - target
         self.viewer.camera3.position = list(target + direction * 0.5)
         self.viewer.controls3.target = list(target)
+        self.refine_pointclouds()
 
     def zoom_out(self) -> None:
         """Zoom out.
@@ -105,6 +108,44 @@ class Controller:
         direction = position - target
         self.viewer.camera3.position = list(target + direction * 2.0)
         self.viewer.controls3.target = list(target)
+        self.coarsen_pointclouds()
+
+    # =============================================================================
+    # Level of detail
+    # =============================================================================
+
+    def refine_pointclouds(self) -> None:
+        """Draw the next finer level of the voxel pyramids of all pointclouds in the scene."""
+        for obj in self.viewer.scene.objects:
+            if isinstance(obj, ThreePointcloudObject):
+                obj.refine()
+        self.viewer.update()
+
+    def coarsen_pointclouds(self) -> None:
+        """Draw the next coarser level of the voxel pyramids of all pointclouds in the scene."""
+        for obj in self.viewer.scene.objects:
+            if isinstance(obj, ThreePointcloudObject):
+                obj.coarsen()
+        self.viewer.update()
+
+    # =============================================================================
+    # Playback
+    # =============================================================================
+
+    def play(self) -> None:
+        """Start the playback of the animations of the scene."""
+        self.viewer.set_statustext("Playing...")
+        self.viewer.play()
+
+    def pause(self) -> None:
+        """Pause the playback of the animations of the scene."""
+        self.viewer.pause()
+        self.viewer.set_statustext(f"Paused at frame {self.viewer.playback.index}")
+
+    def seek(self, change: dict) -> None:
+        """Show the frame selected with the playback slider."""
+        if change["new"] != self.viewer.playback.index:
+            self.viewer.seek(change["new"])
 
     # move this to the scene
     # add a BVH to the scene
@@ -1,4 +1,21 @@
 from .colors import color_to_threejs
+from .colors import colors_to_array
+from .colors import uniform_color
+
+from .compact import compact_indices
+from .compact import dequantization_matrix
+from .compact import quantize_colors
+from .compact import quantize_positions
+
+from .curves import adaptive_parameters
+from .curves import chordal_tolerance
+from .curves import circle_segments
+from .curves import circle_to_points
+from .curves import curve_to_points
+from .curves import ellipse_to_points
+
+from .dots import dots_to_threejs
+from .dots import glyph_atlas
 
 from .geometry import box_to_threejs
 from .geometry import cone_to_threejs
@@ -14,6 +31,12 @@ from .geometry import torus_to_threejs
 from .graphs import nodes_and_edges_to_threejs
 from .graphs import nodes_to_threejs
 
+from .meshes import faces_to_edges
+from .meshes import grid_edges
+from .meshes import grid_faces
+from .meshes import morton_codes
+from .meshes import spatial_chunks
+from .meshes import triangulate_faces
 from .meshes import vertices_and_edges_to_threejs
 from .meshes import vertices_and_faces_to_threejs
 from .meshes import vertices_to_threejs
@@ -21,24 +44,52 @@ from .meshes import vertices_to_threejs
 from .buffers import shapes_to_edgesbuffer
 from .buffers import shapes_to_facesbuffer
 
+from .instances import shapes_to_instancebuffers
+
+from .pointclouds import voxel_downsample
+from .pointclouds import voxel_pyramid
+
 
 __all__ = [
+    "adaptive_parameters",
     "box_to_threejs",
+    "chordal_tolerance",
+    "circle_segments",
+    "circle_to_points",
     "color_to_threejs",
+    "colors_to_array",
+    "compact_indices",
     "cone_to_threejs",
+    "curve_to_points",
     "cylinder_to_threejs",
+    "dequantization_matrix",
     "dot_to_threejs",
+    "dots_to_threejs",
+    "ellipse_to_points",
+    "faces_to_edges",
+    "glyph_atlas",
+    "grid_edges",
+    "grid_faces",
     "line_to_threejs",
+    "morton_codes",
     "nodes_and_edges_to_threejs",
     "nodes_to_threejs",
     "point_to_threejs",
     "pointcloud_to_threejs",
     "polyline_to_threejs",
+    "quantize_colors",
+    "quantize_positions",
     "shapes_to_edgesbuffer",
     "shapes_to_facesbuffer",
+    "shapes_to_instancebuffers",
+    "spatial_chunks",
     "sphere_to_threejs",
     "torus_to_threejs",
+    "triangulate_faces",
+    "uniform_color",
     "vertices_and_edges_to_threejs",
     "vertices_and_faces_to_threejs",
     "vertices_to_threejs",
+    "voxel_downsample",
+    "voxel_pyramid",
 ]
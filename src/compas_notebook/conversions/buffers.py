@@ -4,9 +4,13 @@ import numpy as np
 import pythreejs as three
 from compas.colors import Color
 from compas.datastructures import Mesh
-from compas.geometry import Polygon
 from compas.geometry import Shape
-from compas.geometry import earclip_polygon
+
+from compas_notebook.conversions.compact import apply_matrix
+from compas_notebook.conversions.compact import index_attribute
+from compas_notebook.conversions.compact import position_attribute
+from compas_notebook.conversions.meshes import faces_to_edges
+from compas_notebook.conversions.meshes import triangulate_faces
 
 
 class MeshShape:
@@ -15,29 +19,38 @@ class MeshShape:
         self._vertices = None
         self._edges = None
         self._faces = None
+        self._vertex_index = None
+
+    @property
+    def vertex_index(self) -> dict[int, int]:
+        if self._vertex_index is None:
+            self._vertex_index = self.mesh.vertex_index()
+        return self._vertex_index
 
     @property
-    def vertices(self) -> list[list[float]]:
-        if not self._vertices:
-            self._vertices = self.mesh.vertices_attributes("xyz")
-        return self._vertices  # type: ignore
+    def vertices(self) -> np.ndarray:
+        if self._vertices is None:
+            self._vertices = np.array(self.mesh.vertices_attributes("xyz"), dtype=np.float64).reshape(-1, 3)
+        return self._vertices
 
     @property
-    def edges(self) -> list[tuple[int, int]]:
-        if not self._edges:
-            self._edges = list(self.mesh.edges())
-        return self._edges  # type: ignore
+    def edges(self) -> np.ndarray:
+        if self._edges is None:
+            self._edges = faces_to_edges(self.faces).astype(np.uint32)
+        return self._edges
 
     @property
     def faces(self) -> list[list[int]]:
-        if not self._faces:
-            self._faces = [self.mesh.face_vertices(face) for face in self.mesh.faces()]
+        if self._faces is None:
+            vertex_index = self.vertex_index
+            self._faces = [[vertex_index[vertex] for vertex in self.mesh.face_vertices(face)] for face in self.mesh.faces()]
         return self._faces
 
 
 def shapes_to_edgesbuffer(
     shapes: list[Mesh | Shape],
     color: Color,
+    compact: bool = False,
 ) -> three.LineSegments:
     """Convert the combined edges of a collection of shapes to one line segment buffer.
 
@@ -47,38 +60,35 @@ def shapes_to_edgesbuffer(
         The shape collection.
     color
         The color of the edges.
+    compact
+        If True, use quantized 16-bit positions and 16-bit indices where possible.
 
     Returns
     -------
     pythreejs.LineSegments
 
     """
-    positions = []
-    colors = []
-
-    for shape in shapes:
-        buffer = shape_to_edgesbuffer(shape, color)
-        positions += buffer[0]
-        colors += buffer[1]
-
-    positions = np.array(positions, dtype=np.float32)
-    colors = np.array(colors, dtype=np.float32)
+    positions, edges = merge_buffers([shape_to_edgesbuffer(shape) for shape in shapes], 2)
+    position, matrix = position_attribute(positions, compact=compact)
 
     geometry = three.BufferGeometry(
         attributes={
-            "position": three.BufferAttribute(positions, normalized=False),
-            "color": three.BufferAttribute(colors, normalized=False, itemSize=3),
+            "position": position,
+            "index": index_attribute(edges, compact=compact),
         }
     )
 
-    material = three.LineBasicMaterial(vertexColors="VertexColors")
+    material = three.LineBasicMaterial(color=color.hex)
 
-    return three.LineSegments(geometry, material)
+    lines = three.LineSegments(geometry, material)
+    apply_matrix(lines, matrix)
+    return lines
 
 
 def shapes_to_facesbuffer(
     shapes: list[Mesh],
     color: Color,
+    compact: bool = False,
 ) -> three.Mesh:
     """Convert the combined faces of a collection of shapes to one mesh buffer.
 
@@ -88,97 +98,84 @@ def shapes_to_facesbuffer(
         The shape collection.
     color
         The color of the faces.
+    compact
+        If True, use quantized 16-bit positions and 16-bit indices where possible.
 
     Returns
     -------
     pythreejs.Mesh
 
     """
-    positions = []
-    colors = []
-
-    for shape in shapes:
-        buffer = shape_to_facesbuffer(shape, color)
-        positions += buffer[0]
-        colors += buffer[1]
-
-    positions = np.array(positions, dtype=np.float32)
-    colors = np.array(colors, dtype=np.float32)
+    positions, triangles = merge_buffers([shape_to_facesbuffer(shape) for shape in shapes], 3)
+    position, matrix = position_attribute(positions, compact=compact)
 
     geometry = three.BufferGeometry(
         attributes={
-            "position": three.BufferAttribute(positions, normalized=False),
-            "color": three.BufferAttribute(colors, normalized=False, itemSize=3),
+            "position": position,
+            "index": index_attribute(triangles, compact=compact),
         }
     )
 
     material = three.MeshBasicMaterial(
         side="DoubleSide",
-        vertexColors="VertexColors",
+        color=color.hex,
     )
 
-    return three.Mesh(geometry, material)
+    mesh = three.Mesh(geometry, material)
+    apply_matrix(mesh, matrix)
+    return mesh
+
+
+def merge_buffers(buffers: list[tuple[np.ndarray, np.ndarray]], size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Merge the vertex and element index arrays of multiple shapes into one preallocated position and index array.
+
+    Parameters
+    ----------
+    buffers
+        Pairs of vertex and element index arrays.
+    size
+        The number of vertices per element.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The merged (V, 3) float32 position array and the merged (E, size) uint32 index array.
 
+    """
+    positions = np.empty((sum(len(vertices) for vertices, _ in buffers), 3), dtype=np.float32)
+    indices = np.empty((sum(len(elements) for _, elements in buffers), size), dtype=np.uint32)
+
+    v = 0
+    e = 0
+    for vertices, elements in buffers:
+        positions[v : v + len(vertices)] = vertices
+        indices[e : e + len(elements)] = elements
+        indices[e : e + len(elements)] += v
+        v += len(vertices)
+        e += len(elements)
+
+    return positions, indices
 
-def shape_to_edgesbuffer(shape: Union[Mesh, Shape], color: Color) -> tuple[list[list[float]], list[Color]]:
-    positions = []
-    colors = []
 
+def shape_to_edgesbuffer(shape: Union[Mesh, Shape]) -> tuple[np.ndarray, np.ndarray]:
     if isinstance(shape, Mesh):
         meshshape = MeshShape(shape)
     else:
         meshshape = shape
 
-    for u, v in meshshape.edges:
-        positions.append(meshshape.vertices[u])
-        positions.append(meshshape.vertices[v])
-        colors.append(color)
-        colors.append(color)
+    vertices = np.asarray(meshshape.vertices, dtype=np.float64).reshape(-1, 3)
+    edges = np.asarray(meshshape.edges, dtype=np.uint32).reshape(-1, 2)
 
-    return positions, colors
+    return vertices, edges
 
 
-def shape_to_facesbuffer(shape: Union[Mesh, Shape], color: Color) -> tuple[list[list[float]], list[Color]]:
-    positions = []
-    colors = []
-
+def shape_to_facesbuffer(shape: Union[Mesh, Shape]) -> tuple[np.ndarray, np.ndarray]:
     if isinstance(shape, Mesh):
         meshshape = MeshShape(shape)
     else:
         meshshape = shape
 
-    for face in meshshape.faces:
-        if len(face) == 3:
-            positions.append(meshshape.vertices[face[0]])
-            positions.append(meshshape.vertices[face[1]])
-            positions.append(meshshape.vertices[face[2]])
-            colors.append(color)
-            colors.append(color)
-            colors.append(color)
-            colors.append(color)
-
-        elif len(face) == 4:
-            positions.append(meshshape.vertices[face[0]])
-            positions.append(meshshape.vertices[face[1]])
-            positions.append(meshshape.vertices[face[2]])
-            colors.append(color)
-            colors.append(color)
-            colors.append(color)
-            positions.append(meshshape.vertices[face[0]])
-            positions.append(meshshape.vertices[face[2]])
-            positions.append(meshshape.vertices[face[3]])
-            colors.append(color)
-            colors.append(color)
-            colors.append(color)
-
-        else:
-            ears = earclip_polygon(Polygon([meshshape.vertices[v] for v in face]))
-            for ear in ears:
-                positions.append(meshshape.vertices[ear[0]])
-                positions.append(meshshape.vertices[ear[1]])
-                positions.append(meshshape.vertices[ear[2]])
-                colors.append(color)
-                colors.append(color)
-                colors.append(color)
-
-    return positions, colors
+    vertices = np.asarray(meshshape.vertices, dtype=np.float64).reshape(-1, 3)
+    triangles, _ = triangulate_faces(vertices, meshshape.faces)
+
+    return vertices, triangles
@@ -1,3 +1,10 @@
+from typing import Any
+from typing import Callable
+from typing import Mapping
+from typing import Optional
+from typing import Union
+
+import numpy
 from compas.colors import Color
 from pythreejs import MeshBasicMaterial
 
@@ -24,3 +31,98 @@ def color_to_threejs(color: Color) -> MeshBasicMaterial:
 
     """
     return MeshBasicMaterial(color=color.hex)
+
+
+def colors_to_array(
+    color: Union[Color, Mapping],
+    ids: numpy.ndarray,
+    key: Callable[[Any], int] = int,
+) -> numpy.ndarray:
+    """Resolve the colors of many elements at once.
+
+    The array is filled with the default color first,
+    and the elements with a stored color are found by a sorted search of their identifiers in the keys of the mapping.
+    Elements may occur more than once.
+
+    Parameters
+    ----------
+    color
+        A single color, or a mapping of element keys to colors, such as a :class:`compas.colors.ColorDict`.
+        The default color of the mapping is its ``default`` attribute, if it has one, or black otherwise.
+    ids
+        The (N,) integer identifiers of the elements.
+    key
+        A function that converts a key of the mapping to the identifier of an element.
+        Keys that cannot be converted are ignored.
+
+    Returns
+    -------
+    numpy.ndarray
+        The (N, 3) float32 colors.
+
+    Examples
+    --------
+    >>> from compas.colors import ColorDict
+    >>> colordict = ColorDict(Color.white())
+    >>> colordict[2] = Color.red()
+    >>> colors_to_array(colordict, numpy.array([0, 1, 2])).tolist()
+    [[1.0, 1.0, 1.0], [1.0, 1.0, 1.0], [1.0, 0.0, 0.0]]
+
+    """
+    ids = numpy.asarray(ids, dtype=numpy.int64).reshape(-1)
+    colors = numpy.empty((len(ids), 3), dtype=numpy.float32)
+
+    if isinstance(color, Color):
+        colors[:] = color.rgb
+        return colors
+
+    default = getattr(color, "default", None)
+    colors[:] = Color.coerce(default).rgb if default else (0.0, 0.0, 0.0)
+    if not len(color) or not len(ids):
+        return colors
+
+    keys = []
+    rgb = []
+    for k, value in color.items():
+        try:
+            keys.append(key(k))
+        except (TypeError, ValueError):
+            continue
+        rgb.append(Color.coerce(value).rgb)
+    if not keys:
+        return colors
+
+    # of keys with the same identifier, the last one wins, as when the colors are assigned one by one
+    keys, last = numpy.unique(numpy.array(keys[::-1], dtype=numpy.int64), return_index=True)
+    rgb = numpy.array(rgb[::-1], dtype=numpy.float32)[last]
+    index = numpy.searchsorted(keys, ids).clip(max=len(keys) - 1)
+    found = keys[index] == ids
+    colors[found] = rgb[index[found]]
+    return colors
+
+
+def uniform_color(colors: numpy.ndarray) -> Optional[Color]:
+    """The color shared by all elements, which can be set on the material instead of sending a color attribute.
+
+    Parameters
+    ----------
+    colors
+        The (N, 3) colors of the elements.
+
+    Returns
+    -------
+    :class:`compas.colors.Color` | None
+        The shared color, or None if the colors differ or there are no elements.
+
+    Examples
+    --------
+    >>> uniform_color(numpy.array([[1.0, 0.0, 0.0], [1.0, 0.0, 0.0]]))
+    Color(red=1.0, green=0.0, blue=0.0, alpha=1.0)
+    >>> uniform_color(numpy.array([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])) is None
+    True
+
+    """
+    colors = numpy.asarray(colors).reshape(-1, 3)
+    if not len(colors) or not (colors == colors[:1]).all():
+        return None
+    return Color(*colors[0].tolist())
@@ -0,0 +1,204 @@
+from typing import Optional
+
+import numpy
+import pythreejs as three
+
+INT16_MAX = 32767
+
+
+def quantization_bounds(positions: numpy.ndarray) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Compute the center and half size of the box in which positions are quantized.
+
+    Parameters
+    ----------
+    positions
+        A (N, 3) array of positions.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The center and the half size of the box, with zero sizes replaced by one.
+
+    """
+    positions = numpy.asarray(positions, dtype=numpy.float64).reshape(-1, 3)
+    if not len(positions):
+        return numpy.zeros(3), numpy.ones(3)
+    pmin = positions.min(axis=0)
+    pmax = positions.max(axis=0)
+    center = (pmin + pmax) / 2
+    half = (pmax - pmin) / 2
+    half[half == 0] = 1.0
+    return center, half
+
+
+def dequantization_matrix(positions: numpy.ndarray) -> list[float]:
+    """Compute the object matrix that maps the quantized positions produced by :func:`quantize_positions` back to their original coordinates.
+
+    Parameters
+    ----------
+    positions
+        A (N, 3) array of the original positions.
+
+    Returns
+    -------
+    list[float]
+        A column-major 4x4 matrix.
+
+    """
+    center, half = quantization_bounds(positions)
+    matrix = numpy.identity(4)
+    matrix[:3, :3] = numpy.diag(half)
+    matrix[:3, 3] = center
+    return matrix.transpose().ravel().tolist()
+
+
+def quantize_positions(positions: numpy.ndarray) -> tuple[numpy.ndarray, list[float]]:
+    """Quantize positions to normalized 16-bit integers in their bounding box.
+
+    Parameters
+    ----------
+    positions
+        A (N, 3) array of positions.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, list[float]]
+        The (N, 3) int16 array of quantized positions,
+        and the column-major object matrix that maps the normalized positions back to their original coordinates.
+
+    Examples
+    --------
+    >>> positions, matrix = quantize_positions([[0, 0, 0], [2, 4, 0]])
+    >>> positions.tolist()
+    [[-32767, -32767, 0], [32767, 32767, 0]]
+    >>> matrix[0], matrix[5], matrix[12], matrix[13]
+    (1.0, 2.0, 1.0, 2.0)
+
+    """
+    positions = numpy.asarray(positions, dtype=numpy.float64).reshape(-1, 3)
+    center, half = quantization_bounds(positions)
+    quantized = numpy.rint((positions - center) / half * INT16_MAX).astype(numpy.int16)
+    return quantized, dequantization_matrix(positions)
+
+
+def quantize_colors(colors: numpy.ndarray) -> numpy.ndarray:
+    """Quantize RGB colors with components between 0 and 1 to normalized 8-bit integers.
+
+    Parameters
+    ----------
+    colors
+        A (N, 3) array of colors.
+
+    Returns
+    -------
+    numpy.ndarray
+        A (N, 3) uint8 array.
+
+    """
+    colors = numpy.asarray(colors, dtype=numpy.float32).reshape(-1, 3)
+    return numpy.rint(numpy.clip(colors, 0, 1) * 255).astype(numpy.uint8)
+
+
+def compact_indices(indices: numpy.ndarray) -> numpy.ndarray:
+    """Convert element indices to 16-bit integers if all indices fit, and to 32-bit integers otherwise.
+
+    Parameters
+    ----------
+    indices
+        An array of vertex indices.
+
+    Returns
+    -------
+    numpy.ndarray
+
+    """
+    indices = numpy.asarray(indices)
+    if not indices.size or indices.max() <= numpy.iinfo(numpy.uint16).max:
+        return indices.astype(numpy.uint16)
+    return indices.astype(numpy.uint32)
+
+
+def position_attribute(positions: numpy.ndarray, compact: bool = False) -> tuple[three.BufferAttribute, Optional[list[float]]]:
+    """Convert positions to a buffer attribute.
+
+    Parameters
+    ----------
+    positions
+        A (N, 3) array of positions.
+    compact
+        If True, quantize the positions to normalized 16-bit integers.
+
+    Returns
+    -------
+    tuple[three.BufferAttribute, list[float] | None]
+        The attribute, and the dequantization matrix of compact positions.
+
+    """
+    if compact:
+        positions, matrix = quantize_positions(positions)
+        return three.BufferAttribute(positions, normalized=True), matrix
+    positions = numpy.asarray(positions, dtype=numpy.float32).reshape(-1, 3)
+    return three.BufferAttribute(positions, normalized=False), None
+
+
+def color_attribute(colors: numpy.ndarray, compact: bool = False) -> three.BufferAttribute:
+    """Convert RGB colors to a buffer attribute.
+
+    Parameters
+    ----------
+    colors
+        A (N, 3) array of colors.
+    compact
+        If True, quantize the colors to normalized 8-bit integers.
+
+    Returns
+    -------
+    three.BufferAttribute
+
+    """
+    if compact:
+        return three.BufferAttribute(quantize_colors(colors), normalized=True, itemSize=3)
+    colors = numpy.asarray(colors, dtype=numpy.float32).reshape(-1, 3)
+    return three.BufferAttribute(colors, normalized=False, itemSize=3)
+
+
+def index_attribute(indices: numpy.ndarray, compact: bool = False) -> three.BufferAttribute:
+    """Convert element indices to an index buffer attribute.
+
+    Parameters
+    ----------
+    indices
+        A (E, k) array of element indices.
+    compact
+        If True, use 16-bit indices if all indices fit.
+
+    Returns
+    -------
+    three.BufferAttribute
+
+    """
+    indices = numpy.asarray(indices)
+    itemsize = indices.shape[1] if indices.ndim == 2 else 1
+    array = compact_indices(indices) if compact else indices.astype(numpy.uint32)
+    return three.BufferAttribute(array.ravel(), normalized=False, itemSize=itemsize)
+
+
+def apply_matrix(obj: three.Object3D, matrix: Optional[list[float]]) -> None:
+    """Set the dequantization matrix of compact positions as the matrix of an object.
+
+    Parameters
+    ----------
+    obj
+        The pythreejs object.
+    matrix
+        A column-major 4x4 matrix, or None for objects with regular positions.
+
+    Returns
+    -------
+    None
+
+    """
+    if matrix is None:
+        return
+    obj.matrix = matrix
+    obj.matrixAutoUpdate = False
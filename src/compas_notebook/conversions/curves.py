@@ -0,0 +1,262 @@
+import math
+from typing import Callable
+from typing import Optional
+
+import numpy
+import pythreejs as three
+from compas.geometry import Circle
+from compas.geometry import Curve
+from compas.geometry import Ellipse
+
+
+def circle_segments(radius: float, tolerance: float, minsegments: int = 8, maxsegments: int = 4096) -> int:
+    """Compute the number of segments of a regular polygon that approximates a circle within a chordal tolerance.
+
+    The chordal deviation of a segment spanning an angle ``a`` is ``radius * (1 - cos(a / 2))``.
+
+    Parameters
+    ----------
+    radius
+        The radius of the circle.
+    tolerance
+        The maximum distance between the segments and the circle.
+    minsegments
+        The minimum number of segments.
+    maxsegments
+        The maximum number of segments.
+
+    Returns
+    -------
+    int
+
+    Examples
+    --------
+    >>> circle_segments(1.0, 0.01)
+    23
+    >>> circle_segments(0.001, 0.01)
+    8
+
+    """
+    if tolerance <= 0:
+        return maxsegments
+    if tolerance >= radius:
+        return minsegments
+    angle = 2 * math.acos(1 - tolerance / radius)
+    return min(max(int(math.ceil(2 * math.pi / angle)), minsegments), maxsegments)
+
+
+def adaptive_parameters(
+    evaluate: Callable[[numpy.ndarray], numpy.ndarray],
+    domain: tuple[float, float],
+    tolerance: float,
+    minsegments: int = 8,
+    maxsegments: int = 4096,
+) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Sample a parametric curve such that the chordal deviation of the resulting polyline is within a tolerance.
+
+    Starting from ``minsegments`` uniform segments, the curve is evaluated at the midpoints of the parameter intervals of all segments at once,
+    and the segments for which the distance between the midpoint and the chord exceeds the tolerance are split in two,
+    until all segments are within the tolerance or the number of segments reaches ``maxsegments``.
+
+    Parameters
+    ----------
+    evaluate
+        A function that computes the (N, 3) points of the curve at an array of N parameters.
+    domain
+        The start and end of the parameter domain.
+    tolerance
+        The maximum distance between the chords and the curve.
+    minsegments
+        The minimum number of segments.
+    maxsegments
+        The maximum number of segments.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The sorted parameters, and the points of the curve at the parameters.
+
+    Examples
+    --------
+    >>> line = lambda t: numpy.column_stack([t, t, t])
+    >>> params, points = adaptive_parameters(line, (0.0, 1.0), 0.01, minsegments=2)
+    >>> params.tolist()
+    [0.0, 0.5, 1.0]
+
+    """
+    params = numpy.linspace(domain[0], domain[1], minsegments + 1)
+    points = numpy.asarray(evaluate(params), dtype=numpy.float64).reshape(-1, 3)
+
+    while len(params) - 1 < maxsegments:
+        mids = (params[:-1] + params[1:]) / 2
+        midpoints = numpy.asarray(evaluate(mids), dtype=numpy.float64).reshape(-1, 3)
+
+        # distance between the midpoints of the curve and the chords
+        a = points[:-1]
+        ab = points[1:] - a
+        lengths = (ab * ab).sum(axis=1)
+        t = numpy.clip(((midpoints - a) * ab).sum(axis=1) / numpy.where(lengths > 0, lengths, 1), 0, 1)
+        deviation = numpy.linalg.norm(midpoints - (a + t[:, None] * ab), axis=1)
+
+        split = numpy.flatnonzero(deviation > tolerance)
+        if not len(split):
+            break
+        if len(split) > maxsegments - (len(params) - 1):
+            split = split[numpy.argsort(deviation[split])[::-1][: maxsegments - (len(params) - 1)]]
+            split.sort()
+
+        params = numpy.insert(params, split + 1, mids[split])
+        points = numpy.insert(points, split + 1, midpoints[split], axis=0)
+
+    return params, points
+
+
+def pixel_size(camera: three.Camera, point: list[float], height: float) -> float:
+    """Compute the size in model units of one pixel of the view at a point.
+
+    Parameters
+    ----------
+    camera
+        A perspective or orthographic pythreejs camera.
+    point
+        The point.
+    height
+        The height of the view in pixels.
+
+    Returns
+    -------
+    float
+
+    """
+    if isinstance(camera, three.PerspectiveCamera):
+        distance = float(numpy.linalg.norm(numpy.asarray(point, dtype=numpy.float64) - numpy.asarray(camera.position, dtype=numpy.float64)))
+        return 2 * distance * math.tan(math.radians(camera.fov) / 2) / (camera.zoom * height)
+    if isinstance(camera, three.OrthographicCamera):
+        return (camera.top - camera.bottom) / (camera.zoom * height)
+    raise NotImplementedError
+
+
+def chordal_tolerance(
+    size: float,
+    center: list[float],
+    tolerance: float = 1e-3,
+    pixels: Optional[float] = None,
+    camera: Optional[three.Camera] = None,
+    height: Optional[float] = None,
+) -> float:
+    """Compute the absolute chordal tolerance for discretizing an object.
+
+    Parameters
+    ----------
+    size
+        The size of the object.
+    center
+        The center of the object.
+    tolerance
+        The tolerance relative to the size of the object.
+    pixels
+        The tolerance in pixels of the projected object.
+        Only used if a camera and the height of the view are available.
+    camera
+        The camera of the view.
+    height
+        The height of the view in pixels.
+
+    Returns
+    -------
+    float
+
+    """
+    if pixels is not None and camera is not None and height:
+        return pixels * pixel_size(camera, center, height)
+    return tolerance * size
+
+
+def circle_to_points(circle: Circle, tolerance: float, minsegments: int = 8, maxsegments: int = 4096) -> numpy.ndarray:
+    """Discretize a circle within a chordal tolerance.
+
+    Parameters
+    ----------
+    circle
+        The circle.
+    tolerance
+        The maximum distance between the segments and the circle.
+    minsegments
+        The minimum number of segments.
+    maxsegments
+        The maximum number of segments.
+
+    Returns
+    -------
+    numpy.ndarray
+        The (N, 3) vertices of the closed polygon, without repeating the first vertex.
+
+    """
+    n = circle_segments(circle.radius, tolerance, minsegments, maxsegments)
+    angles = numpy.linspace(0, 2 * math.pi, n, endpoint=False)
+    frame = circle.frame
+    return (
+        numpy.asarray(frame.point, dtype=numpy.float64) + numpy.outer(circle.radius * numpy.cos(angles), frame.xaxis) + numpy.outer(circle.radius * numpy.sin(angles), frame.yaxis)
+    )
+
+
+def ellipse_to_points(ellipse: Ellipse, tolerance: float, minsegments: int = 8, maxsegments: int = 4096) -> numpy.ndarray:
+    """Discretize an ellipse within a chordal tolerance.
+
+    The vertices are denser near the ends of the major axis, where the curvature of the ellipse is highest.
+
+    Parameters
+    ----------
+    ellipse
+        The ellipse.
+    tolerance
+        The maximum distance between the segments and the ellipse.
+    minsegments
+        The minimum number of segments.
+    maxsegments
+        The maximum number of segments.
+
+    Returns
+    -------
+    numpy.ndarray
+        The (N, 3) vertices of the closed polygon, without repeating the first vertex.
+
+    """
+    frame = ellipse.frame
+    origin = numpy.asarray(frame.point, dtype=numpy.float64)
+    xaxis = numpy.asarray(frame.xaxis, dtype=numpy.float64)
+    yaxis = numpy.asarray(frame.yaxis, dtype=numpy.float64)
+
+    def evaluate(angles):
+        return origin + numpy.outer(ellipse.major * numpy.cos(angles), xaxis) + numpy.outer(ellipse.minor * numpy.sin(angles), yaxis)
+
+    _, points = adaptive_parameters(evaluate, (0, 2 * math.pi), tolerance, minsegments, maxsegments)
+    return points[:-1]
+
+
+def curve_to_points(curve: Curve, tolerance: float, minsegments: int = 8, maxsegments: int = 4096) -> numpy.ndarray:
+    """Discretize a curve within a chordal tolerance.
+
+    Parameters
+    ----------
+    curve
+        The curve.
+    tolerance
+        The maximum distance between the segments and the curve.
+    minsegments
+        The minimum number of segments.
+    maxsegments
+        The maximum number of segments.
+
+    Returns
+    -------
+    numpy.ndarray
+        The (N, 3) vertices of the polyline.
+
+    """
+
+    def evaluate(params):
+        return numpy.array([curve.point_at(t) for t in params.tolist()], dtype=numpy.float64).reshape(-1, 3)
+
+    _, points = adaptive_parameters(evaluate, curve.domain, tolerance, minsegments, maxsegments)
+    return points
@@ -0,0 +1,182 @@
+from typing import Union
+
+import numpy
+import pythreejs as three
+from compas.colors import Color
+
+from compas_notebook.geometry import Dot
+
+# the advance of the glyphs of a monospace font, relative to the font size
+ADVANCE = 0.6
+
+# the maximum width in pixels of one page of the glyph atlas
+MAXWIDTH = 4096
+
+VERTEXSHADER = """
+attribute vec2 offset;
+attribute vec3 labelcolor;
+uniform float scale;
+varying vec2 vUv;
+varying vec3 vColor;
+
+void main() {
+    vUv = uv;
+    vColor = labelcolor;
+    vec4 mvPosition = modelViewMatrix * vec4(position, 1.0);
+    float factor = scale;
+    if (projectionMatrix[2][3] == -1.0) {
+        factor *= -mvPosition.z;
+    }
+    mvPosition.xy += offset * factor;
+    gl_Position = projectionMatrix * mvPosition;
+}
+"""
+
+FRAGMENTSHADER = """
+uniform sampler2D map;
+varying vec2 vUv;
+varying vec3 vColor;
+
+void main() {
+    vec4 texel = texture2D(map, vUv);
+    if (texel.a < 0.1) discard;
+    gl_FragColor = vec4(vColor, texel.a);
+}
+"""
+
+
+def glyph_atlas(strings: list[str], fontsize: int = 64) -> list[str]:
+    """Collect the unique characters of a list of strings into the pages of a glyph atlas.
+
+    Every page is rasterized once, in the browser, as one line of text in a monospace font,
+    such that the glyph of the i-th character of a page of n characters occupies the i-th of n equal cells.
+    The number of characters per page is limited such that the width of a page stays below 4096 pixels.
+
+    Parameters
+    ----------
+    strings
+        The strings.
+    fontsize
+        The font size in pixels of the rasterized glyphs.
+
+    Returns
+    -------
+    list[str]
+        The characters of every page.
+
+    Examples
+    --------
+    >>> glyph_atlas(["node 1", "node 2", "node 1"])
+    [' 12deno']
+
+    """
+    characters = "".join(sorted(set("".join(strings))))
+    perpage = max(1, int(MAXWIDTH / (ADVANCE * fontsize)))
+    return [characters[i : i + perpage] for i in range(0, len(characters), perpage)]
+
+
+def dots_to_threejs(
+    dots: list[Dot],
+    fontsize: int = 64,
+    color: Union[Color, list[Color]] = Color.black(),
+    scale: float = 0.025,
+) -> list[three.Mesh]:
+    """Convert a collection of COMPAS dots to meshes of glyph quads that share a glyph atlas.
+
+    The glyphs of all dots are rasterized once into the texture of the atlas,
+    and every character of every dot is drawn as a quad with the texture coordinates of its glyph.
+    The quads are offset in view space from the location of their dot, such that the labels face the camera
+    and maintain constant screen size regardless of zoom level, as the sprites of :func:`dot_to_threejs`.
+    All dots are drawn with one mesh per page of the atlas, which is usually one mesh.
+
+    Parameters
+    ----------
+    dots
+        The dots to convert.
+    fontsize
+        The font size in pixels of the rasterized glyphs.
+    color
+        The color of the text, or a list with the color of every dot.
+    scale
+        The height of the text, in the units of the sprites of :func:`dot_to_threejs`.
+
+    Returns
+    -------
+    list[three.Mesh]
+        One mesh per page of the glyph atlas.
+
+    """
+    texts = [dot.text for dot in dots]
+    pages = glyph_atlas(texts, fontsize=fontsize)
+    if not pages:
+        return []
+
+    if isinstance(color, Color):
+        colors = numpy.tile(numpy.array(color.rgb, dtype=numpy.float32), (len(dots), 1))
+    else:
+        colors = numpy.array([Color.coerce(c).rgb for c in color], dtype=numpy.float32).reshape(-1, 3)
+
+    # the page and the cell in the page of every character
+    page = {}
+    cell = {}
+    for p, characters in enumerate(pages):
+        for i, character in enumerate(characters):
+            page[character] = p
+            cell[character] = i
+
+    lengths = numpy.array([len(text) for text in texts], dtype=numpy.int64)
+    characters = "".join(texts)
+    label = numpy.repeat(numpy.arange(len(dots)), lengths)
+    column = numpy.arange(len(characters)) - numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+    pageindex = numpy.array([page[character] for character in characters], dtype=numpy.int64)
+    cellindex = numpy.array([cell[character] for character in characters], dtype=numpy.int64)
+
+    points = numpy.array([dot.point for dot in dots], dtype=numpy.float32).reshape(-1, 3)
+
+    # the corners of a glyph quad, counterclockwise from the bottom left
+    cornerx = numpy.array([0, 1, 1, 0], dtype=numpy.float32)
+    cornery = numpy.array([-0.5, -0.5, 0.5, 0.5], dtype=numpy.float32)
+
+    meshes = []
+    for p, pagecharacters in enumerate(pages):
+        selected = numpy.flatnonzero(pageindex == p)
+        if not len(selected):
+            continue
+
+        n = len(selected)
+        labels = label[selected]
+        left = (column[selected] - lengths[labels] / 2) * ADVANCE
+
+        positions = numpy.repeat(points[labels], 4, axis=0)
+        offsets = numpy.empty((n, 4, 2), dtype=numpy.float32)
+        offsets[:, :, 0] = left[:, None] + cornerx * ADVANCE
+        offsets[:, :, 1] = cornery
+        uvs = numpy.empty((n, 4, 2), dtype=numpy.float32)
+        uvs[:, :, 0] = (cellindex[selected][:, None] + cornerx) / len(pagecharacters)
+        uvs[:, :, 1] = cornery + 0.5
+        labelcolors = numpy.repeat(colors[labels], 4, axis=0)
+
+        quads = 4 * numpy.arange(n, dtype=numpy.uint32)[:, None]
+        triangles = (quads + numpy.array([0, 1, 2, 0, 2, 3], dtype=numpy.uint32)).ravel()
+
+        geometry = three.BufferGeometry(
+            attributes={
+                "position": three.BufferAttribute(positions, normalized=False),
+                "offset": three.BufferAttribute(offsets.reshape(-1, 2), normalized=False),
+                "uv": three.BufferAttribute(uvs.reshape(-1, 2), normalized=False),
+                "labelcolor": three.BufferAttribute(labelcolors, normalized=False),
+                "index": three.BufferAttribute(triangles, normalized=False),
+            }
+        )
+        texture = three.TextTexture(string=pagecharacters, size=fontsize, color="white", fontFace="monospace", squareTexture=False)
+        material = three.ShaderMaterial(
+            vertexShader=VERTEXSHADER,
+            fragmentShader=FRAGMENTSHADER,
+            uniforms={"map": {"value": texture}, "scale": {"value": scale}},
+            transparent=True,
+            side="DoubleSide",
+        )
+        # the quads extend beyond the bounding sphere of the dot locations
+        meshes.append(three.Mesh(geometry, material, frustumCulled=False))
+
+    return meshes
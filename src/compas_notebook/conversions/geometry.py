@@ -1,7 +1,9 @@
 import math
+from typing import Optional
 
 import numpy
 import pythreejs as three
+from compas.colors import Color
 from compas.geometry import Box
 from compas.geometry import Circle
 from compas.geometry import Cone
@@ -19,8 +21,13 @@ from compas.geometry import Surface
 from compas.geometry import Torus
 from compas.geometry import Vector
 
-from compas_notebook.conversions.meshes import vertices_and_edges_to_threejs
-from compas_notebook.conversions.meshes import vertices_and_faces_to_threejs
+from compas_notebook.conversions.compact import index_attribute
+from compas_notebook.conversions.compact import position_attribute
+from compas_notebook.conversions.curves import circle_to_points
+from compas_notebook.conversions.curves import curve_to_points
+from compas_notebook.conversions.curves import ellipse_to_points
+from compas_notebook.conversions.meshes import grid_edges
+from compas_notebook.conversions.meshes import grid_faces
 from compas_notebook.geometry import Dot
 
 
@@ -42,37 +49,67 @@ def line_to_threejs(line: Line) -> three.BufferGeometry:
     return geometry
 
 
-def frame_to_threejs(frame: Frame) -> list[three.BufferGeometry]:
+def segments_to_threejs(
+    vertices: numpy.ndarray,
+    colors: numpy.ndarray,
+    material: Optional[three.LineBasicMaterial] = None,
+) -> three.LineSegments:
+    """Convert pairs of vertices to one PyThreeJS line segments object with vertex colors.
+
+    Parameters
+    ----------
+    vertices
+        The (2 * S, 3) start and end points of the segments.
+    colors
+        The (2 * S, 3) RGB colors of the start and end points, in the range 0 to 1.
+    material
+        The material of the line segments, for example a pooled material shared with other objects.
+        If None, a new material with vertex colors is created.
+
+    Returns
+    -------
+    three.LineSegments
+
+    """
+    geometry = three.BufferGeometry(
+        attributes={
+            "position": three.BufferAttribute(numpy.asarray(vertices, dtype=numpy.float32).reshape(-1, 3), normalized=False),
+            "color": three.BufferAttribute(numpy.asarray(colors, dtype=numpy.float32).reshape(-1, 3), normalized=False),
+        }
+    )
+    if material is None:
+        material = three.LineBasicMaterial(vertexColors="VertexColors")
+    return three.LineSegments(geometry, material)
+
+
+def frame_to_threejs(frame: Frame, material: Optional[three.LineBasicMaterial] = None) -> list[three.LineSegments]:
     """Convert a COMPAS frame to PyThreeJS.
 
+    The axes are drawn as one line segments object,
+    with the x-axis in red, the y-axis in green, and the z-axis in blue.
+
     Parameters
     ----------
     frame
         The frame to convert.
+    material
+        The material of the line segments, for example a pooled material shared with other objects.
+        If None, a new material with vertex colors is created.
 
     Returns
     -------
-    list[three.BufferGeometry]
+    list[three.LineSegments]
 
     """
+    point = numpy.array(frame.point, dtype=numpy.float32)
+    axes = numpy.array([frame.xaxis, frame.yaxis, frame.zaxis], dtype=numpy.float32)
 
-    # create lines for each axis
-    _x_line = Line(frame.point, frame.point + frame.xaxis)
-    _y_line = Line.from_point_and_vector(frame.point, frame.yaxis)
-    _z_line = Line.from_point_and_vector(frame.point, frame.zaxis)
-
-    # convert lines to threejs vertex buffers
-    xline_verts = line_to_threejs(_x_line)
-    yline_verts = line_to_threejs(_y_line)
-    zline_verts = line_to_threejs(_z_line)
+    vertices = numpy.empty((3, 2, 3), dtype=numpy.float32)
+    vertices[:, 0] = point
+    vertices[:, 1] = point + axes
 
-    # convert from vertex buffers to line objects
-    xline_lines = three.Line(xline_verts, three.LineBasicMaterial(color="red"))
-    yline_lines = three.Line(yline_verts, three.LineBasicMaterial(color="green"))
-    zline_lines = three.Line(zline_verts, three.LineBasicMaterial(color="blue"))
-
-    result = [xline_lines, yline_lines, zline_lines]
-    return result
+    colors = numpy.array([Color.from_name(name).rgb for name in ("red", "green", "blue")], dtype=numpy.float32)
+    return [segments_to_threejs(vertices.reshape(-1, 3), numpy.repeat(colors, 2, axis=0), material)]
 
 
 def point_to_threejs(point: Point) -> three.SphereGeometry:
@@ -118,7 +155,7 @@ def pointcloud_to_threejs(pointcloud: Pointcloud) -> three.SphereGeometry:
 
     """
     vertices = numpy.array(pointcloud.points, dtype=numpy.float32)
-    geometry = three.BufferGeometry(attributes={"position": three.BufferAttribute(vertices, normalized=False)})
+    geometry = three.BufferGeometry(attributes={"position": position_attribute(vertices)[0]})
     return geometry
 
 
@@ -140,7 +177,7 @@ def polyline_to_threejs(polyline: Polyline) -> three.BufferGeometry:
     return geometry
 
 
-def circle_to_threejs(circle: Circle, max_angle: float = 5.0) -> three.BufferGeometry:
+def circle_to_threejs(circle: Circle, max_angle: float = 5.0, tolerance: Optional[float] = None) -> three.BufferGeometry:
     """Convert a COMPAS circle to PyThreeJS.
 
     Parameters
@@ -149,21 +186,26 @@ def circle_to_threejs(circle: Circle, max_angle: float = 5.0) -> three.BufferGeo
         The circle to convert.
     max_angle
         Maximum angle in degrees between segments.
+    tolerance
+        Maximum distance between the segments and the circle.
+        If provided, the number of segments is derived from the tolerance and ``max_angle`` is ignored.
 
     Returns
     -------
     three.BufferGeometry
 
     """
-
-    n = max(8, int(math.ceil(360.0 / max_angle)))
-    polyline = circle.to_polyline(n=n)
-    vertices = numpy.array(polyline.points, dtype=numpy.float32)
+    if tolerance is not None:
+        vertices = circle_to_points(circle, tolerance).astype(numpy.float32)
+    else:
+        n = max(8, int(math.ceil(360.0 / max_angle)))
+        polyline = circle.to_polyline(n=n)
+        vertices = numpy.array(polyline.points, dtype=numpy.float32)
     geometry = three.BufferGeometry(attributes={"position": three.BufferAttribute(vertices, normalized=False)})
     return geometry
 
 
-def ellipse_to_threejs(ellipse: Ellipse, max_angle: float = 5.0) -> three.BufferGeometry:
+def ellipse_to_threejs(ellipse: Ellipse, max_angle: float = 5.0, tolerance: Optional[float] = None) -> three.BufferGeometry:
     """Convert a COMPAS ellipse to PyThreeJS.
 
     Parameters
@@ -172,20 +214,31 @@ def ellipse_to_threejs(ellipse: Ellipse, max_angle: float = 5.0) -> three.Buffer
         The ellipse to convert.
     max_angle
         Maximum angle in degrees between segments.
+    tolerance
+        Maximum distance between the segments and the ellipse.
+        If provided, the ellipse is sampled adaptively and ``max_angle`` is ignored.
 
     Returns
     -------
     three.BufferGeometry
 
     """
-    n = max(8, int(math.ceil(360.0 / max_angle)))
-    polyline = ellipse.to_polyline(n=n)
-    vertices = numpy.array(polyline.points, dtype=numpy.float32)
+    if tolerance is not None:
+        vertices = ellipse_to_points(ellipse, tolerance).astype(numpy.float32)
+    else:
+        n = max(8, int(math.ceil(360.0 / max_angle)))
+        polyline = ellipse.to_polyline(n=n)
+        vertices = numpy.array(polyline.points, dtype=numpy.float32)
     geometry = three.BufferGeometry(attributes={"position": three.BufferAttribute(vertices, normalized=False)})
     return geometry
 
 
-def vector_to_threejs(vector: Vector, scale: float = 1.0) -> list[three.Object3D]:
+def vector_to_threejs(
+    vector: Vector,
+    scale: float = 1.0,
+    material: Optional[three.LineBasicMaterial] = None,
+    headmaterial: Optional[three.MeshBasicMaterial] = None,
+) -> list[three.Object3D]:
     """Convert a COMPAS vector to PyThreeJS as arrow.
 
     Parameters
@@ -194,17 +247,24 @@ def vector_to_threejs(vector: Vector, scale: float = 1.0) -> list[three.Object3D
         The vector to convert.
     scale
         Scale factor for vector length.
+    material
+        The material of the line segments, for example a pooled material shared with other objects.
+        If None, a new material with vertex colors is created.
+    headmaterial
+        The material of the cone head.
+        If None, a new blue material is created.
 
     Returns
     -------
     list[three.Object3D]
-        Line and cone representing the arrow.
+        Line segments and cone representing the arrow.
 
     """
     # Line from origin to vector * scale
-    line = Line([0, 0, 0], vector * scale)
-    line_geom = line_to_threejs(line)
-    line_obj = three.Line(line_geom, three.LineBasicMaterial(color="blue"))
+    tip = vector * scale
+    vertices = numpy.array([[0, 0, 0], tip], dtype=numpy.float32)
+    colors = numpy.tile(numpy.array(Color.from_name("blue").rgb, dtype=numpy.float32), (2, 1))
+    line_obj = segments_to_threejs(vertices, colors, material)
 
     # Cone head at tip (10% of length, positioned at end)
     length = vector.length * scale
@@ -218,11 +278,10 @@ def vector_to_threejs(vector: Vector, scale: float = 1.0) -> list[three.Object3D
         height=cone_height,
         radialSegments=8,
     )
-    cone_obj = three.Mesh(cone_geom, three.MeshBasicMaterial(color="blue"))
+    cone_obj = three.Mesh(cone_geom, headmaterial or three.MeshBasicMaterial(color="blue"))
 
     # Compute cone position and rotation
     # Cone should point in vector direction
-    tip = vector * scale
     cone_obj.position = (tip.x, tip.y, tip.z)
 
     # Align cone with vector direction
@@ -262,9 +321,16 @@ def _vector_to_quaternion(vector):
     return (axis.x * s, axis.y * s, axis.z * s, math.cos(half_angle))
 
 
-def plane_to_threejs(plane: Plane, size: float = 1.0, grid: int = 10) -> list[three.Object3D]:
+def plane_to_threejs(
+    plane: Plane,
+    size: float = 1.0,
+    grid: int = 10,
+    material: Optional[three.LineBasicMaterial] = None,
+) -> list[three.LineSegments]:
     """Convert a COMPAS plane to PyThreeJS as grid.
 
+    All grid lines are drawn as one line segments object.
+
     Parameters
     ----------
     plane
@@ -273,46 +339,40 @@ def plane_to_threejs(plane: Plane, size: float = 1.0, grid: int = 10) -> list[th
         Size of the grid visualization.
     grid
         Number of grid lines in each direction.
+    material
+        The material of the line segments, for example a pooled material shared with other objects.
+        If None, a new material with vertex colors is created.
 
     Returns
     -------
-    list[three.Object3D]
+    list[three.LineSegments]
         Grid lines in the plane.
 
     """
-    objects = []
-
     # Get frame from plane to have xaxis and yaxis
     frame = Frame.from_plane(plane)
+    point = numpy.array(frame.point, dtype=numpy.float64)
+    xaxis = numpy.array(frame.xaxis, dtype=numpy.float64)
+    yaxis = numpy.array(frame.yaxis, dtype=numpy.float64)
 
     # Create grid lines along xaxis and yaxis directions
-    step = size / grid
     half = size / 2
+    offsets = numpy.linspace(-half, half, grid + 1)[:, None]
 
+    vertices = numpy.empty((2, grid + 1, 2, 3))
     # Lines parallel to xaxis
-    for i in range(grid + 1):
-        offset = -half + i * step
-        start = frame.point + frame.yaxis * offset - frame.xaxis * half
-        end = frame.point + frame.yaxis * offset + frame.xaxis * half
-        line = Line(start, end)
-        line_geom = line_to_threejs(line)
-        line_obj = three.Line(line_geom, three.LineBasicMaterial(color="lightgray"))
-        objects.append(line_obj)
-
+    vertices[0, :, 0] = point + yaxis * offsets - xaxis * half
+    vertices[0, :, 1] = point + yaxis * offsets + xaxis * half
     # Lines parallel to yaxis
-    for i in range(grid + 1):
-        offset = -half + i * step
-        start = frame.point + frame.xaxis * offset - frame.yaxis * half
-        end = frame.point + frame.xaxis * offset + frame.yaxis * half
-        line = Line(start, end)
-        line_geom = line_to_threejs(line)
-        line_obj = three.Line(line_geom, three.LineBasicMaterial(color="lightgray"))
-        objects.append(line_obj)
+    vertices[1, :, 0] = point + xaxis * offsets - yaxis * half
+    vertices[1, :, 1] = point + xaxis * offsets + yaxis * half
+    vertices = vertices.reshape(-1, 3)
 
-    return objects
+    colors = numpy.tile(numpy.array(Color.from_name("lightgray").rgb, dtype=numpy.float32), (len(vertices), 1))
+    return [segments_to_threejs(vertices, colors, material)]
 
 
-def curve_to_threejs(curve: Curve, resolution: int = 100) -> three.BufferGeometry:
+def curve_to_threejs(curve: Curve, resolution: int = 100, tolerance: Optional[float] = None) -> three.BufferGeometry:
     """Convert a COMPAS curve to PyThreeJS.
 
     Parameters
@@ -321,14 +381,20 @@ def curve_to_threejs(curve: Curve, resolution: int = 100) -> three.BufferGeometr
         The curve to convert.
     resolution
         Number of points for discretization.
+    tolerance
+        Maximum distance between the segments and the curve.
+        If provided, the curve is sampled adaptively and ``resolution`` is ignored.
 
     Returns
     -------
     three.BufferGeometry
 
     """
-    polyline = curve.to_polyline(n=resolution)
-    vertices = numpy.array(polyline.points, dtype=numpy.float32)
+    if tolerance is not None:
+        vertices = curve_to_points(curve, tolerance).astype(numpy.float32)
+    else:
+        polyline = curve.to_polyline(n=resolution)
+        vertices = numpy.array(polyline.points, dtype=numpy.float32)
     geometry = three.BufferGeometry(attributes={"position": three.BufferAttribute(vertices, normalized=False)})
     return geometry
 
@@ -336,6 +402,10 @@ def curve_to_threejs(curve: Curve, resolution: int = 100) -> three.BufferGeometr
 def surface_to_threejs(surface: Surface, resolution_u: int = 20, resolution_v: int = 20):
     """Convert a COMPAS surface to PyThreeJS.
 
+    The surface is evaluated on a regular grid of parameters,
+    and the faces and edges of the grid are constructed directly from the grid indices.
+    The mesh and the edges share one buffer of vertex positions.
+
     Parameters
     ----------
     surface
@@ -351,23 +421,19 @@ def surface_to_threejs(surface: Surface, resolution_u: int = 20, resolution_v: i
         Mesh and edge visualization.
 
     """
-    vertices, faces = surface.to_vertices_and_faces(nu=resolution_u, nv=resolution_v)
+    us = numpy.linspace(surface.domain_u[0], surface.domain_u[1], resolution_u + 1).tolist()
+    vs = numpy.linspace(surface.domain_v[0], surface.domain_v[1], resolution_v + 1).tolist()
+    vertices = numpy.array([surface.point_at(u, v) for u in us for v in vs], dtype=numpy.float32)
+    position = position_attribute(vertices)[0]
 
     # Create faces
-    faces_geom = vertices_and_faces_to_threejs(vertices, faces)
+    triangles = grid_faces(resolution_u, resolution_v)[:, [0, 1, 2, 0, 2, 3]].reshape(-1, 3)
+    faces_geom = three.BufferGeometry(attributes={"position": position, "index": index_attribute(triangles)})
     mesh = three.Mesh(faces_geom, three.MeshBasicMaterial(color="lightblue", side="DoubleSide"))
 
     # Create edges
-    edges = []
-    for face in faces:
-        n = len(face)
-        for i in range(n):
-            edge = (face[i], face[(i + 1) % n])
-            # Add edge if not duplicate
-            if (edge[1], edge[0]) not in edges:
-                edges.append(edge)
-
-    edges_geom = vertices_and_edges_to_threejs(vertices, edges)
+    edges = grid_edges(resolution_u, resolution_v)
+    edges_geom = three.BufferGeometry(attributes={"position": position, "index": index_attribute(edges)})
     lines = three.LineSegments(edges_geom, three.LineBasicMaterial(color="black"))
 
     return [mesh, lines]
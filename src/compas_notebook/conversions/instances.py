@@ -0,0 +1,237 @@
+from typing import Union
+
+import numpy
+import pythreejs as three
+from compas.colors import Color
+from compas.geometry import Box
+from compas.geometry import Cone
+from compas.geometry import Cylinder
+from compas.geometry import Shape
+from compas.geometry import Sphere
+
+from compas_notebook.conversions.meshes import triangulate_faces
+
+INSTANCEABLE = (Box, Cone, Cylinder, Sphere)
+
+VERTEXSHADER = """
+attribute vec4 instanceMatrix0;
+attribute vec4 instanceMatrix1;
+attribute vec4 instanceMatrix2;
+attribute vec4 instanceMatrix3;
+attribute vec3 instanceColor;
+varying vec3 vColor;
+
+void main() {
+    mat4 instanceMatrix = mat4(instanceMatrix0, instanceMatrix1, instanceMatrix2, instanceMatrix3);
+    vColor = instanceColor;
+    gl_Position = projectionMatrix * modelViewMatrix * instanceMatrix * vec4(position, 1.0);
+}
+"""
+
+FRAGMENTSHADER = """
+varying vec3 vColor;
+
+void main() {
+    gl_FragColor = vec4(vColor, 1.0);
+}
+"""
+
+
+def shape_to_unitshape(shape: Shape) -> tuple[tuple, Shape, list[float]]:
+    """Decompose a primitive shape into a unit shape and a scale factor per axis.
+
+    Parameters
+    ----------
+    shape
+        A box, cone, cylinder, or sphere.
+
+    Returns
+    -------
+    tuple[tuple, :class:`compas.geometry.Shape`, list[float]]
+        A key identifying the unit shape, the unit shape, and the scale factors.
+
+    Raises
+    ------
+    TypeError
+        If the shape is not a box, cone, cylinder, or sphere.
+
+    """
+    if isinstance(shape, Box):
+        return ("Box",), Box(1), [shape.xsize, shape.ysize, shape.zsize]
+    if isinstance(shape, Sphere):
+        key = "Sphere", shape.resolution_u, shape.resolution_v
+        unit = Sphere(1)
+        unit.resolution_u = shape.resolution_u
+        unit.resolution_v = shape.resolution_v
+        return key, unit, [shape.radius, shape.radius, shape.radius]
+    if isinstance(shape, Cylinder):
+        key = "Cylinder", shape.resolution_u
+        unit = Cylinder(1, 1)
+        unit.resolution_u = shape.resolution_u
+        return key, unit, [shape.radius, shape.radius, shape.height]
+    if isinstance(shape, Cone):
+        key = "Cone", shape.resolution_u
+        unit = Cone(1, 1)
+        unit.resolution_u = shape.resolution_u
+        return key, unit, [shape.radius, shape.radius, shape.height]
+    raise TypeError(f"Only boxes, cones, cylinders, and spheres can be drawn as instances, not {type(shape).__name__}.")
+
+
+def instance_matrices(shapes: list[Shape], scales: list[list[float]]) -> numpy.ndarray:
+    """Compute the instance matrices of a list of shapes from their frames and scale factors.
+
+    Parameters
+    ----------
+    shapes
+        The shapes.
+    scales
+        The scale factors per axis of every shape.
+
+    Returns
+    -------
+    numpy.ndarray
+        A (N, 4, 4) float32 array of transformation matrices.
+
+    """
+    points = numpy.array([shape.frame.point for shape in shapes], dtype=numpy.float64).reshape(-1, 3)
+    xaxes = numpy.array([shape.frame.xaxis for shape in shapes], dtype=numpy.float64).reshape(-1, 3)
+    yaxes = numpy.array([shape.frame.yaxis for shape in shapes], dtype=numpy.float64).reshape(-1, 3)
+    zaxes = numpy.cross(xaxes, yaxes)
+    scales = numpy.array(scales, dtype=numpy.float64).reshape(-1, 3)
+
+    matrices = numpy.zeros((len(shapes), 4, 4), dtype=numpy.float32)
+    matrices[:, :3, 0] = xaxes * scales[:, 0:1]
+    matrices[:, :3, 1] = yaxes * scales[:, 1:2]
+    matrices[:, :3, 2] = zaxes * scales[:, 2:3]
+    matrices[:, :3, 3] = points
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+
+def instance_colors(color: Union[Color, list[Color]], count: int) -> numpy.ndarray:
+    """Convert one color or a color per instance to an array of instance colors.
+
+    Parameters
+    ----------
+    color
+        One color for all instances, or a color per instance.
+    count
+        The number of instances.
+
+    Returns
+    -------
+    numpy.ndarray
+        A (N, 3) float32 array of RGB colors.
+
+    Raises
+    ------
+    ValueError
+        If the number of colors is not the number of instances.
+
+    """
+    if isinstance(color, Color):
+        return numpy.tile(numpy.array(color.rgb, dtype=numpy.float32), (count, 1))
+    colors = numpy.array([c.rgb for c in color], dtype=numpy.float32).reshape(-1, 3)
+    if len(colors) != count:
+        raise ValueError(f"Expected {count} instance colors, got {len(colors)}.")
+    return colors
+
+
+def instances_to_threejs(
+    vertices: numpy.ndarray,
+    elements: numpy.ndarray,
+    matrices: numpy.ndarray,
+    colors: numpy.ndarray,
+) -> three.InstancedBufferGeometry:
+    """Convert a base geometry and per-instance matrices and colors to an instanced PyThreeJS geometry.
+
+    Parameters
+    ----------
+    vertices
+        The (V, 3) vertices of the base geometry.
+    elements
+        The (E, k) element index array of the base geometry.
+    matrices
+        The (N, 4, 4) instance matrices.
+    colors
+        The (N, 3) instance colors.
+
+    Returns
+    -------
+    three.InstancedBufferGeometry
+
+    """
+    attributes = {
+        "position": three.BufferAttribute(numpy.asarray(vertices, dtype=numpy.float32), normalized=False),
+        "index": three.BufferAttribute(numpy.asarray(elements, dtype=numpy.uint32).ravel(), normalized=False, itemSize=elements.shape[1]),
+        "instanceColor": three.InstancedBufferAttribute(numpy.asarray(colors, dtype=numpy.float32), meshPerAttribute=1),
+    }
+    for i in range(4):
+        column = numpy.ascontiguousarray(matrices[:, :, i], dtype=numpy.float32)
+        attributes[f"instanceMatrix{i}"] = three.InstancedBufferAttribute(column, meshPerAttribute=1)
+
+    return three.InstancedBufferGeometry(attributes=attributes, maxInstancedCount=len(matrices))
+
+
+def shapes_to_instancebuffers(
+    shapes: list[Shape],
+    color: Union[Color, list[Color]],
+    edgecolor: Union[Color, list[Color]],
+) -> list[three.Object3D]:
+    """Convert a collection of primitive shapes to instanced face and edge buffers.
+
+    Shapes of the same type and resolution share one unit geometry.
+    Their frames and dimensions are encoded in per-instance transformation matrices,
+    and their colors in per-instance colors.
+
+    Parameters
+    ----------
+    shapes
+        The shape collection, consisting of boxes, cones, cylinders, and spheres.
+    color
+        The color of the faces, or the face color of every shape.
+    edgecolor
+        The color of the edges, or the edge color of every shape.
+
+    Returns
+    -------
+    list[three.Mesh | three.LineSegments]
+        One mesh and one line segments object per unit geometry.
+
+    Raises
+    ------
+    TypeError
+        If one of the shapes is not a box, cone, cylinder, or sphere.
+
+    """
+    colors = instance_colors(color, len(shapes))
+    edgecolors = instance_colors(edgecolor, len(shapes))
+
+    buckets = {}
+    for index, shape in enumerate(shapes):
+        key, unit, scale = shape_to_unitshape(shape)
+        if key not in buckets:
+            buckets[key] = unit, [], [], []
+        buckets[key][1].append(shape)
+        buckets[key][2].append(scale)
+        buckets[key][3].append(index)
+
+    objects = []
+
+    for unit, shapes, scales, indices in buckets.values():
+        vertices = numpy.array(unit.vertices, dtype=numpy.float64)
+        triangles, _ = triangulate_faces(vertices, unit.faces)
+        edges = numpy.array(unit.edges, dtype=numpy.uint32).reshape(-1, 2)
+        matrices = instance_matrices(shapes, scales)
+
+        geometry = instances_to_threejs(vertices, triangles, matrices, colors[indices])
+        material = three.ShaderMaterial(vertexShader=VERTEXSHADER, fragmentShader=FRAGMENTSHADER, side="DoubleSide")
+        mesh = three.Mesh(geometry, material, frustumCulled=False)
+
+        geometry = instances_to_threejs(vertices, edges, matrices, edgecolors[indices])
+        material = three.ShaderMaterial(vertexShader=VERTEXSHADER, fragmentShader=FRAGMENTSHADER)
+        lines = three.LineSegments(geometry, material, frustumCulled=False)
+
+        objects += [mesh, lines]
+
+    return objects
@@ -1,8 +1,13 @@
+from itertools import chain
+
 import numpy
 import pythreejs as three
 from compas.geometry import Polygon
 from compas.geometry import earclip_polygon
 
+from compas_notebook.conversions.compact import index_attribute
+from compas_notebook.conversions.compact import position_attribute
+
 
 def vertices_and_faces_to_threejs(vertices: list[list[float]], faces: list[list[int]]) -> three.BufferGeometry:
     """Convert vertices and faces to a PyThreeJS geometry.
@@ -20,26 +25,12 @@ def vertices_and_faces_to_threejs(vertices: list[list[float]], faces: list[list[
         The PyThreeJS geometry.
 
     """
-    triangles = []
-    for face in faces:
-        if len(face) == 3:
-            triangles.append(face)
-        elif len(face) == 4:
-            triangles.append([face[0], face[1], face[2]])
-            triangles.append([face[0], face[2], face[3]])
-        else:
-            polygon = Polygon([vertices[v] for v in face])
-            ears = earclip_polygon(polygon)
-            for ear in ears:
-                triangles.append([face[index] for index in ear])
-
-    vertices = numpy.array(vertices, dtype=numpy.float32)  # type: ignore
-    triangles = numpy.array(triangles, dtype=numpy.uint32).ravel()  # type: ignore
+    triangles, _ = triangulate_faces(vertices, faces)
 
     geometry = three.BufferGeometry(
         attributes={
-            "position": three.BufferAttribute(vertices, normalized=False),
-            "index": three.BufferAttribute(triangles, normalized=False, itemSize=3),
+            "position": position_attribute(vertices)[0],
+            "index": index_attribute(triangles),
         }
     )
 
@@ -62,13 +53,12 @@ def vertices_and_edges_to_threejs(vertices: list[list[float]], edges: list[tuple
         The PyThreeJS geometry.
 
     """
-    vertices = numpy.array(vertices, dtype=numpy.float32)  # type: ignore
-    edges = numpy.array(edges, dtype=numpy.uint32).ravel()  # type: ignore
+    edges = numpy.array(edges, dtype=numpy.uint32).reshape(-1, 2)  # type: ignore
 
     geometry = three.BufferGeometry(
         attributes={
-            "position": three.BufferAttribute(vertices, normalized=False),
-            "index": three.BufferAttribute(edges, normalized=False, itemSize=2),
+            "position": position_attribute(vertices)[0],
+            "index": index_attribute(edges),
         }
     )
 
@@ -89,6 +79,244 @@ def vertices_to_threejs(vertices: list[list[float]]) -> three.BufferGeometry:
         The PyThreeJS geometry.
 
     """
-    vertices = numpy.array(vertices, dtype=numpy.float32)  # type: ignore
-    geometry = three.BufferGeometry(attributes={"position": three.BufferAttribute(vertices, normalized=False)})
+    geometry = three.BufferGeometry(attributes={"position": position_attribute(vertices)[0]})
     return geometry
+
+
+def triangulate_faces(vertices: list[list[float]], faces: list[list[int]]) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Triangulate a list of faces.
+
+    Triangles and quads are fan-triangulated in bulk with index gathers into the flattened face list.
+    Only faces with more than four vertices are triangulated individually, with :func:`compas.geometry.earclip_polygon`.
+    The triangles are returned in the order of the faces they belong to.
+
+    Parameters
+    ----------
+    vertices
+        List of vertices.
+    faces
+        List of faces, as lists of indices into the vertex list.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The triangles as a (T, 3) array of vertex indices,
+        and the index of the originating face of every triangle as a (T,) array.
+
+    Examples
+    --------
+    >>> vertices = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]
+    >>> triangles, faceindex = triangulate_faces(vertices, [[0, 1, 2, 3]])
+    >>> triangles.tolist()
+    [[0, 1, 2], [0, 2, 3]]
+    >>> faceindex.tolist()
+    [0, 0]
+
+    """
+    degrees = numpy.fromiter((len(face) for face in faces), dtype=numpy.int64, count=len(faces))
+    corners = numpy.fromiter(chain.from_iterable(faces), dtype=numpy.int64, count=int(degrees.sum()))
+    starts = numpy.cumsum(degrees) - degrees
+
+    is_tri = degrees == 3
+    is_quad = degrees == 4
+
+    counts = numpy.where(is_quad, 2, 1)
+    ears = {}
+    for index in numpy.flatnonzero(~(is_tri | is_quad)):
+        polygon = Polygon([vertices[v] for v in faces[index]])
+        ears[index] = numpy.array(earclip_polygon(polygon), dtype=numpy.int64).reshape(-1, 3)
+        counts[index] = len(ears[index])
+
+    offsets = numpy.cumsum(counts) - counts
+    triangles = numpy.empty((int(counts.sum()), 3), dtype=numpy.uint32)
+
+    start = starts[is_tri][:, None]
+    triangles[offsets[is_tri]] = corners[start + [0, 1, 2]]
+
+    start = starts[is_quad][:, None]
+    triangles[offsets[is_quad]] = corners[start + [0, 1, 2]]
+    triangles[offsets[is_quad] + 1] = corners[start + [0, 2, 3]]
+
+    for index, ear in ears.items():
+        triangles[offsets[index] : offsets[index] + counts[index]] = corners[starts[index] + ear]
+
+    faceindex = numpy.repeat(numpy.arange(len(faces)), counts)
+
+    return triangles, faceindex
+
+
+def faces_to_edges(faces: list[list[int]]) -> numpy.ndarray:
+    """Extract the unique undirected edges of a list of faces.
+
+    The edges of all faces are gathered from the flattened face list in bulk,
+    and duplicates are removed by sorting, in O(n log n) time.
+    Every edge keeps the orientation and the position of its first occurrence.
+
+    Parameters
+    ----------
+    faces
+        List of faces, as lists of vertex indices.
+
+    Returns
+    -------
+    numpy.ndarray
+        The edges as a (E, 2) array of vertex indices.
+
+    Examples
+    --------
+    >>> faces_to_edges([[0, 1, 2], [2, 1, 3]]).tolist()
+    [[0, 1], [1, 2], [2, 0], [1, 3], [3, 2]]
+
+    """
+    degrees = numpy.fromiter((len(face) for face in faces), dtype=numpy.int64, count=len(faces))
+    corners = numpy.fromiter(chain.from_iterable(faces), dtype=numpy.int64, count=int(degrees.sum()))
+    if not len(corners):
+        return numpy.zeros((0, 2), dtype=numpy.int64)
+
+    # the next corner of every corner, wrapping around at the end of each face
+    following = numpy.arange(1, len(corners) + 1)
+    following[numpy.cumsum(degrees)[degrees > 0] - 1] = (numpy.cumsum(degrees) - degrees)[degrees > 0]
+
+    edges = numpy.column_stack([corners, corners[following]])
+    # every undirected edge as one integer key, which is much faster to sort than rows
+    keys = edges.min(axis=1) * (int(corners.max()) + 1) + edges.max(axis=1)
+    _, first = numpy.unique(keys, return_index=True)
+    return edges[numpy.sort(first)]
+
+
+def grid_faces(nu: int, nv: int) -> numpy.ndarray:
+    """Construct the quad faces of a regular grid of vertices.
+
+    The vertices are ordered as in :meth:`compas.geometry.Surface.to_vertices_and_faces`,
+    with the vertex at row ``i`` and column ``j`` at index ``i * (nv + 1) + j``.
+
+    Parameters
+    ----------
+    nu
+        The number of faces in the U direction.
+    nv
+        The number of faces in the V direction.
+
+    Returns
+    -------
+    numpy.ndarray
+        The faces as a (nu * nv, 4) array of vertex indices.
+
+    Examples
+    --------
+    >>> grid_faces(1, 2).tolist()
+    [[0, 1, 4, 3], [1, 2, 5, 4]]
+
+    """
+    index = numpy.arange((nu + 1) * (nv + 1)).reshape(nu + 1, nv + 1)
+    return numpy.column_stack(
+        [
+            index[:-1, :-1].ravel(),
+            index[:-1, 1:].ravel(),
+            index[1:, 1:].ravel(),
+            index[1:, :-1].ravel(),
+        ]
+    )
+
+
+def grid_edges(nu: int, nv: int) -> numpy.ndarray:
+    """Construct the unique edges of a regular grid of vertices.
+
+    The vertices are ordered as in :func:`grid_faces`.
+
+    Parameters
+    ----------
+    nu
+        The number of faces in the U direction.
+    nv
+        The number of faces in the V direction.
+
+    Returns
+    -------
+    numpy.ndarray
+        The edges as a ((nu + 1) * nv + nu * (nv + 1), 2) array of vertex indices.
+
+    Examples
+    --------
+    >>> grid_edges(1, 1).tolist()
+    [[0, 1], [2, 3], [0, 2], [1, 3]]
+
+    """
+    index = numpy.arange((nu + 1) * (nv + 1)).reshape(nu + 1, nv + 1)
+    along_v = numpy.column_stack([index[:, :-1].ravel(), index[:, 1:].ravel()])
+    along_u = numpy.column_stack([index[:-1, :].ravel(), index[1:, :].ravel()])
+    return numpy.vstack([along_v, along_u])
+
+
+def morton_codes(points: numpy.ndarray, bits: int = 10) -> numpy.ndarray:
+    """Compute the Morton codes of points in their bounding box.
+
+    The bounding box is divided into a grid of ``2 ** bits`` cells per axis,
+    and the bits of the cell coordinates are interleaved, such that points that are close in space tend to have close codes.
+
+    Parameters
+    ----------
+    points
+        A (N, 3) array of points.
+    bits
+        The number of bits per axis, at most 21.
+
+    Returns
+    -------
+    numpy.ndarray
+        A (N,) array of codes.
+
+    Examples
+    --------
+    >>> morton_codes(numpy.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 1]]), bits=1).tolist()
+    [0, 1, 2, 7]
+
+    """
+    points = numpy.asarray(points, dtype=numpy.float64).reshape(-1, 3)
+    codes = numpy.zeros(len(points), dtype=numpy.uint64)
+    if not len(points):
+        return codes
+
+    lower = points.min(axis=0)
+    extent = (points.max(axis=0) - lower).max() or 1.0
+    cells = numpy.minimum((points - lower) / extent * (1 << bits), (1 << bits) - 1).astype(numpy.uint64)
+
+    for bit in range(bits):
+        for axis in range(3):
+            codes |= ((cells[:, axis] >> numpy.uint64(bit)) & numpy.uint64(1)) << numpy.uint64(3 * bit + axis)
+    return codes
+
+
+def spatial_chunks(vertices: numpy.ndarray, triangles: numpy.ndarray, chunksize: int) -> list[numpy.ndarray]:
+    """Split triangles into spatially coherent chunks.
+
+    The triangles are sorted by the Morton codes of their centroids, and split into chunks of approximately equal size.
+
+    Parameters
+    ----------
+    vertices
+        A (V, 3) array of vertices.
+    triangles
+        A (T, 3) array of triangles.
+    chunksize
+        The maximum number of triangles per chunk.
+
+    Returns
+    -------
+    list[numpy.ndarray]
+        The indices of the triangles in every chunk.
+
+    Examples
+    --------
+    >>> vertices = numpy.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [10, 0, 0], [11, 0, 0], [10, 1, 0]])
+    >>> triangles = numpy.array([[3, 4, 5], [0, 1, 2], [4, 5, 3], [1, 2, 0]])
+    >>> [chunk.tolist() for chunk in spatial_chunks(vertices, triangles, 2)]
+    [[1, 3], [0, 2]]
+
+    """
+    vertices = numpy.asarray(vertices, dtype=numpy.float64).reshape(-1, 3)
+    triangles = numpy.asarray(triangles).reshape(-1, 3)
+    centroids = (vertices[triangles[:, 0]] + vertices[triangles[:, 1]] + vertices[triangles[:, 2]]) / 3
+    order = numpy.argsort(morton_codes(centroids), kind="stable")
+    count = max(1, -(-len(triangles) // max(chunksize, 1)))
+    return numpy.array_split(order, count)
@@ -0,0 +1,79 @@
+import numpy
+
+
+def voxel_downsample(points: numpy.ndarray, voxelsize: float) -> numpy.ndarray:
+    """Downsample points to the centroids of the occupied cells of a regular voxel grid.
+
+    Parameters
+    ----------
+    points
+        A (N, 3) array of points.
+    voxelsize
+        The size of the voxel cells.
+
+    Returns
+    -------
+    numpy.ndarray
+        A (M, 3) array with the centroid of the points in every occupied cell, with M <= N.
+
+    Examples
+    --------
+    >>> points = numpy.array([[0.1, 0.1, 0.1], [0.3, 0.3, 0.3], [1.5, 0.5, 0.5]])
+    >>> voxel_downsample(points, 1.0).tolist()
+    [[0.2, 0.2, 0.2], [1.5, 0.5, 0.5]]
+
+    """
+    cells = numpy.floor((points - points.min(axis=0)) / voxelsize).astype(numpy.int64)
+    dims = cells.max(axis=0) + 1
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+    _, inverse, counts = numpy.unique(keys, return_inverse=True, return_counts=True)
+
+    centroids = numpy.empty((len(counts), 3), dtype=points.dtype)
+    for axis in range(3):
+        centroids[:, axis] = numpy.bincount(inverse, weights=points[:, axis], minlength=len(counts)) / counts
+    return centroids
+
+
+def voxel_pyramid(points: numpy.ndarray, minpoints: int = 1024, resolution: int = 1024) -> list[numpy.ndarray]:
+    """Construct a multi-resolution pyramid of voxel-downsampled versions of a set of points.
+
+    The first level contains the original points.
+    Every next level is computed from the previous one by downsampling on a voxel grid,
+    starting with a voxel size equal to the largest dimension of the bounding box
+    divided by ``resolution`` or by the square root of the number of points, whichever is smaller,
+    and doubling the voxel size until the number of points is at least halved,
+    until a level has no more than ``minpoints`` points.
+
+    Parameters
+    ----------
+    points
+        A (N, 3) array of points.
+    minpoints
+        The maximum number of points of the coarsest level.
+    resolution
+        The maximum number of voxel cells along the largest dimension of the bounding box at the first downsampled level.
+        For fewer than ``resolution ** 2`` points, the square root of the number of points is used instead.
+
+    Returns
+    -------
+    list[numpy.ndarray]
+        The levels of the pyramid, from fine to coarse.
+
+    """
+    levels = [points]
+    if len(points) <= minpoints:
+        return levels
+
+    extent = float(numpy.ptp(points, axis=0).max())
+    if extent == 0:
+        return [points, points[:1]]
+
+    voxelsize = extent / min(resolution, numpy.sqrt(len(points)))
+    while len(levels[-1]) > minpoints:
+        level = voxel_downsample(levels[-1], voxelsize)
+        if 2 * len(level) <= len(levels[-1]):
+            levels.append(level)
+        voxelsize *= 2
+
+    return levels
@@ -34,10 +34,17 @@ from compas_notebook.geometry import Dot
 from compas.datastructures import Graph
 from compas.datastructures import Mesh
 
-from .scene import NotebookScene
-
 from .sceneobject import ThreeSceneObject
 
+from .digest import data_digest
+from .drawcache import DRAWCACHE
+from .drawcache import DrawCache
+from .tessellationcache import TESSELLATIONCACHE
+from .tessellationcache import TessellationCache
+from .pool import ResourcePool
+
+from .scene import NotebookScene
+
 from .boxobject import ThreeBoxObject
 from .brepobject import ThreeBrepObject
 from .capsuleobject import ThreeCapsuleObject
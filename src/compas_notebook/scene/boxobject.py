@@ -1,6 +1,7 @@
+import pythreejs as three
 from compas.scene import GeometryObject
 
-from compas_notebook.conversions import box_to_threejs
+from compas_notebook.conversions import shapes_to_instancebuffers
 
 from .sceneobject import ThreeSceneObject
 
@@ -8,6 +9,28 @@ from .sceneobject import ThreeSceneObject
 class ThreeBoxObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing box shapes."""
 
+    batched = True
+
+    @classmethod
+    def draw_batch(cls, sceneobjects: list["ThreeBoxObject"]) -> list[three.Object3D]:
+        """Draw boxes as instances of shared unit geometries, with the colors of the individual scene objects.
+
+        Parameters
+        ----------
+        sceneobjects
+            The scene objects.
+
+        Returns
+        -------
+        list[three.Mesh, three.LineSegments]
+            One mesh and one line segments object per unit geometry.
+
+        """
+        shapes = [sceneobject.geometry for sceneobject in sceneobjects]
+        colors = [sceneobject.color for sceneobject in sceneobjects]
+        edgecolors = [sceneobject.contrastcolor for sceneobject in sceneobjects]
+        return shapes_to_instancebuffers(shapes, colors, edgecolors)
+
     def draw(self):
         """Draw the box associated with the scene object.
 
@@ -17,13 +40,14 @@ class ThreeBoxObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        geometry = box_to_threejs(self.geometry)
+        geometry = self.pool.geometry(three.BoxGeometry, width=1, height=1, depth=1)
         transformation = self.y_to_z(self.geometry.transformation)
 
         self._guids = self.geometry_to_objects(
             geometry,
             self.color,
             transformation=transformation,
+            scale=[self.geometry.width, self.geometry.height, self.geometry.depth],
         )
 
         return self.guids
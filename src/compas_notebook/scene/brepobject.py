@@ -1,17 +1,84 @@
+from typing import Optional
+
+import numpy
 import pythreejs as three
 from compas.geometry import Brep
 from compas.scene import GeometryObject
 
-from compas_notebook.conversions import polyline_to_threejs
-from compas_notebook.conversions import vertices_and_faces_to_threejs
+from compas_notebook.conversions import triangulate_faces
+from compas_notebook.conversions import vertices_to_threejs
+from compas_notebook.conversions.compact import index_attribute
+from compas_notebook.conversions.compact import position_attribute
 from compas_notebook.scene import ThreeSceneObject
 
+from .tessellationcache import TESSELLATIONCACHE
+
 
 class ThreeBrepObject(ThreeSceneObject, GeometryObject):
-    """Scene object for drawing a Brep."""
+    """Scene object for drawing a Brep.
+
+    If the persistent :data:`TESSELLATIONCACHE` is enabled with the ``tessellation`` option of the cache configuration,
+    tessellations are stored on disk, such that drawing the same Brep again, also after a kernel restart, only reads the tessellation.
+
+    Parameters
+    ----------
+    precision : float, optional
+        The precision of the tessellation.
+        If None, the default of the Brep backend is used.
+
+    """
 
     geometry: Brep
 
+    def __init__(self, precision: Optional[float] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.precision = precision
+
+    @property
+    def settings(self) -> dict:
+        settings = super().settings
+        settings["precision"] = self.precision
+        return settings
+
+    def compute_buffers(self) -> dict[str, tuple[numpy.ndarray, ...]]:
+        """Tessellate the Brep, or load its tessellation from the tessellation cache, without creating pythreejs widgets.
+
+        Returns
+        -------
+        dict[str, tuple[numpy.ndarray, ...]]
+            The vertices and triangles of the view mesh,
+            and the concatenated points of the edge polylines with the offsets of the individual polylines.
+
+        """
+        key = None
+        if TESSELLATIONCACHE.maxbytes > 0:
+            try:
+                key = TESSELLATIONCACHE.key(self.geometry, {"precision": self.precision})
+            except Exception:
+                # Breps that cannot be serialized are tessellated without the cache
+                pass
+        if key is not None:
+            buffers = TESSELLATIONCACHE.get(key)
+            if buffers is not None:
+                return buffers
+
+        if self.precision is None:
+            mesh, polylines = self.geometry.to_viewmesh()
+        else:
+            mesh, polylines = self.geometry.to_viewmesh(self.precision)
+        vertices, faces = mesh.to_vertices_and_faces()
+        triangles, _ = triangulate_faces(vertices, faces)
+        vertices = numpy.array(vertices, dtype=numpy.float32).reshape(-1, 3)
+
+        points = [numpy.array(polyline.points, dtype=numpy.float32).reshape(-1, 3) for polyline in polylines]
+        offsets = numpy.cumsum([0] + [len(p) for p in points])
+        points = numpy.concatenate(points) if points else numpy.zeros((0, 3), dtype=numpy.float32)
+
+        buffers = {"mesh": (vertices, triangles), "polylines": (points, offsets)}
+        if key is not None:
+            TESSELLATIONCACHE.put(key, buffers)
+        return buffers
+
     def draw(self):
         """Draw the Brep associated with the scene object.
 
@@ -21,17 +88,24 @@ class ThreeBrepObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        mesh, polylines = self.geometry.to_viewmesh()
-        vertices, faces = mesh.to_vertices_and_faces()
+        buffers = self._precomputed or self.compute_buffers()
+        self._precomputed = {}
 
-        geometry = vertices_and_faces_to_threejs(vertices, faces)
-        mesh = three.Mesh(geometry, three.MeshBasicMaterial(color=self.color.hex, side="DoubleSide"))
+        vertices, triangles = buffers["mesh"]
+        geometry = three.BufferGeometry(
+            attributes={
+                "position": position_attribute(vertices)[0],
+                "index": index_attribute(triangles),
+            }
+        )
+        mesh = three.Mesh(geometry, self.pool.material(three.MeshBasicMaterial, color=self.color.hex, side="DoubleSide"))
 
         guids = [mesh]
 
-        for polyline in polylines:
-            geometry = polyline_to_threejs(polyline)
-            line = three.LineSegments(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+        points, offsets = buffers["polylines"]
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            geometry = vertices_to_threejs(points[start:end])
+            line = three.LineSegments(geometry, self.pool.material(three.LineBasicMaterial, color=self.contrastcolor.hex))
             guids.append(line)
 
         self._guids = guids
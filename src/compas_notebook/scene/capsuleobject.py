@@ -25,10 +25,10 @@ class ThreeCapsuleObject(ThreeSceneObject, GeometryObject):
         edges = list(mesh.edges())
 
         geometry = vertices_and_faces_to_threejs(vertices, faces)
-        mesh = three.Mesh(geometry, three.MeshBasicMaterial(color=self.color.hex, side="DoubleSide"))
+        mesh = three.Mesh(geometry, self.pool.material(three.MeshBasicMaterial, color=self.color.hex, side="DoubleSide"))
 
         geometry = vertices_and_edges_to_threejs(vertices, edges)
-        line = three.LineSegments(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+        line = three.LineSegments(geometry, self.pool.material(three.LineBasicMaterial, color=self.contrastcolor.hex))
 
         self._guids = [mesh, line]
 
@@ -1,13 +1,39 @@
+from typing import Optional
+
 import pythreejs as three
 from compas.scene import GeometryObject
 
+from compas_notebook.conversions.curves import chordal_tolerance
 from compas_notebook.conversions.geometry import circle_to_threejs
 
 from .sceneobject import ThreeSceneObject
 
 
 class ThreeCircleObject(ThreeSceneObject, GeometryObject):
-    """Scene object for drawing circles."""
+    """Scene object for drawing circles.
+
+    Parameters
+    ----------
+    tolerance : float, optional
+        The maximum distance between the drawn segments and the circle, relative to the diameter of the circle.
+    pixels : float, optional
+        The maximum distance between the drawn segments and the circle in pixels of the view.
+        If provided, the circle is discretized for the camera of the viewer at the time of drawing,
+        and ``tolerance`` is only used if the scene is not displayed by a viewer.
+
+    """
+
+    def __init__(self, tolerance: float = 1e-3, pixels: Optional[float] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.tolerance = tolerance
+        self.pixels = pixels
+
+    @property
+    def settings(self) -> dict:
+        settings = super().settings
+        settings["tolerance"] = self.tolerance
+        settings["pixels"] = self.pixels
+        return settings
 
     def draw(self) -> list[three.Line]:
         """Draw the circle as a discretized polyline.
@@ -18,8 +44,17 @@ class ThreeCircleObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        geometry = circle_to_threejs(self.geometry)
-        line = three.LineLoop(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+        circle = self.geometry
+        tolerance = chordal_tolerance(
+            2 * circle.radius,
+            circle.frame.point,
+            self.tolerance,
+            self.pixels,
+            getattr(self.scene, "camera", None),
+            getattr(self.scene, "viewheight", None),
+        )
+        geometry = circle_to_threejs(circle, tolerance=tolerance)
+        line = three.LineLoop(geometry, self.pool.material(three.LineBasicMaterial, color=self.contrastcolor.hex))
 
         self._guids = [line]
 
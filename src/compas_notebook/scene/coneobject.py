@@ -1,12 +1,36 @@
 import pythreejs as three
 from compas.scene import GeometryObject
 
+from compas_notebook.conversions import shapes_to_instancebuffers
+
 from .sceneobject import ThreeSceneObject
 
 
 class ThreeConeObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing cone."""
 
+    batched = True
+
+    @classmethod
+    def draw_batch(cls, sceneobjects: list["ThreeConeObject"]) -> list[three.Object3D]:
+        """Draw cones as instances of shared unit geometries, with the colors of the individual scene objects.
+
+        Parameters
+        ----------
+        sceneobjects
+            The scene objects.
+
+        Returns
+        -------
+        list[three.Mesh, three.LineSegments]
+            One mesh and one line segments object per unit geometry.
+
+        """
+        shapes = [sceneobject.geometry for sceneobject in sceneobjects]
+        colors = [sceneobject.color for sceneobject in sceneobjects]
+        edgecolors = [sceneobject.contrastcolor for sceneobject in sceneobjects]
+        return shapes_to_instancebuffers(shapes, colors, edgecolors)
+
     def draw(self):
         """Draw the cone associated with the scene object.
 
@@ -16,17 +40,20 @@ class ThreeConeObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        geometry = three.CylinderGeometry(
+        geometry = self.pool.geometry(
+            three.CylinderGeometry,
             radiusTop=0,
-            radiusBottom=self.geometry.radius,
-            height=self.geometry.height,
+            radiusBottom=1,
+            height=1,
             radialSegments=32,
         )
         transformation = self.y_to_z(self.geometry.transformation)
+        radius = self.geometry.radius
 
         self._guids = self.geometry_to_objects(
             geometry,
             self.color,
             transformation=transformation,
+            scale=[radius, self.geometry.height, radius],
         )
         return self.guids
@@ -0,0 +1,421 @@
+from typing import Optional
+
+import numpy
+import pythreejs as three
+
+CORNERS = numpy.array([[i, j, k] for i in (0, 1) for j in (0, 1) for k in (0, 1)], dtype=numpy.float64)
+
+
+def geometry_bounds(geometry: three.BaseGeometry) -> Optional[numpy.ndarray]:
+    """Compute the bounds of a pythreejs geometry in its local coordinate system.
+
+    Parameters
+    ----------
+    geometry
+        A buffer geometry, or one of the parametric geometries used by the conversions.
+
+    Returns
+    -------
+    numpy.ndarray | None
+        A (2, 3) array with the minimum and maximum coordinates,
+        or None if the bounds of the geometry cannot be determined.
+
+    """
+    if isinstance(geometry, three.EdgesGeometry):
+        return geometry_bounds(geometry.geometry)
+
+    if isinstance(geometry, (three.BufferGeometry, three.InstancedBufferGeometry)):
+        if "position" not in geometry.attributes:
+            return None
+        attribute = geometry.attributes["position"]
+        positions = numpy.asarray(attribute.array, dtype=numpy.float64).reshape(-1, 3)
+        if not len(positions):
+            return None
+        if attribute.normalized and numpy.issubdtype(attribute.array.dtype, numpy.integer):
+            positions = positions / numpy.iinfo(attribute.array.dtype).max
+        bounds = numpy.array([positions.min(axis=0), positions.max(axis=0)])
+        if isinstance(geometry, three.InstancedBufferGeometry):
+            return instance_bounds(geometry, bounds)
+        return bounds
+
+    if isinstance(geometry, three.BoxGeometry):
+        half = numpy.array([geometry.width, geometry.height, geometry.depth]) / 2
+    elif isinstance(geometry, three.CylinderGeometry):
+        radius = max(geometry.radiusTop, geometry.radiusBottom)
+        half = numpy.array([radius, geometry.height / 2, radius])
+    elif isinstance(geometry, three.SphereGeometry):
+        half = numpy.full(3, geometry.radius)
+    elif isinstance(geometry, three.TorusGeometry):
+        half = numpy.array([geometry.radius + geometry.tube, geometry.radius + geometry.tube, geometry.tube])
+    else:
+        return None
+    return numpy.array([-half, half])
+
+
+def instance_bounds(geometry: three.InstancedBufferGeometry, bounds: numpy.ndarray) -> Optional[numpy.ndarray]:
+    """Compute the combined bounds of all instances of an instanced geometry.
+
+    Parameters
+    ----------
+    geometry
+        An instanced geometry with per-instance matrix columns ``instanceMatrix0`` to ``instanceMatrix3``.
+    bounds
+        The (2, 3) bounds of the base geometry.
+
+    Returns
+    -------
+    numpy.ndarray | None
+
+    """
+    names = [f"instanceMatrix{i}" for i in range(4)]
+    if not all(name in geometry.attributes for name in names):
+        return None
+    columns = [numpy.asarray(geometry.attributes[name].array, dtype=numpy.float64).reshape(-1, 4) for name in names]
+    matrices = numpy.stack(columns, axis=2)
+    corners = bounds[0] + CORNERS * (bounds[1] - bounds[0])
+    points = numpy.einsum("nij,cj->nci", matrices[:, :3, :3], corners) + matrices[:, None, :3, 3]
+    points = points.reshape(-1, 3)
+    return numpy.array([points.min(axis=0), points.max(axis=0)])
+
+
+def object_matrix(obj: three.Object3D) -> numpy.ndarray:
+    """Compute the 4x4 transformation matrix of a pythreejs object with respect to its parent.
+
+    Parameters
+    ----------
+    obj
+        The pythreejs object.
+
+    Returns
+    -------
+    numpy.ndarray
+
+    """
+    if not obj.matrixAutoUpdate:
+        return numpy.array(obj.matrix, dtype=numpy.float64).reshape(4, 4).transpose()
+
+    x, y, z, w = obj.quaternion
+    rotation = numpy.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+    matrix = numpy.identity(4)
+    matrix[:3, :3] = rotation * numpy.array(obj.scale)
+    matrix[:3, 3] = obj.position
+    return matrix
+
+
+def object_aabb(obj: three.Object3D, matrix: Optional[numpy.ndarray] = None) -> Optional[numpy.ndarray]:
+    """Compute the axis-aligned bounding box of a pythreejs object and its children in world coordinates.
+
+    Parameters
+    ----------
+    obj
+        The pythreejs object.
+    matrix
+        The world matrix of the parent of the object.
+
+    Returns
+    -------
+    numpy.ndarray | None
+        A (2, 3) array with the minimum and maximum coordinates,
+        or None if the object has no bounds or its bounds cannot be determined.
+
+    """
+    matrix = object_matrix(obj) if matrix is None else matrix @ object_matrix(obj)
+
+    boxes = []
+
+    if isinstance(obj, three.Sprite):
+        boxes.append(numpy.array([matrix[:3, 3], matrix[:3, 3]]))
+
+    elif getattr(obj, "geometry", None) is not None:
+        bounds = geometry_bounds(obj.geometry)
+        if bounds is None:
+            return None
+        corners = bounds[0] + CORNERS * (bounds[1] - bounds[0])
+        points = corners @ matrix[:3, :3].T + matrix[:3, 3]
+        boxes.append(numpy.array([points.min(axis=0), points.max(axis=0)]))
+
+    for child in obj.children:
+        box = object_aabb(child, matrix)
+        if box is None:
+            return None
+        boxes.append(box)
+
+    if not boxes:
+        return None
+
+    boxes = numpy.array(boxes)
+    return numpy.array([boxes[:, 0].min(axis=0), boxes[:, 1].max(axis=0)])
+
+
+def camera_frustum(camera: three.Camera, target: list[float]) -> numpy.ndarray:
+    """Compute the planes of the view frustum of a camera looking at a target.
+
+    Parameters
+    ----------
+    camera
+        A perspective or orthographic pythreejs camera.
+    target
+        The point the camera is looking at, for example the target of the orbit controls.
+
+    Returns
+    -------
+    numpy.ndarray
+        A (6, 4) array of plane coefficients ``(a, b, c, d)``,
+        such that points with ``a * x + b * y + c * z + d >= 0`` are on the inside of all planes.
+
+    """
+    position = numpy.array(camera.position, dtype=numpy.float64)
+    zaxis = position - numpy.array(target, dtype=numpy.float64)
+    zaxis /= numpy.linalg.norm(zaxis)
+    xaxis = numpy.cross(camera.up, zaxis)
+    if not numpy.linalg.norm(xaxis):
+        xaxis = numpy.cross([0, 1, 0] if abs(zaxis[1]) < 0.9 else [1, 0, 0], zaxis)
+    xaxis /= numpy.linalg.norm(xaxis)
+    yaxis = numpy.cross(zaxis, xaxis)
+
+    view = numpy.identity(4)
+    view[:3, :3] = [xaxis, yaxis, zaxis]
+    view[:3, 3] = -view[:3, :3] @ position
+
+    near = camera.near
+    far = camera.far
+    projection = numpy.zeros((4, 4))
+
+    if isinstance(camera, three.PerspectiveCamera):
+        f = camera.zoom / numpy.tan(numpy.radians(camera.fov) / 2)
+        projection[0, 0] = f / camera.aspect
+        projection[1, 1] = f
+        projection[2, 2] = (far + near) / (near - far)
+        projection[2, 3] = 2 * far * near / (near - far)
+        projection[3, 2] = -1
+
+    elif isinstance(camera, three.OrthographicCamera):
+        cx = (camera.right + camera.left) / 2
+        cy = (camera.top + camera.bottom) / 2
+        dx = (camera.right - camera.left) / (2 * camera.zoom)
+        dy = (camera.top - camera.bottom) / (2 * camera.zoom)
+        projection[0, 0] = 1 / dx
+        projection[0, 3] = -cx / dx
+        projection[1, 1] = 1 / dy
+        projection[1, 3] = -cy / dy
+        projection[2, 2] = -2 / (far - near)
+        projection[2, 3] = -(far + near) / (far - near)
+        projection[3, 3] = 1
+
+    else:
+        raise NotImplementedError
+
+    m = projection @ view
+    return numpy.array([m[3] + m[0], m[3] - m[0], m[3] + m[1], m[3] - m[1], m[3] + m[2], m[3] - m[2]])
+
+
+class BVH:
+    """Bounding volume hierarchy over a collection of axis-aligned bounding boxes.
+
+    The hierarchy is built top-down, by splitting the boxes at the median of their centroids
+    along the longest axis of the node, until a node contains no more than ``leafsize`` boxes.
+    Afterwards, boxes can be moved, removed, and inserted without rebuilding the hierarchy.
+    Moved and removed boxes only refit the bounds of the nodes above them,
+    and inserted boxes are added as a new subtree next to the existing root.
+
+    Parameters
+    ----------
+    boxes
+        A (N, 2, 3) array with the minimum and maximum coordinates of the boxes.
+    leafsize
+        The maximum number of boxes per leaf node.
+
+    Attributes
+    ----------
+    nodes : list[tuple[numpy.ndarray, int, int, numpy.ndarray | None]]
+        The nodes of the hierarchy, as tuples of the bounds of the node,
+        the indices of the child nodes, and the box indices of leaf nodes.
+    root : int
+        The index of the root node.
+    active : numpy.ndarray
+        A (N,) boolean array that is False for removed boxes.
+    changes : int
+        The number of boxes that were inserted or removed since the hierarchy was built.
+
+    """
+
+    def __init__(self, boxes: numpy.ndarray, leafsize: int = 4):
+        self.boxes = numpy.asarray(boxes, dtype=numpy.float64).reshape(-1, 2, 3)
+        self.leafsize = leafsize
+        self.nodes = []
+        self.parents = []
+        self.leaves = numpy.zeros(len(self.boxes), dtype=int)
+        self.active = numpy.ones(len(self.boxes), dtype=bool)
+        self.root = -1
+        self.changes = 0
+        if len(self.boxes):
+            self.root = self._build(numpy.arange(len(self.boxes)), -1)
+
+    def __len__(self):
+        return int(self.active.sum())
+
+    def _build(self, indices: numpy.ndarray, parent: int) -> int:
+        boxes = self.boxes[indices]
+        bounds = numpy.array([boxes[:, 0].min(axis=0), boxes[:, 1].max(axis=0)])
+        node = len(self.nodes)
+        self.parents.append(parent)
+
+        if len(indices) <= self.leafsize:
+            self.nodes.append((bounds, -1, -1, indices))
+            self.leaves[indices] = node
+            return node
+
+        self.nodes.append(None)
+        centroids = boxes.sum(axis=1) / 2
+        axis = numpy.argmax(bounds[1] - bounds[0])
+        order = numpy.argsort(centroids[:, axis], kind="stable")
+        half = len(indices) // 2
+        left = self._build(indices[order[:half]], node)
+        right = self._build(indices[order[half:]], node)
+        self.nodes[node] = bounds, left, right, None
+        return node
+
+    def insert(self, boxes: numpy.ndarray) -> numpy.ndarray:
+        """Insert boxes as a new subtree, which becomes a sibling of the current root.
+
+        Parameters
+        ----------
+        boxes
+            A (K, 2, 3) array with the minimum and maximum coordinates of the boxes.
+
+        Returns
+        -------
+        numpy.ndarray
+            The indices of the inserted boxes.
+
+        """
+        boxes = numpy.asarray(boxes, dtype=numpy.float64).reshape(-1, 2, 3)
+        indices = numpy.arange(len(self.boxes), len(self.boxes) + len(boxes))
+        if not len(boxes):
+            return indices
+
+        self.boxes = numpy.concatenate([self.boxes, boxes])
+        self.leaves = numpy.concatenate([self.leaves, numpy.zeros(len(boxes), dtype=int)])
+        self.active = numpy.concatenate([self.active, numpy.ones(len(boxes), dtype=bool)])
+        self.changes += len(boxes)
+
+        subtree = self._build(indices, -1)
+        if self.root < 0:
+            self.root = subtree
+            return indices
+
+        root = len(self.nodes)
+        bounds = numpy.array([numpy.minimum(self.nodes[self.root][0][0], self.nodes[subtree][0][0]), numpy.maximum(self.nodes[self.root][0][1], self.nodes[subtree][0][1])])
+        self.nodes.append((bounds, self.root, subtree, None))
+        self.parents.append(-1)
+        self.parents[self.root] = root
+        self.parents[subtree] = root
+        self.root = root
+        return indices
+
+    def remove(self, indices: numpy.ndarray) -> None:
+        """Remove boxes, and refit the bounds of the nodes above them.
+
+        Parameters
+        ----------
+        indices
+            The indices of the boxes.
+
+        Returns
+        -------
+        None
+
+        """
+        indices = numpy.asarray(indices, dtype=int).reshape(-1)
+        self.changes += int(self.active[indices].sum())
+        self.active[indices] = False
+        self._refit(self.leaves[indices])
+
+    def refit(self, indices: numpy.ndarray, boxes: numpy.ndarray) -> None:
+        """Move boxes, and refit the bounds of the nodes above them.
+
+        Parameters
+        ----------
+        indices
+            The indices of the boxes.
+        boxes
+            A (K, 2, 3) array with the new minimum and maximum coordinates of the boxes.
+
+        Returns
+        -------
+        None
+
+        """
+        indices = numpy.asarray(indices, dtype=int).reshape(-1)
+        self.boxes[indices] = numpy.asarray(boxes, dtype=numpy.float64).reshape(-1, 2, 3)
+        self._refit(self.leaves[indices])
+
+    def _refit(self, leaves: numpy.ndarray) -> None:
+        # only the bounds of the changed leaves and their ancestors are recomputed, level by level
+        level = set(int(leaf) for leaf in leaves)
+        while level:
+            parents = set()
+            for node in level:
+                bounds, left, right, indices = self.nodes[node]
+                if indices is not None:
+                    boxes = self.boxes[indices[self.active[indices]]]
+                    if not len(boxes):
+                        # empty leaves keep their bounds, and their boxes are skipped by the query
+                        continue
+                    bounds[0] = boxes[:, 0].min(axis=0)
+                    bounds[1] = boxes[:, 1].max(axis=0)
+                else:
+                    bounds[0] = numpy.minimum(self.nodes[left][0][0], self.nodes[right][0][0])
+                    bounds[1] = numpy.maximum(self.nodes[left][0][1], self.nodes[right][0][1])
+                if self.parents[node] >= 0:
+                    parents.add(self.parents[node])
+            level = parents
+
+    def query(self, planes: numpy.ndarray) -> numpy.ndarray:
+        """Find the boxes that intersect or are inside a convex volume.
+
+        The test is conservative: boxes that are close to a corner of the volume may be reported while not intersecting it.
+
+        Parameters
+        ----------
+        planes
+            A (P, 4) array of plane coefficients, with the inside of the volume on the positive side of all planes.
+
+        Returns
+        -------
+        numpy.ndarray
+            The sorted indices of the boxes.
+
+        """
+        if self.root < 0:
+            return numpy.zeros(0, dtype=int)
+
+        planes = numpy.asarray(planes, dtype=numpy.float64)
+        normals = planes[:, :3]
+        positive = normals >= 0
+
+        found = []
+        stack = [self.root]
+        while stack:
+            bounds, left, right, indices = self.nodes[stack.pop()]
+            # the corner of the box furthest along the normal of each plane
+            corners = numpy.where(positive, bounds[1], bounds[0])
+            if ((corners * normals).sum(axis=1) + planes[:, 3] < 0).any():
+                continue
+            if indices is not None:
+                boxes = self.boxes[indices]
+                corners = numpy.where(positive, boxes[:, 1:2], boxes[:, 0:1])
+                outside = ((corners * normals).sum(axis=2) + planes[:, 3] < 0).any(axis=1)
+                found.append(indices[~outside & self.active[indices]])
+            else:
+                stack += [left, right]
+
+        if not found:
+            return numpy.zeros(0, dtype=int)
+        return numpy.sort(numpy.concatenate(found))
@@ -1,13 +1,40 @@
+from typing import Optional
+
+import numpy
 import pythreejs as three
 from compas.scene import GeometryObject
 
+from compas_notebook.conversions.curves import chordal_tolerance
 from compas_notebook.conversions.geometry import curve_to_threejs
 
 from .sceneobject import ThreeSceneObject
 
 
 class ThreeCurveObject(ThreeSceneObject, GeometryObject):
-    """Scene object for drawing curves."""
+    """Scene object for drawing curves.
+
+    Parameters
+    ----------
+    tolerance : float, optional
+        The maximum distance between the drawn segments and the curve, relative to the diagonal of the bounding box of the curve.
+    pixels : float, optional
+        The maximum distance between the drawn segments and the curve in pixels of the view.
+        If provided, the curve is discretized for the camera of the viewer at the time of drawing,
+        and ``tolerance`` is only used if the scene is not displayed by a viewer.
+
+    """
+
+    def __init__(self, tolerance: float = 1e-3, pixels: Optional[float] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.tolerance = tolerance
+        self.pixels = pixels
+
+    @property
+    def settings(self) -> dict:
+        settings = super().settings
+        settings["tolerance"] = self.tolerance
+        settings["pixels"] = self.pixels
+        return settings
 
     def draw(self) -> list[three.Line]:
         """Draw the curve as discretized polyline.
@@ -18,8 +45,19 @@ class ThreeCurveObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        geometry = curve_to_threejs(self.geometry)
-        line = three.Line(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+        # the size of the curve is estimated from a coarse uniform sampling
+        points = numpy.array(self.geometry.to_points(n=17), dtype=numpy.float64)
+        lower, upper = points.min(axis=0), points.max(axis=0)
+        tolerance = chordal_tolerance(
+            float(numpy.linalg.norm(upper - lower)),
+            (lower + upper) / 2,
+            self.tolerance,
+            self.pixels,
+            getattr(self.scene, "camera", None),
+            getattr(self.scene, "viewheight", None),
+        )
+        geometry = curve_to_threejs(self.geometry, tolerance=tolerance)
+        line = three.Line(geometry, self.pool.material(three.LineBasicMaterial, color=self.contrastcolor.hex))
 
         self._guids = [line]
 
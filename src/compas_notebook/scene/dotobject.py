@@ -1,8 +1,10 @@
+import pythreejs as three
 from compas.colors import Color
 from compas.scene import GeometryObject
 from compas.scene.descriptors.color import ColorAttribute
 
 from compas_notebook.conversions import dot_to_threejs
+from compas_notebook.conversions import dots_to_threejs
 
 from .sceneobject import ThreeSceneObject
 
@@ -12,10 +14,44 @@ class ThreeDotObject(ThreeSceneObject, GeometryObject):
 
     color = ColorAttribute(default=Color.black())
 
+    batched = True
+
     def __init__(self, fontsize=256, **kwargs):
         super().__init__(**kwargs)
         self.fontsize = fontsize
 
+    @property
+    def settings(self) -> dict:
+        settings = super().settings
+        settings["fontsize"] = self.fontsize
+        return settings
+
+    @classmethod
+    def draw_batch(cls, sceneobjects: list["ThreeDotObject"]) -> list[three.Object3D]:
+        """Draw dots as one collection of labels per font size, with glyph quads that share a glyph atlas.
+
+        Parameters
+        ----------
+        sceneobjects
+            The scene objects.
+
+        Returns
+        -------
+        list[three.Mesh]
+            One mesh per font size and page of the glyph atlas.
+
+        """
+        groups = {}
+        for sceneobject in sceneobjects:
+            groups.setdefault(sceneobject.fontsize, []).append(sceneobject)
+
+        objects = []
+        for fontsize, group in groups.items():
+            dots = [sceneobject.geometry for sceneobject in group]
+            colors = [sceneobject.color for sceneobject in group]
+            objects += dots_to_threejs(dots, fontsize=fontsize, color=colors)
+        return objects
+
     def draw(self):
         """Draw the dot associated with the scene object.
 
@@ -0,0 +1,171 @@
+from collections import OrderedDict
+from typing import Optional
+
+import numpy
+
+
+def buffers_nbytes(buffers: dict[str, tuple[numpy.ndarray, ...]]) -> int:
+    """Compute the number of bytes of the arrays of the buffers of a scene object.
+
+    Parameters
+    ----------
+    buffers
+        The buffer arrays, as returned by :meth:`ThreeSceneObject.compute_buffers`.
+
+    Returns
+    -------
+    int
+
+    """
+    nbytes = 0
+    for arrays in buffers.values():
+        for array in arrays:
+            if isinstance(array, numpy.ndarray):
+                nbytes += array.nbytes
+    return nbytes
+
+
+class DrawCache:
+    """Least-recently-used cache of the buffer arrays computed by scene objects.
+
+    The cache is keyed on a digest of the content of the data item and the settings of a scene object,
+    see :meth:`NotebookScene.cachekey`,
+    such that drawing the same geometry with the same settings again, in any scene, skips the conversion to buffer arrays.
+    Only the arrays are cached, and every draw creates its own pythreejs objects from them,
+    such that the objects of different scene objects and viewers are never shared.
+    The cached arrays are not modified by the scene objects.
+
+    Parameters
+    ----------
+    maxsize
+        The maximum number of cached draw results.
+        A value of zero disables the cache.
+    maxbytes
+        The maximum total size of the arrays of the cached draw results.
+
+    Attributes
+    ----------
+    hits : int
+        The number of successful lookups.
+    misses : int
+        The number of failed lookups.
+    nbytes : int
+        The total size of the arrays of the cached draw results.
+
+    """
+
+    def __init__(self, maxsize: int = 1024, maxbytes: int = 256 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def stats(self) -> dict:
+        """Summary of the state of the cache."""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "nbytes": self.nbytes,
+            "maxbytes": self.maxbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def get(self, key: str) -> Optional[dict[str, tuple[numpy.ndarray, ...]]]:
+        """Get the cached buffer arrays for a key, and mark them as most recently used.
+
+        Parameters
+        ----------
+        key
+            The cache key of the scene object.
+
+        Returns
+        -------
+        dict[str, tuple[numpy.ndarray, ...]] | None
+            The cached buffer arrays, or None if the key is not in the cache.
+
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: str, buffers: dict[str, tuple[numpy.ndarray, ...]]) -> None:
+        """Add buffer arrays to the cache, evicting the least recently used results if necessary.
+
+        Parameters
+        ----------
+        key
+            The cache key of the scene object.
+        buffers
+            The buffer arrays computed by the scene object.
+
+        Returns
+        -------
+        None
+
+        """
+        nbytes = buffers_nbytes(buffers)
+        if self.maxsize <= 0 or nbytes > self.maxbytes:
+            return
+        self.discard(key)
+        self._entries[key] = buffers, nbytes
+        self.nbytes += nbytes
+        self.evict()
+
+    def discard(self, key: str) -> None:
+        """Remove a draw result from the cache, if it is present.
+
+        Parameters
+        ----------
+        key
+            The cache key of the scene object.
+
+        Returns
+        -------
+        None
+
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
+
+    def evict(self) -> None:
+        """Remove least recently used draw results until the cache is within its bounds.
+
+        Returns
+        -------
+        None
+
+        """
+        while self._entries and (len(self._entries) > self.maxsize or self.nbytes > self.maxbytes):
+            _, entry = self._entries.popitem(last=False)
+            self.nbytes -= entry[1]
+
+    def clear(self) -> None:
+        """Remove all draw results and reset the counters.
+
+        Returns
+        -------
+        None
+
+        """
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+
+DRAWCACHE = DrawCache()
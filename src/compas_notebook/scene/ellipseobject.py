@@ -1,13 +1,39 @@
+from typing import Optional
+
 import pythreejs as three
 from compas.scene import GeometryObject
 
+from compas_notebook.conversions.curves import chordal_tolerance
 from compas_notebook.conversions.geometry import ellipse_to_threejs
 
 from .sceneobject import ThreeSceneObject
 
 
 class ThreeEllipseObject(ThreeSceneObject, GeometryObject):
-    """Scene object for drawing ellipses."""
+    """Scene object for drawing ellipses.
+
+    Parameters
+    ----------
+    tolerance : float, optional
+        The maximum distance between the drawn segments and the ellipse, relative to the major diameter of the ellipse.
+    pixels : float, optional
+        The maximum distance between the drawn segments and the ellipse in pixels of the view.
+        If provided, the ellipse is discretized for the camera of the viewer at the time of drawing,
+        and ``tolerance`` is only used if the scene is not displayed by a viewer.
+
+    """
+
+    def __init__(self, tolerance: float = 1e-3, pixels: Optional[float] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.tolerance = tolerance
+        self.pixels = pixels
+
+    @property
+    def settings(self) -> dict:
+        settings = super().settings
+        settings["tolerance"] = self.tolerance
+        settings["pixels"] = self.pixels
+        return settings
 
     def draw(self) -> list[three.Line]:
         """Draw the ellipse as a discretized polyline.
@@ -18,8 +44,17 @@ class ThreeEllipseObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        geometry = ellipse_to_threejs(self.geometry)
-        line = three.LineLoop(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+        ellipse = self.geometry
+        tolerance = chordal_tolerance(
+            2 * ellipse.major,
+            ellipse.frame.point,
+            self.tolerance,
+            self.pixels,
+            getattr(self.scene, "camera", None),
+            getattr(self.scene, "viewheight", None),
+        )
+        geometry = ellipse_to_threejs(ellipse, tolerance=tolerance)
+        line = three.LineLoop(geometry, self.pool.material(three.LineBasicMaterial, color=self.contrastcolor.hex))
 
         self._guids = [line]
 
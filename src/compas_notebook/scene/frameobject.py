@@ -1,3 +1,4 @@
+import pythreejs as three
 from compas.scene import GeometryObject
 
 from compas_notebook.conversions.geometry import frame_to_threejs
@@ -9,15 +10,15 @@ class ThreeFrameObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing frames"""
 
     def draw(self):
-        """Draw the frame associated with the scene object as a set of lines: x-axis in red, y-axis in green, z-axis in blue.
+        """Draw the frame associated with the scene object as line segments: x-axis in red, y-axis in green, z-axis in blue.
 
         Returns
         -------
-        list[three.Line]
+        list[three.LineSegments]
             List of pythreejs objects created.
 
         """
 
-        self._guids = frame_to_threejs(self.geometry)
+        self._guids = frame_to_threejs(self.geometry, material=self.pool.material(three.LineBasicMaterial, vertexColors="VertexColors"))
 
         return self.guids
@@ -0,0 +1,609 @@
+import hashlib
+import json
+import struct
+from typing import Optional
+
+import numpy
+import pythreejs as three
+from compas.colors import Color
+
+from .culling import object_matrix
+from .tessellation import edges_arrays
+from .tessellation import geometry_arrays
+
+# the rotation from the Z-up coordinate system of COMPAS to the Y-up coordinate system of glTF
+ZUP_TO_YUP = [1, 0, 0, 0, 0, 0, -1, 0, 0, 1, 0, 0, 0, 0, 0, 1]
+
+COMPONENTTYPES = {
+    numpy.dtype(numpy.int8): 5120,
+    numpy.dtype(numpy.uint8): 5121,
+    numpy.dtype(numpy.int16): 5122,
+    numpy.dtype(numpy.uint16): 5123,
+    numpy.dtype(numpy.uint32): 5125,
+    numpy.dtype(numpy.float32): 5126,
+}
+
+TYPES = {1: "SCALAR", 2: "VEC2", 3: "VEC3", 4: "VEC4"}
+
+POINTS, LINES, LINE_LOOP, LINE_STRIP, TRIANGLES = 0, 1, 2, 3, 4
+
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+
+def srgb_to_linear(colors: numpy.ndarray) -> numpy.ndarray:
+    """Convert sRGB color components in the range 0 to 1 to linear color components.
+
+    Parameters
+    ----------
+    colors
+        The sRGB color components.
+
+    Returns
+    -------
+    numpy.ndarray
+
+    Examples
+    --------
+    >>> srgb_to_linear(numpy.array([0.0, 0.5, 1.0])).round(4).tolist()
+    [0.0, 0.214, 1.0]
+
+    """
+    colors = numpy.asarray(colors, dtype=numpy.float64)
+    return numpy.where(colors <= 0.04045, colors / 12.92, ((colors + 0.055) / 1.055) ** 2.4)
+
+
+def material_color(value: str) -> list[float]:
+    """Convert the color of a pythreejs material to linear RGB components.
+
+    Parameters
+    ----------
+    value
+        A hex color, or a CSS color name.
+
+    Returns
+    -------
+    list[float]
+
+    """
+    color = Color.from_hex(value) if value.startswith("#") else Color.from_name(value)
+    return srgb_to_linear(color.rgb).tolist()
+
+
+def attribute_array(attribute: three.BaseBufferAttribute) -> numpy.ndarray:
+    """Get the array of a buffer attribute as float32, with normalized integer values mapped to their real values.
+
+    Parameters
+    ----------
+    attribute
+        The buffer attribute.
+
+    Returns
+    -------
+    numpy.ndarray
+        A (N, itemsize) array.
+
+    """
+    array = numpy.asarray(attribute.array)
+    if attribute.normalized and numpy.issubdtype(array.dtype, numpy.integer):
+        return (array / numpy.iinfo(array.dtype).max).astype(numpy.float32)
+    return array.astype(numpy.float32)
+
+
+def decompose_matrices(matrices: numpy.ndarray) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """Decompose transformation matrices without shear into translations, rotation quaternions, and scale factors.
+
+    Parameters
+    ----------
+    matrices
+        A (N, 4, 4) array of transformation matrices.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        The (N, 3) translations, the (N, 4) unit quaternions in XYZW order, and the (N, 3) scale factors.
+
+    Examples
+    --------
+    >>> matrix = numpy.diag([2.0, 3.0, 4.0, 1.0])
+    >>> matrix[:3, 3] = [1, 2, 3]
+    >>> [array.tolist() for array in decompose_matrices(matrix[None])]
+    [[[1.0, 2.0, 3.0]], [[0.0, 0.0, 0.0, 1.0]], [[2.0, 3.0, 4.0]]]
+
+    """
+    translations = matrices[:, :3, 3]
+    scales = numpy.linalg.norm(matrices[:, :3, :3], axis=1)
+    m = matrices[:, :3, :3] / numpy.where(scales > 0, scales, 1.0)[:, None, :]
+
+    # the quaternion components are computed from the largest of the trace and the diagonal, which is at least one
+    xx, yy, zz = m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]
+    pivots = numpy.column_stack([1 + xx + yy + zz, 1 + xx - yy - zz, 1 - xx + yy - zz, 1 - xx - yy + zz])
+    pivot = numpy.argmax(pivots, axis=1)
+    s = 2 * numpy.sqrt(numpy.maximum(pivots[numpy.arange(len(m)), pivot], 0))
+    candidates = numpy.stack(
+        [
+            [(m[:, 2, 1] - m[:, 1, 2]) / s, (m[:, 0, 2] - m[:, 2, 0]) / s, (m[:, 1, 0] - m[:, 0, 1]) / s, s / 4],
+            [s / 4, (m[:, 0, 1] + m[:, 1, 0]) / s, (m[:, 0, 2] + m[:, 2, 0]) / s, (m[:, 2, 1] - m[:, 1, 2]) / s],
+            [(m[:, 0, 1] + m[:, 1, 0]) / s, s / 4, (m[:, 1, 2] + m[:, 2, 1]) / s, (m[:, 0, 2] - m[:, 2, 0]) / s],
+            [(m[:, 0, 2] + m[:, 2, 0]) / s, (m[:, 1, 2] + m[:, 2, 1]) / s, s / 4, (m[:, 1, 0] - m[:, 0, 1]) / s],
+        ]
+    )
+    rotations = candidates[pivot, :, numpy.arange(len(m))]
+    rotations /= numpy.linalg.norm(rotations, axis=1)[:, None]
+    return translations, rotations, scales
+
+
+class GLBWriter:
+    """Writer of pythreejs objects to a binary glTF file.
+
+    The objects are written as a hierarchy of nodes with their transformation matrices.
+    Buffer geometries are written as indexed primitives with their positions and vertex colors,
+    parametric geometries and edge geometries are tessellated as three.js does in the browser,
+    and materials are written as unlit materials with the color and the opacity of the pythreejs material.
+    Instanced geometries are written as one node with the ``EXT_mesh_gpu_instancing`` extension,
+    with the translation, rotation, and scale of every instance, and, if they differ, the instance colors as ``_COLOR_0``.
+    Text sprites and the glyph quads of label collections are not supported, and are skipped.
+
+    Identical arrays are stored only once, such that geometries shared by multiple objects,
+    for example through the draw cache, do not increase the size of the file.
+    Similarly, identical meshes and materials are written once.
+
+    Attributes
+    ----------
+    gltf : dict
+        The JSON part of the glTF asset.
+
+    """
+
+    def __init__(self):
+        self.gltf = {
+            "asset": {"version": "2.0", "generator": "compas_notebook"},
+            "extensionsUsed": ["KHR_materials_unlit"],
+            "scene": 0,
+            "scenes": [{"nodes": [0]}],
+            "nodes": [{"name": "root", "matrix": ZUP_TO_YUP}],
+            "meshes": [],
+            "materials": [],
+            "accessors": [],
+            "bufferViews": [],
+            "buffers": [],
+        }
+        self._chunks = []
+        self._nbytes = 0
+        self._accessors = {}
+        self._meshes = {}
+        self._materials = {}
+        self._converted = {}
+
+    # =============================================================================
+    # Buffers
+    # =============================================================================
+
+    def add_accessor(self, array: numpy.ndarray, target: Optional[int] = None, bounds: bool = False) -> int:
+        """Add an array to the binary buffer, or reuse an identical array that was added before.
+
+        Parameters
+        ----------
+        array
+            A (N,) or (N, k) array with a dtype supported by glTF.
+        target
+            The target of the buffer view, ``ARRAY_BUFFER`` or ``ELEMENT_ARRAY_BUFFER``.
+        bounds
+            If True, the minimum and maximum of every component are included, as required for positions.
+
+        Returns
+        -------
+        int
+            The index of the accessor.
+
+        """
+        array = numpy.ascontiguousarray(array)
+        itemsize = 1 if array.ndim == 1 else array.shape[1]
+        key = hashlib.sha256(array.data).hexdigest(), array.dtype.str, array.shape, target
+        if key in self._accessors:
+            return self._accessors[key]
+
+        padding = -self._nbytes % 4
+        if padding:
+            self._chunks.append(b"\x00" * padding)
+            self._nbytes += padding
+
+        view = {"buffer": 0, "byteOffset": self._nbytes, "byteLength": array.nbytes}
+        if target is not None:
+            view["target"] = target
+        self.gltf["bufferViews"].append(view)
+        self._chunks.append(array.tobytes())
+        self._nbytes += array.nbytes
+
+        accessor = {
+            "bufferView": len(self.gltf["bufferViews"]) - 1,
+            "componentType": COMPONENTTYPES[array.dtype],
+            "count": len(array),
+            "type": TYPES[itemsize],
+        }
+        if bounds and len(array):
+            values = array.reshape(len(array), itemsize)
+            accessor["min"] = values.min(axis=0).tolist()
+            accessor["max"] = values.max(axis=0).tolist()
+        self.gltf["accessors"].append(accessor)
+
+        index = len(self.gltf["accessors"]) - 1
+        self._accessors[key] = index
+        return index
+
+    def add_material(self, color: list[float], opacity: float = 1.0, doublesided: bool = False) -> int:
+        """Add an unlit material, or reuse an identical material that was added before.
+
+        Parameters
+        ----------
+        color
+            The linear RGB color.
+        opacity
+            The opacity.
+        doublesided
+            If True, both sides of triangles are visible.
+
+        Returns
+        -------
+        int
+            The index of the material.
+
+        """
+        material = {
+            "pbrMetallicRoughness": {
+                "baseColorFactor": [round(c, 6) for c in color] + [opacity],
+                "metallicFactor": 0.0,
+                "roughnessFactor": 1.0,
+            },
+            "extensions": {"KHR_materials_unlit": {}},
+        }
+        if opacity < 1:
+            material["alphaMode"] = "BLEND"
+        if doublesided:
+            material["doubleSided"] = True
+
+        key = json.dumps(material, sort_keys=True)
+        if key not in self._materials:
+            self.gltf["materials"].append(material)
+            self._materials[key] = len(self.gltf["materials"]) - 1
+        return self._materials[key]
+
+    def add_mesh(self, attributes: dict[str, int], indices: Optional[int], mode: int, material: int) -> int:
+        """Add a mesh with one primitive, or reuse an identical mesh that was added before.
+
+        Parameters
+        ----------
+        attributes
+            The accessors of the vertex attributes.
+        indices
+            The accessor of the indices, if any.
+        mode
+            The primitive mode.
+        material
+            The index of the material.
+
+        Returns
+        -------
+        int
+            The index of the mesh.
+
+        """
+        key = tuple(sorted(attributes.items())), indices, mode, material
+        if key not in self._meshes:
+            primitive = {"attributes": attributes, "mode": mode, "material": material}
+            if indices is not None:
+                primitive["indices"] = indices
+            self.gltf["meshes"].append({"primitives": [primitive]})
+            self._meshes[key] = len(self.gltf["meshes"]) - 1
+        return self._meshes[key]
+
+    # =============================================================================
+    # Objects
+    # =============================================================================
+
+    def add_node(self, node: dict, parent: int) -> int:
+        """Add a node as a child of another node.
+
+        Parameters
+        ----------
+        node
+            The node.
+        parent
+            The index of the parent node.
+
+        Returns
+        -------
+        int
+            The index of the node.
+
+        """
+        self.gltf["nodes"].append(node)
+        index = len(self.gltf["nodes"]) - 1
+        self.gltf["nodes"][parent].setdefault("children", []).append(index)
+        return index
+
+    def add_objects(self, objects: list[three.Object3D], name: Optional[str] = None) -> int:
+        """Add pythreejs objects as children of a new group node.
+
+        Parameters
+        ----------
+        objects
+            The pythreejs objects.
+        name
+            The name of the group node.
+
+        Returns
+        -------
+        int
+            The index of the group node.
+
+        """
+        group = self.add_node({"name": name} if name else {}, 0)
+        for obj in objects:
+            self.add_object(obj, group)
+        return group
+
+    def add_object(self, obj: three.Object3D, parent: int) -> Optional[int]:
+        """Add a pythreejs object and its children.
+
+        Parameters
+        ----------
+        obj
+            The pythreejs object.
+        parent
+            The index of the parent node.
+
+        Returns
+        -------
+        int | None
+            The index of the node, or None if the object is not supported.
+
+        """
+        if isinstance(obj, three.Sprite):
+            return None
+        if isinstance(obj, three.Mesh) and "labelcolor" in getattr(obj.geometry, "attributes", {}):
+            return None
+
+        node = {}
+        matrix = object_matrix(obj)
+        if not numpy.allclose(matrix, numpy.identity(4)):
+            node["matrix"] = matrix.T.ravel().tolist()
+        if obj.name:
+            node["name"] = obj.name
+        index = self.add_node(node, parent)
+
+        geometry = getattr(obj, "geometry", None)
+        material = getattr(obj, "material", None)
+        if geometry is not None and material is not None:
+            if isinstance(geometry, three.InstancedBufferGeometry):
+                self.add_instances(obj, node)
+            else:
+                mesh = self.convert(obj)
+                if mesh is not None:
+                    node["mesh"] = mesh
+
+        for child in obj.children:
+            self.add_object(child, index)
+        return index
+
+    def object_mode(self, obj: three.Object3D) -> Optional[int]:
+        """The glTF primitive mode of a pythreejs object.
+
+        Parameters
+        ----------
+        obj
+            The pythreejs object.
+
+        Returns
+        -------
+        int | None
+
+        """
+        if isinstance(obj, three.Mesh):
+            return TRIANGLES
+        if isinstance(obj, three.LineSegments):
+            return LINES
+        if isinstance(obj, three.LineLoop):
+            return LINE_LOOP
+        if isinstance(obj, three.Line):
+            return LINE_STRIP
+        if isinstance(obj, three.Points):
+            return POINTS
+        return None
+
+    def geometry_accessors(self, geometry: three.BaseGeometry, mode: int, vertexcolors: bool) -> Optional[tuple[dict[str, int], Optional[int], int]]:
+        """Add the arrays of a pythreejs geometry.
+
+        Parameters
+        ----------
+        geometry
+            The pythreejs geometry.
+        mode
+            The primitive mode of the object.
+        vertexcolors
+            If True, the color attribute of the geometry is included.
+
+        Returns
+        -------
+        tuple[dict[str, int], int | None, int] | None
+            The accessors of the vertex attributes, the accessor of the indices, and the primitive mode,
+            or None if the geometry is not supported.
+
+        """
+        key = id(geometry), mode, vertexcolors
+        if key in self._converted:
+            return self._converted[key]
+
+        indices = None
+        colors = None
+
+        if isinstance(geometry, three.EdgesGeometry):
+            arrays = geometry_arrays(geometry.geometry)
+            if arrays is None:
+                return None
+            positions, elements = edges_arrays(*arrays, threshold=geometry.thresholdAngle)
+            mode = LINES
+
+        elif isinstance(geometry, (three.BufferGeometry, three.InstancedBufferGeometry)):
+            if "position" not in geometry.attributes:
+                return None
+            positions = attribute_array(geometry.attributes["position"]).reshape(-1, 3)
+            elements = geometry.attributes["index"].array if "index" in geometry.attributes else None
+            if vertexcolors and "color" in geometry.attributes:
+                colors = srgb_to_linear(attribute_array(geometry.attributes["color"]).reshape(len(positions), -1)[:, :3])
+
+        else:
+            arrays = geometry_arrays(geometry)
+            if arrays is None:
+                return None
+            positions, elements = arrays
+
+        # glTF does not allow empty accessors
+        if not len(positions) or elements is not None and not numpy.size(elements):
+            return None
+
+        attributes = {"POSITION": self.add_accessor(numpy.asarray(positions, dtype=numpy.float32), ARRAY_BUFFER, bounds=True)}
+        if colors is not None:
+            attributes["COLOR_0"] = self.add_accessor(colors.astype(numpy.float32), ARRAY_BUFFER)
+        if elements is not None:
+            elements = numpy.asarray(elements).ravel()
+            dtype = numpy.uint16 if len(positions) < 65536 else numpy.uint32
+            indices = self.add_accessor(elements.astype(dtype), ELEMENT_ARRAY_BUFFER)
+
+        self._converted[key] = attributes, indices, mode
+        return self._converted[key]
+
+    def convert(self, obj: three.Object3D, color: Optional[list[float]] = None) -> Optional[int]:
+        """Convert the geometry and the material of a pythreejs object to a glTF mesh.
+
+        Parameters
+        ----------
+        obj
+            The pythreejs object.
+        color
+            The linear RGB color, overriding the color of the material.
+
+        Returns
+        -------
+        int | None
+            The index of the mesh, or None if the object is not supported.
+
+        """
+        mode = self.object_mode(obj)
+        if mode is None:
+            return None
+
+        material = obj.material
+        vertexcolors = getattr(material, "vertexColors", "NoColors") != "NoColors"
+        result = self.geometry_accessors(obj.geometry, mode, vertexcolors)
+        if result is None:
+            return None
+        attributes, indices, mode = result
+
+        if color is None:
+            color = [1.0, 1.0, 1.0] if isinstance(material, three.ShaderMaterial) else material_color(material.color)
+        opacity = material.opacity if material.transparent else 1.0
+        material = self.add_material(color, opacity, material.side == "DoubleSide")
+        return self.add_mesh(attributes, indices, mode, material)
+
+    def add_instances(self, obj: three.Object3D, node: dict) -> None:
+        """Add the instances of an object with an instanced geometry to its node.
+
+        The instances share one mesh, and their transformations are stored as attributes of the ``EXT_mesh_gpu_instancing`` extension.
+        If all instances have the same color, the color is set on the material,
+        otherwise the material is white and the instance colors are stored in the ``_COLOR_0`` attribute of the extension.
+
+        Parameters
+        ----------
+        obj
+            The pythreejs object.
+        node
+            The node of the object.
+
+        Returns
+        -------
+        None
+
+        """
+        attributes = obj.geometry.attributes
+        names = [f"instanceMatrix{i}" for i in range(4)]
+        if not all(name in attributes for name in names):
+            return
+
+        # the attributes are the columns of the instance matrices
+        columns = [numpy.asarray(attributes[name].array, dtype=numpy.float64).reshape(-1, 4) for name in names]
+        matrices = numpy.stack(columns, axis=2)[: obj.geometry.maxInstancedCount or None]
+        if not len(matrices):
+            return
+        if "instanceColor" in attributes:
+            colors = srgb_to_linear(attribute_array(attributes["instanceColor"]).reshape(-1, 3))[: len(matrices)]
+        else:
+            colors = numpy.ones((len(matrices), 3))
+
+        uniform = numpy.allclose(colors, colors[0])
+        mesh = self.convert(obj, colors[0].round(6).tolist() if uniform else [1.0, 1.0, 1.0])
+        if mesh is None:
+            return
+
+        translations, rotations, scales = decompose_matrices(matrices)
+        instancing = {
+            "attributes": {
+                "TRANSLATION": self.add_accessor(translations.astype(numpy.float32)),
+                "ROTATION": self.add_accessor(rotations.astype(numpy.float32)),
+                "SCALE": self.add_accessor(scales.astype(numpy.float32)),
+            }
+        }
+        if not uniform:
+            instancing["attributes"]["_COLOR_0"] = self.add_accessor(colors.astype(numpy.float32))
+
+        if "EXT_mesh_gpu_instancing" not in self.gltf["extensionsUsed"]:
+            self.gltf["extensionsUsed"].append("EXT_mesh_gpu_instancing")
+        node["mesh"] = mesh
+        node["extensions"] = {"EXT_mesh_gpu_instancing": instancing}
+
+    # =============================================================================
+    # Output
+    # =============================================================================
+
+    def to_bytes(self) -> bytes:
+        """Serialize the glTF asset as a binary glTF container.
+
+        Returns
+        -------
+        bytes
+
+        """
+        gltf = dict(self.gltf)
+        binary = b"".join(self._chunks)
+        binary += b"\x00" * (-len(binary) % 4)
+        if binary:
+            gltf["buffers"] = [{"byteLength": len(binary)}]
+        else:
+            del gltf["buffers"], gltf["bufferViews"], gltf["accessors"]
+        for key in ("meshes", "materials"):
+            if not gltf[key]:
+                del gltf[key]
+
+        content = json.dumps(gltf, separators=(",", ":")).encode()
+        content += b" " * (-len(content) % 4)
+
+        chunks = struct.pack("<II", len(content), 0x4E4F534A) + content
+        if binary:
+            chunks += struct.pack("<II", len(binary), 0x004E4942) + binary
+        return struct.pack("<III", 0x46546C67, 2, 12 + len(chunks)) + chunks
+
+    def write(self, filepath: str) -> None:
+        """Write the binary glTF container to a file.
+
+        Parameters
+        ----------
+        filepath
+            The path of the file.
+
+        Returns
+        -------
+        None
+
+        """
+        with open(filepath, "wb") as f:
+            f.write(self.to_bytes())
@@ -1,18 +1,64 @@
+from typing import Optional
+from typing import Union
+
+import numpy
 import pythreejs as three
 from compas.colors import Color
 from compas.scene import GraphObject
 
-from compas_notebook.conversions import nodes_and_edges_to_threejs
-from compas_notebook.conversions import nodes_to_threejs
+from compas_notebook.conversions import colors_to_array
+from compas_notebook.conversions import uniform_color
 from compas_notebook.scene import ThreeSceneObject
 
+VERTEXSHADER = """
+attribute float size;
+attribute vec3 nodecolor;
+uniform float scale;
+varying vec3 vColor;
+
+void main() {
+    vColor = nodecolor;
+    vec4 mvPosition = modelViewMatrix * vec4(position, 1.0);
+    gl_PointSize = size;
+    if (projectionMatrix[2][3] == -1.0) {
+        gl_PointSize *= scale / -mvPosition.z;
+    }
+    gl_Position = projectionMatrix * mvPosition;
+}
+"""
+
+FRAGMENTSHADER = """
+varying vec3 vColor;
+
+void main() {
+    gl_FragColor = vec4(vColor, 1.0);
+}
+"""
+
 
 class ThreeGraphObject(ThreeSceneObject, GraphObject):
-    """Scene object for drawing graph."""
+    """Scene object for drawing graph.
+
+    The node keys, the node index, and the edge index array are cached between draws,
+    and the nodes and edges share one buffer of node positions.
+    If only the node positions change, :meth:`update` writes them into the existing buffer.
+
+    Parameters
+    ----------
+    nodesize : float | dict, optional
+        The size of the nodes, or a dict mapping nodes to sizes.
+        Nodes that are not in the dict have size ``0.1``.
+        Keys that are not nodes of the graph are ignored.
+    nodecolor : :class:`compas.colors.Color` | dict, optional
+        The color of the nodes, or a dict mapping nodes to colors.
+    edgecolor : :class:`compas.colors.Color` | dict, optional
+        The color of the edges, or a dict mapping edges to colors.
+
+    """
 
     def __init__(
         self,
-        nodesize=0.1,
+        nodesize: Union[float, dict] = 0.1,
         nodecolor=Color(0.0, 0.0, 0.0),
         edgecolor=Color(0.2, 0.2, 0.2),
         **kwargs,
@@ -23,35 +69,273 @@ class ThreeGraphObject(ThreeSceneObject, GraphObject):
             edgecolor=edgecolor,
             **kwargs,
         )
+        self._topology = None
+        self._buffers = {}
 
     def draw(self):
         """Draw the graph associated with the scene object.
 
         Returns
         -------
-        list[three.LineSegments, three.Points]
+        list[three.Points, three.LineSegments]
             List of pythreejs objects created.
 
         """
         guids = []
+        self._buffers = {}
 
-        nodes, edges = self.graph.to_nodes_and_edges()
+        topology = self._current_topology()
+        if self._topology is None or self._topology[0] != topology:
+            self._topology = topology, self._topology_arrays()
+        nodes, nodeindex, edges = self._topology[1]
 
-        if self.show_nodes:
-            if self.show_nodes is not True:
-                nodes = self.show_nodes
+        position = three.BufferAttribute(self._node_positions(), normalized=False)
+        self._buffers["position"] = position
 
-            geometry = nodes_to_threejs(nodes)
-            points = three.Points(geometry, three.PointsMaterial(size=self.nodesize, color=self.contrastcolor.hex))
-            guids.append(points)
+        if self.show_nodes:
+            rows = numpy.arange(len(nodes)) if self.show_nodes is True else self._node_rows(self.show_nodes)
+            guids.append(self.draw_nodes(position, rows))
 
         if self.show_edges:
             if self.show_edges is not True:
-                edges = self.show_edges
-
-            geometry = nodes_and_edges_to_threejs(nodes, edges)
-            line = three.LineSegments(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
-            guids.append(line)
+                edges = self._node_rows([node for edge in self.show_edges for node in edge]).reshape(-1, 2)
+            guids.append(self.draw_edges(position, edges))
 
         self._guids = guids
         return self.guids
+
+    def draw_nodes(self, position: three.BufferAttribute, rows: numpy.ndarray) -> three.Points:
+        """Draw the nodes as points that share the position buffer of the graph.
+
+        Parameters
+        ----------
+        position
+            The position buffer of all nodes.
+        rows
+            The rows of the nodes to draw in the position buffer.
+
+        Returns
+        -------
+        three.Points
+
+        """
+        colors = self._node_colors(rows)
+        sizes = self._node_sizes(rows)
+        uniform = uniform_color(colors)
+
+        attributes = {"position": position, "index": three.BufferAttribute(rows.astype(numpy.uint32), normalized=False)}
+
+        if sizes is None and uniform:
+            material = self.pool.material(three.PointsMaterial, size=self.nodesize, color=uniform.hex)
+        elif sizes is None:
+            attributes["color"] = three.BufferAttribute(self._scatter(rows, colors), normalized=False)
+            material = self.pool.material(three.PointsMaterial, size=self.nodesize, vertexColors="VertexColors")
+        else:
+            # points with individual sizes require a shader
+            # the scale converts sizes to pixels as for the attenuated sizes of points materials
+            attributes["nodecolor"] = three.BufferAttribute(self._scatter(rows, colors), normalized=False)
+            attributes["size"] = three.BufferAttribute(self._scatter(rows, sizes), normalized=False)
+            scale = (getattr(self.scene, "viewheight", None) or 600) / 2
+            material = three.ShaderMaterial(
+                vertexShader=VERTEXSHADER,
+                fragmentShader=FRAGMENTSHADER,
+                uniforms={"scale": {"value": scale}},
+            )
+
+        points = three.Points(three.BufferGeometry(attributes=attributes), material)
+        self._buffers["nodes"] = rows, points
+        return points
+
+    def draw_edges(self, position: three.BufferAttribute, edges: numpy.ndarray) -> three.LineSegments:
+        """Draw the edges as indexed line segments that share the position buffer of the graph.
+
+        With per-edge colors, the edges are drawn as separate segments instead,
+        since the colors of indexed segments are interpolated between the shared nodes.
+
+        Parameters
+        ----------
+        position
+            The position buffer of all nodes.
+        edges
+            The (E, 2) rows of the nodes of the edges in the position buffer.
+
+        Returns
+        -------
+        three.LineSegments
+
+        """
+        colors = self._edge_colors(edges)
+        uniform = uniform_color(colors)
+
+        if uniform:
+            geometry = three.BufferGeometry(
+                attributes={
+                    "position": position,
+                    "index": three.BufferAttribute(edges.astype(numpy.uint32).ravel(), normalized=False),
+                }
+            )
+            material = self.pool.material(three.LineBasicMaterial, color=uniform.hex)
+        else:
+            geometry = three.BufferGeometry(
+                attributes={
+                    "position": three.BufferAttribute(position.array[edges.ravel()], normalized=False),
+                    "color": three.BufferAttribute(numpy.repeat(colors, 2, axis=0), normalized=False),
+                }
+            )
+            material = self.pool.material(three.LineBasicMaterial, vertexColors="VertexColors")
+
+        lines = three.LineSegments(geometry, material)
+        self._buffers["edges"] = edges, lines
+        return lines
+
+    def update(self, positions: Optional[numpy.ndarray] = None) -> bool:
+        """Update the node positions of the previous draw in place.
+
+        The cached topology is reused, such that an update costs roughly a copy of the position array.
+        Colors and sizes are not updated.
+
+        Parameters
+        ----------
+        positions
+            The (N, 3) positions of the nodes, in the order of ``graph.nodes()`` at the time of the draw.
+            If None, the positions are read from the graph,
+            and the update fails if the nodes, the edges, or the visibility settings have changed.
+
+        Returns
+        -------
+        bool
+            True if the positions were updated, False if the graph has to be redrawn.
+
+        """
+        if self._topology is None or "position" not in self._buffers:
+            return False
+        if any(buffer[1] not in self.guids for name, buffer in self._buffers.items() if name != "position"):
+            return False
+
+        if positions is None:
+            if self._topology[0] != self._current_topology():
+                return False
+            positions = self._node_positions()
+        else:
+            positions = numpy.asarray(positions, dtype=numpy.float32).reshape(-1, 3)
+            if len(positions) != len(self._topology[1][0]):
+                return False
+
+        for widget, name, value in self.compute_frame(positions):
+            setattr(widget, name, value)
+
+        return True
+
+    def compute_frame(self, positions: numpy.ndarray) -> list[tuple[object, str, object]]:
+        """Compute the changes to the buffers of the previous draw that show new node positions.
+
+        Parameters
+        ----------
+        positions
+            The (N, 3) positions of the nodes, in the order of ``graph.nodes()`` at the time of the draw.
+
+        Returns
+        -------
+        list[tuple[object, str, object]]
+            The buffer attributes, the name of their array trait, and the new arrays.
+
+        Raises
+        ------
+        ValueError
+            If the number of positions is not the number of nodes.
+
+        """
+        if "position" not in self._buffers:
+            return []
+
+        positions = numpy.asarray(positions, dtype=numpy.float32).reshape(-1, 3)
+        if len(positions) != len(self._topology[1][0]):
+            raise ValueError(f"Expected {len(self._topology[1][0])} node positions, got {len(positions)}.")
+
+        changes = [(self._buffers["position"], "array", positions)]
+
+        # segments with per-edge colors have their own copy of the positions
+        if "edges" in self._buffers:
+            edges, lines = self._buffers["edges"]
+            attribute = lines.geometry.attributes["position"]
+            if attribute is not self._buffers["position"]:
+                changes.append((attribute, "array", positions[edges.ravel()]))
+
+        return changes
+
+    # =============================================================================
+    # Topology and attributes
+    # =============================================================================
+
+    def _current_topology(self) -> tuple:
+        """The nodes and edges of the graph and the visibility settings of the scene object.
+
+        Returns
+        -------
+        tuple
+
+        """
+        adjacency = [list(nbrs) for nbrs in self.graph.edge.values()]
+        return list(self.graph.node), adjacency, self.show_nodes, self.show_edges
+
+    def _topology_arrays(self) -> tuple[list, dict, numpy.ndarray]:
+        """The node keys, the index of the nodes, and the (E, 2) array of the node rows of the edges."""
+        nodes = list(self.graph.node)
+        nodeindex = {node: i for i, node in enumerate(nodes)}
+        edges = numpy.array([(nodeindex[u], nodeindex[v]) for u, v in self.graph.edges()], dtype=numpy.int64).reshape(-1, 2)
+        return nodes, nodeindex, edges
+
+    def _node_positions(self) -> numpy.ndarray:
+        try:
+            positions = [(attr["x"], attr["y"], attr["z"]) for attr in self.graph.node.values()]
+        except KeyError:
+            # coordinates that are not stored fall back to the default node attributes
+            positions = self.graph.nodes_attributes("xyz")
+        return numpy.array(positions, dtype=numpy.float32).reshape(-1, 3)
+
+    def _node_rows(self, nodes: list) -> numpy.ndarray:
+        nodeindex = self._topology[1][1]
+        return numpy.array([nodeindex[node] for node in nodes], dtype=numpy.int64)
+
+    def _node_row(self, key) -> int:
+        """The row of a node, from a key of a color dict or of a dict of node sizes."""
+        nodeindex = self._topology[1][1]
+        if key in nodeindex:
+            return nodeindex[key]
+        try:
+            # color dicts store the keys of integer nodes as strings
+            return nodeindex[int(key)]
+        except KeyError:
+            raise ValueError(key)
+
+    def _edge_id(self, key) -> int:
+        u, v = key.split(",") if isinstance(key, str) else key
+        u, v = sorted((self._node_row(u), self._node_row(v)))
+        return u * len(self._topology[1][0]) + v
+
+    def _node_colors(self, rows: numpy.ndarray) -> numpy.ndarray:
+        return colors_to_array(self.nodecolor, rows, self._node_row)
+
+    def _edge_colors(self, edges: numpy.ndarray) -> numpy.ndarray:
+        ids = edges.min(axis=1) * len(self._topology[1][0]) + edges.max(axis=1)
+        return colors_to_array(self.edgecolor, ids, self._edge_id)
+
+    def _node_sizes(self, rows: numpy.ndarray) -> Optional[numpy.ndarray]:
+        """The sizes of the nodes, or None if all nodes have the same size."""
+        if not isinstance(self.nodesize, dict):
+            return None
+        sizes = numpy.full(len(self._topology[1][0]), 0.1, dtype=numpy.float32)
+        for node, size in self.nodesize.items():
+            try:
+                sizes[self._node_row(node)] = size
+            except (TypeError, ValueError):
+                # sizes of nodes that are not in the graph are ignored, as are their colors
+                continue
+        sizes = sizes[rows]
+        return sizes
+
+    def _scatter(self, rows: numpy.ndarray, values: numpy.ndarray) -> numpy.ndarray:
+        """Expand the values of the drawn nodes to an array aligned with the position buffer of all nodes."""
+        array = numpy.zeros((len(self._topology[1][0]),) + values.shape[1:], dtype=numpy.float32)
+        array[rows] = values
+        return array
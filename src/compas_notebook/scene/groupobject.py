@@ -1,8 +1,13 @@
 from compas.colors import Color
 from compas.data import Data
+from compas.scene.descriptors.color import ColorAttribute
 
+from compas_notebook.conversions import dots_to_threejs
 from compas_notebook.conversions import shapes_to_edgesbuffer
 from compas_notebook.conversions import shapes_to_facesbuffer
+from compas_notebook.conversions import shapes_to_instancebuffers
+from compas_notebook.conversions.instances import INSTANCEABLE
+from compas_notebook.geometry import Dot
 
 from .sceneobject import SceneObject
 
@@ -20,17 +25,49 @@ class Group(Data):
 
 
 class ThreeGroupObject(SceneObject):
-    """A group of scene objects."""
+    """A group of scene objects.
+
+    Parameters
+    ----------
+    item : list[:class:`compas.data.Data`]
+        The items of the group.
+    instanced : bool, optional
+        If True, boxes, cones, cylinders, and spheres are drawn as instances of one shared geometry per shape type,
+        instead of being merged into one buffer with the other items.
+    compact : bool, optional
+        If True, the merged buffers are sent with quantized 16-bit positions and 16-bit indices where possible.
+    fontsize : int, optional
+        The font size in pixels of the glyph atlas of the dots in the group.
+        All dots are drawn as one collection of labels, with the glyphs of their characters rasterized once.
+    textcolor : :class:`compas.colors.Color`, optional
+        The color of the text of the dots in the group.
+
+    """
 
     item: Group
 
-    def __init__(self, item=None, **kwargs):
+    color = ColorAttribute(default=Color(0.9, 0.9, 0.9))
+
+    def __init__(self, item=None, instanced=False, compact=False, fontsize=64, textcolor=Color.black(), **kwargs):
         super().__init__(item=Group(item), **kwargs)
+        self.instanced = instanced
+        self.compact = compact
+        self.fontsize = fontsize
+        self.textcolor = textcolor
         self.show = True
         self.is_selected = False
         self.opacity = 1.0
         self.bounding_box = None
 
+    @property
+    def settings(self) -> dict:
+        settings = super().settings
+        settings["instanced"] = self.instanced
+        settings["compact"] = self.compact
+        settings["fontsize"] = self.fontsize
+        settings["textcolor"] = self.textcolor
+        return settings
+
     @property
     def items(self) -> list:
         return self.item.items
@@ -40,8 +77,24 @@ class ThreeGroupObject(SceneObject):
 
     def draw(self, *args, **kwargs):
         self._guids = []
-        edgesbuffer = shapes_to_edgesbuffer(self.items, Color(0.2, 0.2, 0.2))
-        facesbuffer = shapes_to_facesbuffer(self.items, self.color)
+        items = self.items
+
+        dots = [item for item in items if isinstance(item, Dot)]
+        if dots:
+            items = [item for item in items if not isinstance(item, Dot)]
+            self._guids += dots_to_threejs(dots, fontsize=self.fontsize, color=self.textcolor)
+            if not items:
+                return self._guids
+
+        if self.instanced:
+            shapes = [item for item in items if isinstance(item, INSTANCEABLE)]
+            items = [item for item in items if not isinstance(item, INSTANCEABLE)]
+            self._guids += shapes_to_instancebuffers(shapes, self.color, Color(0.2, 0.2, 0.2))
+            if not items:
+                return self._guids
+
+        edgesbuffer = shapes_to_edgesbuffer(items, Color(0.2, 0.2, 0.2), compact=self.compact)
+        facesbuffer = shapes_to_facesbuffer(items, self.color, compact=self.compact)
         self._guids.append(edgesbuffer)
         self._guids.append(facesbuffer)
         return self._guids
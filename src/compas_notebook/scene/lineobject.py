@@ -19,7 +19,7 @@ class ThreeLineObject(ThreeSceneObject, GeometryObject):
 
         """
         geometry = line_to_threejs(self.geometry)
-        line = three.Line(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+        line = three.Line(geometry, self.pool.material(three.LineBasicMaterial, color=self.contrastcolor.hex))
 
         self._guids = [line]
 
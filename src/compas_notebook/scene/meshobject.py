@@ -1,15 +1,51 @@
+import asyncio
+from typing import Callable
+from typing import Optional
+
 import numpy
 import pythreejs as three
 from compas.colors import Color
-from compas.geometry import Polygon
-from compas.geometry import earclip_polygon
 from compas.scene import MeshObject
 
+from compas_notebook.conversions import colors_to_array
+from compas_notebook.conversions import faces_to_edges
+from compas_notebook.conversions import spatial_chunks
+from compas_notebook.conversions import triangulate_faces
+from compas_notebook.conversions import uniform_color
+from compas_notebook.conversions.compact import apply_matrix
+from compas_notebook.conversions.compact import color_attribute
+from compas_notebook.conversions.compact import index_attribute
+from compas_notebook.conversions.compact import position_attribute
+from compas_notebook.conversions.compact import quantize_colors
+from compas_notebook.conversions.compact import quantize_positions
 from compas_notebook.scene import ThreeSceneObject
 
 
+def _edge_key(key: str, base: int) -> int:
+    u, v = key.split(",")
+    return int(u) * base + int(v)
+
+
 class ThreeMeshObject(ThreeSceneObject, MeshObject):
-    """Scene object for drawing mesh."""
+    """Scene object for drawing mesh.
+
+    Parameters
+    ----------
+    compact : bool, optional
+        If True, the buffers are sent with quantized 16-bit positions, 8-bit colors, and 16-bit indices where possible.
+        The dequantization of the positions is folded into the matrices of the pythreejs objects.
+    progressive : bool, optional
+        If True, faces with more than ``chunksize`` triangles are split into spatially coherent chunks,
+        which are sent to the browser one at a time, nearest to the camera first,
+        such that the notebook stays responsive while a very large mesh is uploaded.
+    chunksize : int, optional
+        The maximum number of triangles per chunk of a progressive upload.
+    callback : callable, optional
+        A function that is called with the scene object when all chunks of a progressive upload have been sent.
+
+    """
+
+    transient = ThreeSceneObject.transient + ("callback", "_buffers", "_topology", "_upload", "_vertexarrays")
 
     def __init__(
         self,
@@ -18,6 +54,10 @@ class ThreeMeshObject(ThreeSceneObject, MeshObject):
         edgecolor=Color(0.2, 0.2, 0.2),
         facecolor=Color(0.9, 0.9, 0.9),
         vertexsize=0.1,
+        compact=False,
+        progressive: bool = False,
+        chunksize: int = 250_000,
+        callback: Optional[Callable[["ThreeMeshObject"], None]] = None,
         **kwargs,
     ):
         super().__init__(
@@ -28,6 +68,22 @@ class ThreeMeshObject(ThreeSceneObject, MeshObject):
             vertexsize=vertexsize,
             **kwargs,
         )
+        self.compact = compact
+        self.progressive = progressive
+        self.chunksize = chunksize
+        self.callback = callback
+        self._buffers = {}
+        self._topology = None
+        self._upload = None
+        self._vertexarrays = None
+
+    @property
+    def settings(self) -> dict:
+        settings = super().settings
+        settings["compact"] = self.compact
+        settings["progressive"] = self.progressive
+        settings["chunksize"] = self.chunksize
+        return settings
 
     def draw(self):
         """Draw the mesh associated with the scene object.
@@ -39,118 +95,463 @@ class ThreeMeshObject(ThreeSceneObject, MeshObject):
 
         """
         self._guids = []
+        self._buffers = {}
+        self._vertexarrays = None
+        self.cancel_upload()
 
-        vertices = list(self.mesh.vertices())
-        faces = list(self.mesh.faces())
-        edges = list(self.mesh.edges())
+        vertices, edges, faces = self._visible_elements()
 
-        if self.show_vertices:
-            if self.show_vertices is not True:
-                vertices = self.show_vertices
+        if vertices is not None:
             self._guids.append(self.draw_vertices(vertices, self.vertexcolor))
 
-        if self.show_edges:
-            if self.show_edges is not True:
-                edges = self.show_edges
+        if edges is not None:
             self._guids.append(self.draw_edges(edges, self.edgecolor))
 
-        if self.show_faces:
-            if self.show_faces is not True:
-                faces = self.show_faces
+        if faces is not None:
             self._guids.append(self.draw_faces(faces, self.facecolor))
 
+        self._topology = self._current_topology()
+        self._precomputed = {}
+
         return self.guids
 
+    def compute_buffers(self) -> dict[str, tuple[numpy.ndarray, ...]]:
+        """Compute the arrays of the vertex, edge, and face buffers, without creating pythreejs widgets.
+
+        Returns
+        -------
+        dict[str, tuple[numpy.ndarray, ...]]
+            The positions and colors of the vertices and edges,
+            and the vertices, triangles, triangle face indices and face colors of the faces.
+
+        """
+        self._vertexarrays = None
+        vertices, edges, faces = self._visible_elements()
+        buffers = {}
+        if vertices is not None:
+            buffers["vertices"] = self._vertices_to_arrays(vertices, self.vertexcolor)
+        if edges is not None:
+            buffers["edges"] = self._edges_to_arrays(edges, self.edgecolor)
+        if faces is not None:
+            buffers["faces"] = self._faces_to_arrays(faces, self.facecolor)
+        return buffers
+
+    def _visible_elements(self) -> tuple:
+        """The vertices, edges, and faces to draw, or None for hidden elements."""
+        vertices = edges = faces = None
+        if self.show_vertices:
+            vertices = list(self.mesh.vertices()) if self.show_vertices is True else self.show_vertices
+        if self.show_edges:
+            # the edges of all faces are extracted in bulk, instead of walking the halfedges one by one
+            edges = faces_to_edges(list(self.mesh.face.values())) if self.show_edges is True else self.show_edges
+        if self.show_faces:
+            faces = list(self.mesh.faces()) if self.show_faces is True else self.show_faces
+        return vertices, edges, faces
+
+    def _current_topology(self) -> tuple:
+        """The topological state of the mesh and the visibility settings of the scene object.
+
+        Returns
+        -------
+        tuple
+
+        """
+        vertices = list(self.mesh.vertex)
+        faces = {face: list(vertices) for face, vertices in self.mesh.face.items()}
+        return vertices, faces, self.show_vertices, self.show_edges, self.show_faces
+
+    def update(self) -> bool:
+        """Update the buffers of the previous draw in place.
+
+        If the topology of the mesh and the visibility settings did not change,
+        new vertex coordinates and colors are written into the existing buffer attributes.
+
+        Returns
+        -------
+        bool
+            True if the buffers were updated, False if the mesh has to be redrawn.
+
+        """
+        if not self._buffers or self._topology != self._current_topology():
+            return False
+        if self.progressive:
+            # the chunks of a progressive upload are not updated in place
+            return False
+        if any(buffer[1] not in self.guids for buffer in self._buffers.values()):
+            return False
+
+        self._vertexarrays = None
+
+        arrays = []
+        matrices = []
+        materials = []
+
+        for name, to_arrays, color in (("vertices", self._vertices_to_arrays, self.vertexcolor), ("edges", self._edges_to_arrays, self.edgecolor)):
+            if name not in self._buffers:
+                continue
+            elements, obj = self._buffers[name]
+            positions, colors = to_arrays(elements, color)
+            uniform = uniform_color(colors)
+
+            if bool(uniform) != ("color" not in obj.geometry.attributes):
+                return False
+
+            positions, matrix = self._encode_positions(positions)
+            arrays.append((obj.geometry.attributes["position"], positions))
+            if uniform:
+                materials.append((obj, self._material(name, uniform.hex)))
+            else:
+                arrays.append((obj.geometry.attributes["color"], self._encode_colors(colors)))
+            matrices.append((obj, matrix))
+
+        if "faces" in self._buffers:
+            faces, mesh, triangles, faceindex = self._buffers["faces"]
+            vertices = self._vertex_arrays()[1]
+            colors = colors_to_array(self.facecolor, faces)
+            uniform = uniform_color(colors)
+
+            if bool(uniform) != ("index" in mesh.geometry.attributes):
+                return False
+
+            if uniform:
+                positions, matrix = self._encode_positions(vertices)
+                arrays.append((mesh.geometry.attributes["position"], positions))
+                materials.append((mesh, self._material("faces", uniform.hex)))
+            else:
+                positions, matrix = self._encode_positions(vertices[triangles].reshape(-1, 3))
+                arrays.append((mesh.geometry.attributes["position"], positions))
+                arrays.append((mesh.geometry.attributes["color"], self._encode_colors(numpy.repeat(colors[faceindex], 3, axis=0))))
+            matrices.append((mesh, matrix))
+
+        for attribute, array in arrays:
+            if not numpy.array_equal(attribute.array, array):
+                attribute.array = array
+
+        for obj, matrix in matrices:
+            if matrix is not None and list(obj.matrix) != matrix:
+                apply_matrix(obj, matrix)
+
+        # pooled materials are shared with other objects and are replaced instead of modified
+        for obj, material in materials:
+            if obj.material is not material:
+                obj.material = material
+
+        return True
+
+    def compute_frame(self, positions: numpy.ndarray) -> Optional[list[tuple[object, str, object]]]:
+        """Compute the changes to the buffers of the previous draw that show new vertex positions.
+
+        Colors are not recomputed, and the mesh itself is not modified.
+
+        Parameters
+        ----------
+        positions
+            The (V, 3) positions of the vertices, in the order of ``mesh.vertices()`` at the time of the draw.
+
+        Returns
+        -------
+        list[tuple[object, str, object]] | None
+            The buffer attributes and objects, the names of their traits, and the new values,
+            or None if the faces were drawn with a progressive upload.
+
+        Raises
+        ------
+        ValueError
+            If the number of positions is not the number of vertices.
+
+        """
+        if not self.guids:
+            return []
+        if self.show_faces and "faces" not in self._buffers:
+            # the chunks of a progressive upload are not updated
+            return None
+
+        keys = self._vertex_arrays()[0]
+        xyz = numpy.asarray(positions, dtype=numpy.float32).reshape(-1, 3)
+        if len(xyz) != len(keys):
+            raise ValueError(f"Expected {len(keys)} vertex positions, got {len(xyz)}.")
+
+        changes = []
+
+        def change(obj, positions):
+            positions, matrix = self._encode_positions(positions)
+            changes.append((obj.geometry.attributes["position"], "array", positions))
+            if matrix is not None:
+                changes.append((obj, "matrix", matrix))
+
+        if "vertices" in self._buffers:
+            vertices, points = self._buffers["vertices"]
+            change(points, xyz[self._vertex_indices(vertices)])
+
+        if "edges" in self._buffers:
+            edges, lines = self._buffers["edges"]
+            change(lines, xyz[self._vertex_indices(numpy.asarray(edges, dtype=numpy.int64).reshape(-1))])
+
+        if "faces" in self._buffers:
+            faces, mesh, triangles, faceindex = self._buffers["faces"]
+            # faces with a uniform color share the vertices, the others have a copy per triangle corner
+            change(mesh, xyz if "index" in mesh.geometry.attributes else xyz[triangles].reshape(-1, 3))
+
+        return changes
+
+    def _material(self, name: str, color: Optional[str] = None) -> three.Material:
+        """The pooled material of the vertices, edges, or faces, with a uniform color or with vertex colors."""
+        options = {"color": color} if color else {"vertexColors": "VertexColors"}
+        if name == "vertices":
+            return self.pool.material(three.PointsMaterial, size=self.vertexsize, **options)
+        if name == "edges":
+            return self.pool.material(three.LineBasicMaterial, **options)
+        return self.pool.material(three.MeshBasicMaterial, side="DoubleSide", **options)
+
+    def _encode_positions(self, positions):
+        if self.compact:
+            return quantize_positions(positions)
+        return numpy.asarray(positions, dtype=numpy.float32), None
+
+    def _encode_colors(self, colors):
+        if self.compact:
+            return quantize_colors(colors)
+        return numpy.asarray(colors, dtype=numpy.float32)
+
+    def _vertex_arrays(self) -> tuple[numpy.ndarray, numpy.ndarray, Optional[numpy.ndarray]]:
+        """The keys and coordinates of the vertices of the mesh, computed once per draw or update.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray | None]
+            The (V,) vertex keys, the (V, 3) vertex coordinates,
+            and the order of the sorted keys, or None if the keys are ``0`` to ``V - 1`` in order.
+
+        """
+        if self._vertexarrays is None:
+            keys = numpy.fromiter(self.mesh.vertex, dtype=numpy.int64, count=self.mesh.number_of_vertices())
+            try:
+                xyz = numpy.array([(attr["x"], attr["y"], attr["z"]) for attr in self.mesh.vertex.values()], dtype=numpy.float32)
+            except KeyError:
+                # coordinates that are not stored fall back to the default vertex attributes
+                xyz = numpy.array(self.mesh.vertices_attributes("xyz"), dtype=numpy.float32)
+            xyz = xyz.reshape(-1, 3)
+            order = None
+            if not numpy.array_equal(keys, numpy.arange(len(keys))):
+                order = numpy.argsort(keys, kind="stable")
+            self._vertexarrays = keys, xyz, order
+        return self._vertexarrays
+
+    def _vertex_indices(self, vertices) -> numpy.ndarray:
+        """The rows of the vertex array of a list or array of vertex keys."""
+        keys, _, order = self._vertex_arrays()
+        vertices = numpy.asarray(vertices, dtype=numpy.int64)
+        if order is None:
+            return vertices
+        return order[numpy.searchsorted(keys, vertices, sorter=order)]
+
+    def _vertices_to_arrays(self, vertices, color):
+        _, xyz, _ = self._vertex_arrays()
+        vertices = numpy.asarray(vertices, dtype=numpy.int64).reshape(-1)
+        positions = xyz[self._vertex_indices(vertices)]
+        colors = colors_to_array(color, vertices)
+        return positions, colors
+
+    def _edges_to_arrays(self, edges, color):
+        keys, xyz, _ = self._vertex_arrays()
+        edges = numpy.asarray(edges, dtype=numpy.int64).reshape(-1, 2)
+        positions = xyz[self._vertex_indices(edges.reshape(-1))]
+
+        # the color of an edge is stored under the sorted pair of its vertices
+        base = int(keys.max()) + 1 if len(keys) else 1
+        ids = edges.min(axis=1) * base + edges.max(axis=1)
+        colors = colors_to_array(color, ids, lambda key: _edge_key(key, base))
+        return positions, numpy.repeat(colors, 2, axis=0)
+
     def draw_vertices(self, vertices, color):
-        positions = [self.mesh.vertex_coordinates(vertex) for vertex in vertices]
-        positions = numpy.array(positions, dtype=numpy.float32)
-        colors = [color[i] for i in range(len(vertices))]
-        colors = numpy.array(colors, dtype=numpy.float32)
+        positions, colors = self._precomputed.pop("vertices", None) or self._vertices_to_arrays(vertices, color)
+        position, matrix = position_attribute(positions, compact=self.compact)
 
-        geometry = three.BufferGeometry(
-            attributes={
-                "position": three.BufferAttribute(positions, normalized=False),
-                "color": three.BufferAttribute(colors, normalized=False, itemSize=3),
-            }
-        )
-        material = three.PointsMaterial(
-            size=self.vertexsize,
-            vertexColors="VertexColors",
-        )
-        return three.Points(geometry, material)
+        # with a single vertex color, the color is set on the material instead of sent per vertex
+        uniform = uniform_color(colors)
+        if uniform:
+            geometry = three.BufferGeometry(attributes={"position": position})
+            material = self._material("vertices", uniform.hex)
+        else:
+            geometry = three.BufferGeometry(
+                attributes={
+                    "position": position,
+                    "color": color_attribute(colors, compact=self.compact),
+                }
+            )
+            material = self._material("vertices")
+        points = three.Points(geometry, material)
+        apply_matrix(points, matrix)
+        self._buffers["vertices"] = vertices, points
+        return points
 
     def draw_edges(self, edges, color):
-        positions = []
-        colors = []
+        positions, colors = self._precomputed.pop("edges", None) or self._edges_to_arrays(edges, color)
+        position, matrix = position_attribute(positions, compact=self.compact)
 
-        for u, v in edges:
-            positions.append(self.mesh.vertex_coordinates(u))
-            positions.append(self.mesh.vertex_coordinates(v))
-            colors.append(color[u, v])
-            colors.append(color[u, v])
+        uniform = uniform_color(colors)
+        if uniform:
+            geometry = three.BufferGeometry(attributes={"position": position})
+            material = self._material("edges", uniform.hex)
+        else:
+            geometry = three.BufferGeometry(
+                attributes={
+                    "position": position,
+                    "color": color_attribute(colors, compact=self.compact),
+                }
+            )
+            material = self._material("edges")
+        lines = three.LineSegments(geometry, material)
+        apply_matrix(lines, matrix)
+        self._buffers["edges"] = edges, lines
+        return lines
 
-        positions = numpy.array(positions, dtype=numpy.float32)
-        colors = numpy.array(colors, dtype=numpy.float32)
+    def _faces_to_arrays(self, faces, color):
+        vertex_index = self.mesh.vertex_index()
+        vertices = self.mesh.vertices_attributes("xyz")
+        indices = [[vertex_index[vertex] for vertex in self.mesh.face_vertices(face)] for face in faces]
 
-        geometry = three.BufferGeometry(
-            attributes={
-                "position": three.BufferAttribute(positions, normalized=False),
-                "color": three.BufferAttribute(colors, normalized=False, itemSize=3),
-            }
-        )
-        material = three.LineBasicMaterial(vertexColors="VertexColors")
-        return three.LineSegments(geometry, material)
+        triangles, faceindex = triangulate_faces(vertices, indices)
+
+        vertices = numpy.array(vertices, dtype=numpy.float32).reshape(-1, 3)
+        colors = colors_to_array(color, faces)
+        return vertices, triangles, faceindex, colors
 
     def draw_faces(self, faces, color):
-        positions = []
-        colors = []
-
-        for face in faces:
-            vertices = self.mesh.face_vertices(face)
-            c = color[face]
-
-            if len(vertices) == 3:
-                positions.append(self.mesh.vertex_coordinates(vertices[0]))
-                positions.append(self.mesh.vertex_coordinates(vertices[1]))
-                positions.append(self.mesh.vertex_coordinates(vertices[2]))
-                colors.append(c)
-                colors.append(c)
-                colors.append(c)
-            elif len(vertices) == 4:
-                positions.append(self.mesh.vertex_coordinates(vertices[0]))
-                positions.append(self.mesh.vertex_coordinates(vertices[1]))
-                positions.append(self.mesh.vertex_coordinates(vertices[2]))
-                colors.append(c)
-                colors.append(c)
-                colors.append(c)
-                positions.append(self.mesh.vertex_coordinates(vertices[0]))
-                positions.append(self.mesh.vertex_coordinates(vertices[2]))
-                positions.append(self.mesh.vertex_coordinates(vertices[3]))
-                colors.append(c)
-                colors.append(c)
-                colors.append(c)
-            else:
-                polygon = Polygon([self.mesh.vertex_coordinates(v) for v in vertices])
-                ears = earclip_polygon(polygon)
-                for ear in ears:
-                    positions.append(self.mesh.vertex_coordinates(vertices[ear[0]]))
-                    positions.append(self.mesh.vertex_coordinates(vertices[ear[1]]))
-                    positions.append(self.mesh.vertex_coordinates(vertices[ear[2]]))
-                    colors.append(c)
-                    colors.append(c)
-                    colors.append(c)
-
-        positions = numpy.array(positions, dtype=numpy.float32)
-        colors = numpy.array(colors, dtype=numpy.float32)
+        vertices, triangles, faceindex, colors = self._precomputed.pop("faces", None) or self._faces_to_arrays(faces, color)
+
+        if self.progressive and len(triangles) > self.chunksize:
+            return self.draw_chunks(vertices, triangles, faceindex, colors)
+
+        # with a single face color, the vertices can be shared between faces
+        # and the color can be set on the material
+        uniform = uniform_color(colors)
+        if uniform:
+            position, matrix = position_attribute(vertices, compact=self.compact)
+            geometry = three.BufferGeometry(
+                attributes={
+                    "position": position,
+                    "index": index_attribute(triangles, compact=self.compact),
+                }
+            )
+            material = self._material("faces", uniform.hex)
+            mesh = three.Mesh(geometry, material)
+            apply_matrix(mesh, matrix)
+            self._buffers["faces"] = faces, mesh, triangles, faceindex
+            return mesh
+
+        # flat per-face colors require a copy of the vertices per face
+        positions = vertices[triangles].reshape(-1, 3)
+        colors = numpy.repeat(colors[faceindex], 3, axis=0)
+
+        position, matrix = position_attribute(positions, compact=self.compact)
 
         geometry = three.BufferGeometry(
             attributes={
-                "position": three.BufferAttribute(positions, normalized=False),
-                "color": three.BufferAttribute(colors, normalized=False, itemSize=3),
+                "position": position,
+                "color": color_attribute(colors, compact=self.compact),
             }
         )
-        material = three.MeshBasicMaterial(
-            side="DoubleSide",
-            vertexColors="VertexColors",
-        )
-        return three.Mesh(geometry, material)
+        material = self._material("faces")
+        mesh = three.Mesh(geometry, material)
+        apply_matrix(mesh, matrix)
+        self._buffers["faces"] = faces, mesh, triangles, faceindex
+        return mesh
+
+    # =============================================================================
+    # Progressive upload
+    # =============================================================================
+
+    def _chunk_to_mesh(self, uniform, vertices, triangles, faceindex, colors) -> three.Mesh:
+        """Create the pythreejs mesh of one chunk of triangles, with only the vertices used by the chunk."""
+        if uniform:
+            used, triangles = numpy.unique(triangles, return_inverse=True)
+            position, matrix = position_attribute(vertices[used], compact=self.compact)
+            geometry = three.BufferGeometry(
+                attributes={
+                    "position": position,
+                    "index": index_attribute(triangles.reshape(-1, 3), compact=self.compact),
+                }
+            )
+            material = self._material("faces", uniform.hex)
+        else:
+            position, matrix = position_attribute(vertices[triangles].reshape(-1, 3), compact=self.compact)
+            geometry = three.BufferGeometry(
+                attributes={
+                    "position": position,
+                    "color": color_attribute(numpy.repeat(colors[faceindex], 3, axis=0), compact=self.compact),
+                }
+            )
+            material = self._material("faces")
+        mesh = three.Mesh(geometry, material)
+        apply_matrix(mesh, matrix)
+        return mesh
+
+    def draw_chunks(self, vertices, triangles, faceindex, colors) -> three.Group:
+        """Draw the faces as a group of chunks, of which only the first is created immediately.
+
+        The remaining chunks are added to the group one at a time, in separate iterations of the event loop,
+        such that every chunk is sent to the browser in its own messages and other messages can be handled in between.
+        Without a running event loop, all chunks are added immediately.
+
+        Returns
+        -------
+        three.Group
+
+        """
+        chunks = spatial_chunks(vertices, triangles, self.chunksize)
+
+        camera = getattr(self.scene, "camera", None)
+        if camera is not None:
+            position = numpy.asarray(camera.position, dtype=numpy.float64)
+            centers = [vertices[triangles[chunk]].reshape(-1, 3).mean(axis=0) for chunk in chunks]
+            distances = [numpy.linalg.norm(center - position) for center in centers]
+            chunks = [chunks[i] for i in numpy.argsort(distances, kind="stable")]
+
+        uniform = uniform_color(colors)
+        group = three.Group()
+        pending = iter(chunks)
+        total = len(chunks)
+
+        def add_chunk(done: int) -> None:
+            # the upload is abandoned if the mesh was drawn again in the meantime
+            if self._upload is not group:
+                return
+            chunk = next(pending)
+            faceindices = faceindex[chunk]
+            group.add(self._chunk_to_mesh(uniform, vertices, triangles[chunk], faceindices, colors))
+            self._report_progress(done + 1, total)
+            if done + 1 == total:
+                self._upload = None
+            elif loop is not None:
+                loop.call_soon(add_chunk, done + 1)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        self._upload = group
+        if loop is None:
+            for done in range(total):
+                add_chunk(done)
+        else:
+            add_chunk(0)
+        return group
+
+    def _report_progress(self, done: int, total: int) -> None:
+        progress = getattr(self.scene, "progress", None)
+        if progress is not None:
+            progress(self, done, total)
+        if done == total and self.callback is not None:
+            self.callback(self)
+
+    def cancel_upload(self) -> None:
+        """Stop adding chunks of a progressive upload that is still in progress.
+
+        Returns
+        -------
+        None
+
+        """
+        self._upload = None
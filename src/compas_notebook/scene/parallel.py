@@ -0,0 +1,178 @@
+import io
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import numpy
+from compas.data import Data
+
+from .sceneobject import ThreeSceneObject
+from .tessellationcache import TESSELLATIONCACHE
+
+# the pool of worker processes, which is kept alive between conversions
+# because starting a worker process imports COMPAS and pythreejs again
+_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_WORKERS = 0
+
+
+def supports_parallel(sceneobject) -> bool:
+    """Verify that a scene object implements :meth:`ThreeSceneObject.compute_buffers`.
+
+    Parameters
+    ----------
+    sceneobject
+        The scene object.
+
+    Returns
+    -------
+    bool
+
+    """
+    return isinstance(sceneobject, ThreeSceneObject) and type(sceneobject).compute_buffers is not ThreeSceneObject.compute_buffers
+
+
+def executor(workers: int) -> ProcessPoolExecutor:
+    """The pool of worker processes, which is created on first use and replaced if the number of workers changes.
+
+    The worker processes are spawned instead of forked,
+    since forking a kernel that runs other threads is not safe.
+
+    Parameters
+    ----------
+    workers
+        The number of worker processes.
+
+    Returns
+    -------
+    :class:`concurrent.futures.ProcessPoolExecutor`
+
+    """
+    global _EXECUTOR, _WORKERS
+
+    if _EXECUTOR is None or _WORKERS != workers:
+        shutdown()
+        _EXECUTOR = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _WORKERS = workers
+    return _EXECUTOR
+
+
+def shutdown() -> None:
+    """Stop the worker processes, if they are running.
+
+    Returns
+    -------
+    None
+
+    """
+    global _EXECUTOR, _WORKERS
+
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown(cancel_futures=True)
+    _EXECUTOR = None
+    _WORKERS = 0
+
+
+def _restore(cls: type, state: dict) -> object:
+    obj = object.__new__(cls)
+    obj.__dict__.update(state)
+    return obj
+
+
+class _StatePickler(pickle.Pickler):
+    # data items are pickled with their attributes, instead of their serialized data,
+    # which is several times faster to pickle and to unpickle, and restores the item exactly
+    def reducer_override(self, obj):
+        if isinstance(obj, Data) and hasattr(obj, "__dict__"):
+            return _restore, (type(obj), vars(obj))
+        return NotImplemented
+
+
+def dumps(sceneobject: ThreeSceneObject) -> bytes:
+    """Pickle the class and the :meth:`ThreeSceneObject.worker_state` of a scene object, for sending it to a worker process.
+
+    Data items that cannot be pickled by their attributes, for example because they wrap objects of a geometry kernel,
+    are pickled by their serialized data instead.
+
+    Parameters
+    ----------
+    sceneobject
+        The scene object.
+
+    Returns
+    -------
+    bytes
+
+    """
+    spec = type(sceneobject), sceneobject.worker_state()
+    stream = io.BytesIO()
+    try:
+        _StatePickler(stream, protocol=pickle.HIGHEST_PROTOCOL).dump(spec)
+    except Exception:
+        return pickle.dumps(spec, protocol=pickle.HIGHEST_PROTOCOL)
+    return stream.getvalue()
+
+
+def _compute_buffers(payload: bytes, tessellation: tuple) -> Optional[dict[str, tuple[numpy.ndarray, ...]]]:
+    TESSELLATIONCACHE.directory, TESSELLATIONCACHE.maxbytes = tessellation
+    cls, state = pickle.loads(payload)
+    sceneobject = _restore(cls, state)
+    try:
+        return sceneobject.compute_buffers()
+    except Exception:
+        # the error is raised again when the scene object is drawn in the main process
+        return None
+
+
+def precompute_buffers(sceneobjects: list[ThreeSceneObject], workers: int) -> None:
+    """Compute the buffer arrays of scene objects in a pool of worker processes.
+
+    Every scene object is sent to a worker process as its class and its :meth:`ThreeSceneObject.worker_state`, see :func:`dumps`,
+    from which the worker creates a copy of the scene object, and computes the buffer arrays with :meth:`ThreeSceneObject.compute_buffers`.
+    Since the conversion is pure Python, processes are used instead of threads, which would all wait for the GIL.
+    The arrays are sent back, and stored on the scene objects for the next call to :meth:`draw`,
+    which creates the pythreejs widgets in the main process.
+    Scene objects that cannot be sent to a worker, or that fail to compute their buffers there, are skipped,
+    and converted by :meth:`draw` as usual.
+
+    The first call starts the worker processes, which takes about as long as importing COMPAS and pythreejs.
+    The processes are reused by later calls.
+
+    Parameters
+    ----------
+    sceneobjects
+        The scene objects, which should all support :meth:`ThreeSceneObject.compute_buffers`.
+    workers
+        The number of worker processes.
+
+    Returns
+    -------
+    None
+
+    """
+    if workers < 2 or len(sceneobjects) < 2:
+        return
+
+    pool = executor(workers)
+    tessellation = TESSELLATIONCACHE.directory, TESSELLATIONCACHE.maxbytes
+    futures = []
+    for sceneobject in sceneobjects:
+        try:
+            payload = dumps(sceneobject)
+        except Exception:
+            continue
+        futures.append((sceneobject, pool.submit(_compute_buffers, payload, tessellation)))
+
+    broken = False
+    for sceneobject, future in futures:
+        try:
+            buffers = future.result()
+        except BrokenProcessPool:
+            broken = True
+            continue
+        if buffers is not None:
+            sceneobject._precomputed = buffers
+
+    if broken:
+        shutdown()
@@ -18,6 +18,6 @@ class ThreePlaneObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        self._guids = plane_to_threejs(self.geometry)
+        self._guids = plane_to_threejs(self.geometry, material=self.pool.material(three.LineBasicMaterial, vertexColors="VertexColors"))
 
         return self.guids
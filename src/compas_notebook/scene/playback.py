@@ -0,0 +1,331 @@
+import asyncio
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from typing import Optional
+from typing import Union
+
+import numpy
+from compas.geometry import Transformation
+
+from .culling import object_matrix
+from .sceneobject import ThreeSceneObject
+
+
+class Track:
+    """The frames of the animation of one scene object.
+
+    Parameters
+    ----------
+    sceneobject
+        The animated scene object.
+    frames
+        The (N, 3) vertex positions of every frame, for meshes and graphs,
+        or the transformation of every frame, for any scene object.
+
+    Attributes
+    ----------
+    transformations : bool
+        True if the frames are transformations.
+
+    """
+
+    def __init__(self, sceneobject: ThreeSceneObject, frames: list[Union[numpy.ndarray, Transformation]]):
+        self.sceneobject = sceneobject
+        self.frames = list(frames)
+        self.transformations = bool(self.frames) and isinstance(self.frames[0], Transformation)
+        self._guids = None
+        self._matrices = None
+
+    def __len__(self):
+        return len(self.frames)
+
+    def prepare(self) -> bool:
+        """Record the pythreejs objects of the scene object, and their matrices if the frames are transformations.
+
+        This has to be called before frames are computed, and again whenever the scene object may have been redrawn.
+
+        Returns
+        -------
+        bool
+            True if the pythreejs objects changed since the previous call, and computed frames are invalid.
+
+        """
+        guids = list(self.sceneobject.guids)
+        if self._guids is not None and len(guids) == len(self._guids) and all(a is b for a, b in zip(guids, self._guids)):
+            return False
+        self._guids = guids
+        if self.transformations:
+            # the transformations of the frames are applied on top of the matrices of the draw
+            self._matrices = [object_matrix(o3) for o3 in guids]
+        return True
+
+    def compute(self, index: int) -> list[tuple[object, str, object]]:
+        """Compute the changes to the pythreejs objects that show a frame.
+
+        Tracks that are shorter than the animation hold their last frame.
+
+        Parameters
+        ----------
+        index
+            The index of the frame.
+
+        Returns
+        -------
+        list[tuple[object, str, object]]
+            The pythreejs widgets, the names of their traits, and the new values.
+
+        """
+        frame = self.frames[min(index, len(self.frames) - 1)]
+
+        if self.transformations:
+            matrix = numpy.array(frame.matrix, dtype=numpy.float64)
+            changes = []
+            for o3, base in zip(self._guids, self._matrices):
+                changes.append((o3, "matrixAutoUpdate", False))
+                changes.append((o3, "matrix", (matrix @ base).transpose().ravel().tolist()))
+            return changes
+
+        changes = self.sceneobject.compute_frame(frame)
+        if changes is None:
+            raise TypeError(f"{type(self.sceneobject).__name__} does not support frames of vertex positions.")
+        return changes
+
+
+class Playback:
+    """Playback of the precomputed frames of animations of scene objects.
+
+    The changes that show a frame are computed ahead of time in a worker thread,
+    for up to ``buffersize`` frames after the current frame,
+    such that showing a frame only requires assigning the new buffer arrays and matrices to the pythreejs objects.
+    During playback, frames are shown at the target frame rate by the event loop of the kernel.
+    If a frame is not ready in time, the current frame is held and the frame is counted as dropped.
+
+    Parameters
+    ----------
+    fps
+        The target frame rate.
+    buffersize
+        The number of frames that are computed ahead.
+    loop
+        If True, playback restarts at the first frame after the last frame.
+
+    Attributes
+    ----------
+    tracks : list[:class:`Track`]
+        The animated scene objects and their frames.
+    index : int
+        The index of the frame that is shown.
+    playing : bool
+        True during playback.
+    dropped : int
+        The number of frames that were not ready in time during playback.
+    callback : callable
+        A function that is called with the index of every frame that is shown.
+
+    """
+
+    def __init__(self, fps: float = 30.0, buffersize: int = 16, loop: bool = True):
+        self.fps = fps
+        self.buffersize = buffersize
+        self.loop = loop
+        self.tracks: list[Track] = []
+        self.index = 0
+        self.playing = False
+        self.dropped = 0
+        self.callback: Optional[Callable[[int], None]] = None
+        self._executor = None
+        self._buffer: dict[int, Future] = {}
+        self._handle = None
+        self._deadline = None
+
+    def __len__(self):
+        return max((len(track) for track in self.tracks), default=0)
+
+    def add(self, sceneobject: ThreeSceneObject, frames: list[Union[numpy.ndarray, Transformation]]) -> Track:
+        """Add the frames of the animation of a scene object.
+
+        Parameters
+        ----------
+        sceneobject
+            The animated scene object.
+        frames
+            The (N, 3) vertex positions of every frame, for meshes and graphs,
+            or the transformation of every frame, for any scene object.
+
+        Returns
+        -------
+        :class:`Track`
+
+        """
+        track = Track(sceneobject, frames)
+        self.tracks = [other for other in self.tracks if other.sceneobject is not sceneobject] + [track]
+        self._clear_buffer()
+        return track
+
+    def clear(self) -> None:
+        """Stop playback and remove all tracks.
+
+        Returns
+        -------
+        None
+
+        """
+        self.pause()
+        self.tracks = []
+        self.index = 0
+        self.dropped = 0
+        self._clear_buffer()
+
+    def compute(self, index: int) -> list[tuple[object, str, object]]:
+        """Compute the changes to the pythreejs objects that show a frame of all tracks.
+
+        Parameters
+        ----------
+        index
+            The index of the frame.
+
+        Returns
+        -------
+        list[tuple[object, str, object]]
+
+        """
+        return [change for track in self.tracks if len(track) for change in track.compute(index)]
+
+    def prefetch(self, index: int) -> None:
+        """Compute the frames from an index onwards in the worker thread, up to the size of the buffer.
+
+        Parameters
+        ----------
+        index
+            The index of the first frame.
+
+        Returns
+        -------
+        None
+
+        """
+        length = len(self)
+        if not length:
+            return
+        self._prepare()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+
+        indices = [index + i for i in range(self.buffersize)]
+        if self.loop:
+            indices = [i % length for i in indices]
+        indices = [i for i in indices if i < length]
+
+        for i in list(self._buffer):
+            if i not in indices:
+                self._buffer.pop(i).cancel()
+        for i in indices:
+            if i not in self._buffer:
+                self._buffer[i] = self._executor.submit(self.compute, i)
+
+    def show(self, index: int) -> None:
+        """Show a frame, from the buffer if it was computed ahead.
+
+        Parameters
+        ----------
+        index
+            The index of the frame.
+
+        Returns
+        -------
+        None
+
+        """
+        length = len(self)
+        if not length:
+            return
+        index = max(0, min(index, length - 1))
+
+        self._prepare()
+        future = self._buffer.pop(index, None)
+        changes = future.result() if future is not None else self.compute(index)
+        for widget, name, value in changes:
+            setattr(widget, name, value)
+
+        self.index = index
+        self.prefetch(index + 1)
+        if self.callback is not None:
+            self.callback(index)
+
+    def play(self) -> None:
+        """Start playback at the current frame.
+
+        Without a running event loop, the remaining frames are shown immediately, one after the other.
+
+        Returns
+        -------
+        None
+
+        """
+        if self.playing or len(self) < 2:
+            return
+        if self.index >= len(self) - 1 and not self.loop:
+            self.index = 0
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            for index in range(self.index + 1, len(self)):
+                self.show(index)
+            return
+
+        self.prefetch(self.index + 1)
+        self.playing = True
+        self._deadline = loop.time()
+        self._schedule(loop)
+
+    def pause(self) -> None:
+        """Stop playback at the current frame.
+
+        Returns
+        -------
+        None
+
+        """
+        self.playing = False
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        # the deadlines do not drift with the time it takes to show a frame
+        self._deadline += 1 / self.fps
+        self._handle = loop.call_at(max(self._deadline, loop.time()), self._tick, loop)
+
+    def _tick(self, loop: asyncio.AbstractEventLoop) -> None:
+        if not self.playing:
+            return
+
+        index = self.index + 1
+        if index >= len(self):
+            if not self.loop:
+                self.pause()
+                return
+            index = 0
+
+        future = self._buffer.get(index)
+        if future is None:
+            self.prefetch(index)
+            self.dropped += 1
+        elif not future.done():
+            self.dropped += 1
+        else:
+            self.show(index)
+
+        self._schedule(loop)
+
+    def _prepare(self) -> None:
+        # computed frames refer to the pythreejs objects of the previous draw
+        if any([track.prepare() for track in self.tracks]):
+            self._clear_buffer()
+
+    def _clear_buffer(self) -> None:
+        for future in self._buffer.values():
+            future.cancel()
+        self._buffer = {}
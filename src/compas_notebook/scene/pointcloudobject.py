@@ -1,13 +1,104 @@
+from typing import Optional
+
+import numpy
 import pythreejs as three
 from compas.scene import GeometryObject
 
-from compas_notebook.conversions import pointcloud_to_threejs
+from compas_notebook.conversions import voxel_pyramid
+from compas_notebook.conversions.compact import apply_matrix
+from compas_notebook.conversions.compact import position_attribute
+from compas_notebook.conversions.compact import quantize_positions
 
+from .digest import data_digest
+from .scene import NotebookScene
 from .sceneobject import ThreeSceneObject
 
 
 class ThreePointcloudObject(ThreeSceneObject, GeometryObject):
-    """Scene object for drawing pointcloud."""
+    """Scene object for drawing pointcloud.
+
+    Large pointclouds are not sent to the browser in full.
+    Instead, a pyramid of voxel-downsampled levels is computed,
+    and the finest level that fits in the point budget is drawn.
+    Finer or coarser levels can be requested with :meth:`refine` and :meth:`coarsen`,
+    followed by :meth:`compas_notebook.viewer.Viewer.update`.
+
+    Parameters
+    ----------
+    pointbudget : int, optional
+        The maximum number of points drawn if no explicit level is set.
+    level : int, optional
+        The level of the pyramid to draw, with 0 the full resolution pointcloud.
+        If None, the level is selected based on the point budget.
+    compact : bool, optional
+        If True, the points are sent as quantized 16-bit positions,
+        with the dequantization folded into the matrix of the pythreejs object.
+
+    """
+
+    def __init__(self, pointbudget: int = 1_000_000, level: Optional[int] = None, compact: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.pointbudget = pointbudget
+        self.level = level
+        self.compact = compact
+        self._pyramid = None
+        self._pointsobject = None
+        self._drawnlevel = None
+
+    @property
+    def settings(self) -> dict:
+        settings = super().settings
+        settings["pointbudget"] = self.pointbudget
+        settings["level"] = self.level
+        settings["compact"] = self.compact
+        return settings
+
+    @property
+    def pyramid(self) -> list[numpy.ndarray]:
+        """The voxel pyramid of the pointcloud, from fine to coarse.
+
+        The pyramid is recomputed only if the version of the pointcloud has changed,
+        see :meth:`compas_notebook.scene.NotebookScene.version`.
+
+        """
+        if isinstance(self.scene, NotebookScene):
+            version = self.scene.version(self.geometry)
+        else:
+            version = data_digest(self.geometry)
+        if not self._pyramid or self._pyramid[0] != version:
+            points = numpy.array(self.geometry.points, dtype=numpy.float32).reshape(-1, 3)
+            self._pyramid = version, voxel_pyramid(points)
+        return self._pyramid[1]
+
+    def select_level(self, pyramid: list[numpy.ndarray]) -> int:
+        """Select the level of the pyramid to draw.
+
+        Parameters
+        ----------
+        pyramid
+            The levels of the pyramid.
+
+        Returns
+        -------
+        int
+
+        """
+        if self.level is not None:
+            return min(max(self.level, 0), len(pyramid) - 1)
+        for level, points in enumerate(pyramid):
+            if len(points) <= self.pointbudget:
+                return level
+        return len(pyramid) - 1
+
+    def refine(self) -> None:
+        """Request the next finer level of the pyramid."""
+        if self._drawnlevel is not None:
+            self.level = max(self._drawnlevel - 1, 0)
+
+    def coarsen(self) -> None:
+        """Request the next coarser level of the pyramid."""
+        if self._drawnlevel is not None and self._pyramid:
+            self.level = min(self._drawnlevel + 1, len(self._pyramid[1]) - 1)
 
     def draw(self):
         """Draw the pointcloud associated with the scene object.
@@ -18,9 +109,50 @@ class ThreePointcloudObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        geometry = pointcloud_to_threejs(self.geometry)
+        pyramid = self.pyramid
+        level = self.select_level(pyramid)
+
+        position, matrix = position_attribute(pyramid[level], compact=self.compact)
+        geometry = three.BufferGeometry(attributes={"position": position})
         material = three.PointsMaterial(size=self.pointsize, color=self.color.hex)
         pointclouds = three.Points(geometry, material)
+        apply_matrix(pointclouds, matrix)
 
+        self._pointsobject = pointclouds
+        self._drawnlevel = level
         self._guids = [pointclouds]
         return self.guids
+
+    def update(self) -> bool:
+        """Update the points of the previous draw in place.
+
+        If the number of points changes, for example because a different level of the pyramid is selected,
+        the buffer geometry of the existing points object is replaced.
+
+        Returns
+        -------
+        bool
+            True if the objects were updated, False if the scene object has to be redrawn.
+
+        """
+        if not self._pointsobject or self._pointsobject not in self.guids:
+            return False
+
+        pyramid = self.pyramid
+        level = self.select_level(pyramid)
+        points = numpy.asarray(pyramid[level], dtype=numpy.float32)
+
+        attribute = self._pointsobject.geometry.attributes["position"]
+        array, matrix = quantize_positions(points) if self.compact else (points, None)
+        if len(attribute.array) != len(points):
+            position, matrix = position_attribute(points, compact=self.compact)
+            self._pointsobject.geometry = three.BufferGeometry(attributes={"position": position})
+        elif not numpy.array_equal(attribute.array, array):
+            attribute.array = array
+        if matrix is not None:
+            apply_matrix(self._pointsobject, matrix)
+
+        self._pointsobject.material.size = self.pointsize
+        self._pointsobject.material.color = self.color.hex
+        self._drawnlevel = level
+        return True
@@ -19,7 +19,7 @@ class ThreePointObject(ThreeSceneObject, GeometryObject):
 
         """
         geometry = point_to_threejs(self.geometry)
-        material = three.PointsMaterial(size=self.pointsize, color=self.color.hex)
+        material = self.pool.material(three.PointsMaterial, size=self.pointsize, color=self.color.hex)
         points = three.Points(geometry, material)
 
         self._guids = [points]
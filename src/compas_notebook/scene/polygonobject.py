@@ -27,10 +27,10 @@ class ThreePolygonObject(ThreeSceneObject, GeometryObject):
         edges = list(pairwise(range(len(vertices)))) + [(n - 1, 0)]
 
         geometry = vertices_and_faces_to_threejs(vertices, triangles)
-        mesh = three.Mesh(geometry, three.MeshBasicMaterial(color=self.color.hex, side="DoubleSide"))
+        mesh = three.Mesh(geometry, self.pool.material(three.MeshBasicMaterial, color=self.color.hex, side="DoubleSide"))
 
         geometry = vertices_and_edges_to_threejs(vertices, edges)
-        line = three.LineSegments(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+        line = three.LineSegments(geometry, self.pool.material(three.LineBasicMaterial, color=self.contrastcolor.hex))
 
         self._guids = [mesh, line]
         return self.guids
@@ -19,7 +19,7 @@ class ThreePolylineObject(ThreeSceneObject, GeometryObject):
 
         """
         geometry = polyline_to_threejs(self.geometry)
-        polyline = three.Line(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+        polyline = three.Line(geometry, self.pool.material(three.LineBasicMaterial, color=self.contrastcolor.hex))
 
         guids = [polyline]
 
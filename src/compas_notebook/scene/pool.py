@@ -0,0 +1,126 @@
+import pythreejs as three
+
+
+class ResourcePool:
+    """Pool of the pythreejs materials and geometries shared by the scene objects of a scene.
+
+    Materials are shared by all objects with the same material type and options,
+    and parametric geometries by all objects with the same geometry type and parameters.
+    Primitive shapes are drawn with geometries of unit size, and their size is applied through the object matrix,
+    such that all shapes of the same type and resolution share one geometry.
+
+    Pooled materials and geometries are shared, and should therefore not be modified in place.
+    To change the color of an object, assign another pooled material instead.
+
+    Attributes
+    ----------
+    hits : int
+        The number of requests for a material or geometry that was already in the pool.
+    misses : int
+        The number of requests for a material or geometry that had to be created.
+
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._materials = {}
+        self._geometries = {}
+        self._edges = {}
+
+    def __len__(self):
+        return len(self._materials) + len(self._geometries) + len(self._edges)
+
+    @property
+    def stats(self) -> dict:
+        """Summary of the state of the pool."""
+        return {
+            "materials": len(self._materials),
+            "geometries": len(self._geometries) + len(self._edges),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def resources(self) -> list:
+        """All materials and geometries in the pool.
+
+        Returns
+        -------
+        list[three.Material | three.BaseGeometry]
+
+        """
+        return list(self._materials.values()) + list(self._geometries.values()) + list(self._edges.values())
+
+    def _get(self, cache: dict, key, factory):
+        value = cache.get(key)
+        if value is None:
+            self.misses += 1
+            value = cache[key] = factory()
+        else:
+            self.hits += 1
+        return value
+
+    def material(self, cls: type, **options) -> three.Material:
+        """Get the shared material of a material type with specific options.
+
+        Parameters
+        ----------
+        cls
+            The pythreejs material type, for example ``three.MeshBasicMaterial``.
+        **options
+            The options of the material, which should be hashable.
+
+        Returns
+        -------
+        three.Material
+
+        """
+        key = cls, tuple(sorted(options.items()))
+        return self._get(self._materials, key, lambda: cls(**options))
+
+    def geometry(self, cls: type, **parameters) -> three.BaseGeometry:
+        """Get the shared geometry of a parametric geometry type with specific parameters.
+
+        Parameters
+        ----------
+        cls
+            The pythreejs geometry type, for example ``three.BoxGeometry``.
+        **parameters
+            The parameters of the geometry.
+
+        Returns
+        -------
+        three.BaseGeometry
+
+        """
+        key = cls, tuple(sorted(parameters.items()))
+        return self._get(self._geometries, key, lambda: cls(**parameters))
+
+    def edges(self, geometry: three.BaseGeometry) -> three.EdgesGeometry:
+        """Get the shared edges geometry of a geometry.
+
+        Parameters
+        ----------
+        geometry
+            The geometry.
+
+        Returns
+        -------
+        three.EdgesGeometry
+
+        """
+        return self._get(self._edges, geometry.model_id, lambda: three.EdgesGeometry(geometry))
+
+    def clear(self) -> None:
+        """Remove all materials and geometries and reset the counters.
+
+        Returns
+        -------
+        None
+
+        """
+        self._materials.clear()
+        self._geometries.clear()
+        self._edges.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,194 @@
+from typing import Optional
+
+import ipywidgets as widgets
+import pythreejs as three
+
+COLUMNS = ["name", "type", "mode", "time", "widgets", "triangles", "segments", "points", "nbytes"]
+
+
+def element_count(obj: three.Object3D) -> tuple[int, int, int]:
+    """Count the triangles, line segments, and points drawn by a pythreejs object, excluding its children.
+
+    Only buffer geometries are counted.
+    Parametric geometries, such as ``three.BoxGeometry``, are tessellated in the browser.
+
+    Parameters
+    ----------
+    obj
+        The pythreejs object.
+
+    Returns
+    -------
+    tuple[int, int, int]
+        The number of triangles, segments, and points.
+
+    """
+    geometry = getattr(obj, "geometry", None)
+    if not isinstance(geometry, (three.BufferGeometry, three.InstancedBufferGeometry)):
+        return 0, 0, 0
+
+    attributes = geometry.attributes
+    if "index" in attributes:
+        count = attributes["index"].array.size
+    elif "position" in attributes:
+        count = len(attributes["position"].array)
+    else:
+        return 0, 0, 0
+
+    if isinstance(geometry, three.InstancedBufferGeometry):
+        count *= geometry.maxInstancedCount or 1
+
+    if isinstance(obj, three.Mesh):
+        return count // 3, 0, 0
+    if isinstance(obj, three.LineSegments):
+        return 0, count // 2, 0
+    if isinstance(obj, three.Line):
+        return 0, max(count - 1, 0), 0
+    if isinstance(obj, three.Points):
+        return 0, 0, count
+    return 0, 0, 0
+
+
+def iter_widgets(objects: list[three.Object3D]):
+    """Iterate over all widgets reachable from pythreejs objects through their synced traits, once each.
+
+    The widgets include the objects themselves, and their geometries, buffer attributes, materials, textures, and children.
+
+    Parameters
+    ----------
+    objects
+        The pythreejs objects.
+
+    Yields
+    ------
+    ipywidgets.Widget
+
+    """
+    visited = set()
+    stack = list(objects)
+
+    while stack:
+        value = stack.pop()
+        if isinstance(value, (list, tuple)):
+            stack += value
+            continue
+        if isinstance(value, dict):
+            stack += value.values()
+            continue
+        if not isinstance(value, widgets.Widget) or id(value) in visited:
+            continue
+
+        visited.add(id(value))
+        yield value
+
+        for key in value.keys:
+            if not key.startswith("_"):
+                stack.append(getattr(value, key))
+
+
+def object_statistics(objects: list[three.Object3D], existing: Optional[set[int]] = None) -> dict:
+    """Collect the statistics of the pythreejs objects of a scene object.
+
+    All widgets reachable from the objects are visited once, see :func:`iter_widgets`.
+    Widgets that existed before the objects were drawn, such as pooled materials and geometries,
+    are included in the element counts and buffer sizes, but are not counted as created widgets.
+
+    Parameters
+    ----------
+    objects
+        The pythreejs objects.
+    existing
+        The ids of the widgets that existed before the objects were drawn.
+
+    Returns
+    -------
+    dict
+        The number of widgets created, the number of triangles, segments, and points, and the size in bytes of the buffer arrays.
+
+    """
+    existing = existing or set()
+    stats = {"widgets": 0, "triangles": 0, "segments": 0, "points": 0, "nbytes": 0}
+
+    for widget in iter_widgets(objects):
+        if id(widget) not in existing:
+            stats["widgets"] += 1
+
+        if isinstance(widget, three.BaseBufferAttribute):
+            stats["nbytes"] += getattr(widget.array, "nbytes", 0)
+        if isinstance(widget, three.Object3D):
+            triangles, segments, points = element_count(widget)
+            stats["triangles"] += triangles
+            stats["segments"] += segments
+            stats["points"] += points
+
+    return stats
+
+
+class StatsTable(list):
+    """The drawing statistics of the scene objects, as a list of rows.
+
+    Every row is a dict with the keys ``name``, ``type``, ``mode``, ``time``,
+    ``widgets``, ``triangles``, ``segments``, ``points``, and ``nbytes``,
+    where ``widgets`` is the number of widgets created by the draw or the update, excluding pooled widgets that were reused.
+    The mode is "draw" for objects that were drawn, "cache" for objects reused from the draw cache,
+    and "update" for objects updated in place.
+    In a notebook, the table is displayed as HTML.
+
+    """
+
+    def total(self) -> dict:
+        """The totals of the numeric columns.
+
+        Returns
+        -------
+        dict
+
+        """
+        total = {column: 0 for column in COLUMNS[3:]}
+        for row in self:
+            for column in total:
+                total[column] += row[column]
+        return total
+
+    def summary(self) -> str:
+        """A one-line summary of the table, for display in the status bar.
+
+        Returns
+        -------
+        str
+
+        """
+        if not self:
+            return "No objects drawn."
+        total = self.total()
+        slowest = max(self, key=lambda row: row["time"])
+        return (
+            f"{len(self)} objects | {total['time']:.3f} s | "
+            f"{total['triangles']:,} triangles | {total['segments']:,} segments | {total['points']:,} points | "
+            f"{total['nbytes'] / 1e6:.1f} MB | {total['widgets']:,} widgets | "
+            f"slowest: {slowest['name']} ({slowest['time']:.3f} s)"
+        )
+
+    def _cells(self, row: dict) -> list[str]:
+        cells = []
+        for column in COLUMNS:
+            value = row[column]
+            if column == "time":
+                cells.append(f"{value:.4f}")
+            elif isinstance(value, int):
+                cells.append(f"{value:,}")
+            else:
+                cells.append(str(value))
+        return cells
+
+    def __str__(self) -> str:
+        rows = [COLUMNS] + [self._cells(row) for row in self]
+        widths = [max(len(row[i]) for row in rows) for i in range(len(COLUMNS))]
+        lines = ["  ".join(cell.ljust(width) if i < 3 else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths))) for row in rows]
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        return "\n".join(lines)
+
+    def _repr_html_(self) -> str:
+        header = "".join(f"<th>{column}</th>" for column in COLUMNS)
+        body = "".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in self._cells(row)) + "</tr>" for row in self)
+        return f"<table><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>"
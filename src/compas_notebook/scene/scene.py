@@ -1,6 +1,596 @@
+import functools
+import hashlib
+import os
+import time
+from typing import Optional
+
+import compas
+from compas.data import Data
 from compas.scene import Scene
+from compas.scene import SceneObject
+from compas.scene.context import after_draw
+from compas.scene.context import before_draw
+
+from .digest import data_digest
+from .drawcache import DRAWCACHE
+from .gltf import GLBWriter
+from .parallel import precompute_buffers
+from .parallel import supports_parallel
+from .pool import ResourcePool
+from .profiling import StatsTable
+from .profiling import iter_widgets
+from .profiling import object_statistics
+from .sceneobject import ThreeSceneObject
+
+
+def memoize_digests(method):
+    # the digests of data items are computed at most once per call of the decorated method,
+    # also if the scene objects ask for the versions of their items while drawing
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._digests = {}
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._digests = None
+
+    return wrapper
 
 
 class NotebookScene(Scene):
+    """Scene for drawing COMPAS objects in a notebook.
+
+    Parameters
+    ----------
+    name : str, optional
+        The name of the scene.
+    context : str, optional
+        The drawing context.
+
+    Attributes
+    ----------
+    profile : bool
+        If True, the duration and the output of drawing every scene object are recorded in :attr:`statistics`.
+    workers : int
+        The number of worker processes for computing the buffers of meshes and breps in parallel,
+        limited to the number of cores.
+        With one worker, all scene objects are converted in the calling process.
+    camera : three.Camera | None
+        The camera of the viewer displaying the scene, used for discretizing curves in screen space.
+    viewheight : float | None
+        The height in pixels of the view of the viewer displaying the scene.
+    pool : :class:`ResourcePool`
+        The materials and geometries shared by the scene objects.
+    progress : callable | None
+        A function that is called with a scene object, the number of sent chunks, and the total number of chunks,
+        during the progressive upload of a scene object.
+    updated : list[three.Object3D]
+        The pythreejs objects that were updated in place by the last call to :meth:`draw_changed`.
+    batching : bool
+        If True, visible scene objects of types that support it are drawn together per type,
+        with :meth:`ThreeSceneObject.draw_batch`, instead of one by one.
+        For example, all boxes of the scene are drawn as instances of one shared geometry.
+
+    Notes
+    -----
+    Changes of data items are detected by a digest of their content, see :func:`data_digest`,
+    such that items that are modified in place are redrawn or updated by :meth:`draw_changed` without further action.
+    For very large items, such as pointclouds with millions of points, computing the digest on every update is expensive.
+    Such items can be marked with :meth:`touch` instead,
+    after which their changes are detected with a version counter that has to be increased with :meth:`touch` after every modification.
+
+    """
+
     def __init__(self, name: str = "NotebookScene", context: str = "Notebook"):
         super().__init__(name=name, context=context)
+        self._drawn = {}
+        self.profile = False
+        self.statistics = {}
+        self.workers = 1
+        self.camera = None
+        self.viewheight = None
+        self.progress = None
+        self.pool = ResourcePool()
+        self.batching = False
+        self.updated = []
+        self._versions = {}
+        self._digests = None
+        self._batches = {}
+
+    def touch(self, *items: Data) -> None:
+        """Mark data items as modified in place, and detect their changes with a version counter from now on.
+
+        The content of touched items is no longer compared,
+        which avoids computing the digest of very large items on every update,
+        but every following modification of the items has to be marked with :meth:`touch` as well.
+
+        Parameters
+        ----------
+        *items
+            The modified data items.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> from compas.datastructures import Mesh
+        >>> scene = NotebookScene()
+        >>> mesh = Mesh.from_meshgrid(dx=1, nx=1)
+        >>> sceneobject = scene.add(mesh)
+        >>> scene.touch(mesh)
+        >>> before = scene.fingerprint(sceneobject)
+        >>> mesh.vertex_attribute(0, "z", 1.0)
+        >>> scene.fingerprint(sceneobject) == before
+        True
+        >>> scene.touch(mesh)
+        >>> scene.fingerprint(sceneobject) == before
+        False
+
+        """
+        for item in items:
+            self._versions[item.guid] = self._versions.get(item.guid, 0) + 1
+
+    def version(self, item, content: bool = False) -> object:
+        """Compute a token that identifies the state of a data item.
+
+        The token of an item that was marked with :meth:`touch` consists of its guid and the number of times it was marked,
+        and the token of any other item is the digest of its content.
+        During :meth:`draw` and :meth:`draw_changed`, the digest of every item is computed only once.
+        The token of a collection, such as the items of a group, consists of the tokens of its members.
+
+        Parameters
+        ----------
+        item
+            The data item.
+        content
+            If True, the token of touched items is the digest of their content as well.
+
+        Returns
+        -------
+        object
+            A token that can be serialized to JSON.
+
+        """
+        if isinstance(item, (list, tuple)):
+            return [self.version(member, content=content) for member in item]
+        if not isinstance(item, Data):
+            return item
+        members = getattr(item, "items", None)
+        if isinstance(members, (list, tuple)):
+            return [item.__dtype__, self.version(members, content=content)]
+        if not content and item.guid in self._versions:
+            return [str(item.guid), self._versions[item.guid]]
+        if self._digests is None:
+            return data_digest(item)
+        if item.guid not in self._digests:
+            self._digests[item.guid] = data_digest(item)
+        return self._digests[item.guid]
+
+    def fingerprint(self, sceneobject: SceneObject, content: bool = False) -> str:
+        """Compute a fingerprint of the type, the data item and the drawing settings of a scene object.
+
+        The data item is represented by its token, see :meth:`version`.
+        The name of the scene object is not part of the fingerprint, since it does not affect the drawing.
+
+        Parameters
+        ----------
+        sceneobject
+            The scene object.
+        content
+            If True, touched data items are represented by the digest of their content as well.
+
+        Returns
+        -------
+        str
+            The hexadecimal SHA256 digest of the serialized type, item token and settings.
+
+        Examples
+        --------
+        >>> from compas.datastructures import Mesh
+        >>> scene = NotebookScene()
+        >>> mesh = Mesh.from_meshgrid(dx=1, nx=1)
+        >>> sceneobject = scene.add(mesh)
+        >>> before = scene.fingerprint(sceneobject)
+        >>> mesh.vertex_attribute(0, "z", 1.0)
+        >>> scene.fingerprint(sceneobject) == before
+        False
+
+        """
+        settings = sceneobject.settings
+        settings.pop("name", None)
+        data = compas.json_dumps([type(sceneobject).__name__, self.version(sceneobject.item, content=content), settings], minimal=True)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def cachekey(self, sceneobject: SceneObject, fingerprint: str) -> str:
+        """Compute the key of the buffer arrays of a scene object in the draw cache.
+
+        The key depends only on the content of the data item and on the drawing settings,
+        and not on the version counters of this scene, since the draw cache is shared by all scenes.
+        As long as no data item was marked with :meth:`touch`, the key is the fingerprint.
+
+        Parameters
+        ----------
+        sceneobject
+            The scene object.
+        fingerprint
+            The fingerprint of the scene object.
+
+        Returns
+        -------
+        str
+
+        """
+        if not self._versions:
+            return fingerprint
+        return self.fingerprint(sceneobject, content=True)
+
+    def draw_sceneobject(self, sceneobject: SceneObject, fingerprint: str) -> list:
+        """Draw a scene object, reusing the buffer arrays of an identical draw from the draw cache.
+
+        The buffer arrays of scene objects that implement :meth:`ThreeSceneObject.compute_buffers`
+        are taken from the parallel precomputation or from the draw cache, or computed and added to the cache,
+        with the key computed by :meth:`cachekey`.
+        The pythreejs objects are always created anew.
+
+        Parameters
+        ----------
+        sceneobject
+            The scene object.
+        fingerprint
+            The fingerprint of the scene object.
+
+        Returns
+        -------
+        list[three.Object3D]
+            The pythreejs objects.
+
+        """
+        if self.profile:
+            existing = set(map(id, self.pool.resources()))
+            start = time.perf_counter()
+
+        mode = "draw"
+        if supports_parallel(sceneobject):
+            key = self.cachekey(sceneobject, fingerprint)
+            buffers = sceneobject._precomputed or DRAWCACHE.get(key)
+            if buffers is None:
+                buffers = sceneobject.compute_buffers()
+                DRAWCACHE.put(key, buffers)
+            elif buffers is sceneobject._precomputed:
+                DRAWCACHE.put(key, buffers)
+            else:
+                mode = "cache"
+            # the scene object consumes the entries of its precomputed buffers, but not the arrays
+            sceneobject._precomputed = dict(buffers)
+
+        guids = list(sceneobject.draw())
+        if self.profile:
+            self.record(sceneobject, mode, time.perf_counter() - start, guids, existing)
+        return guids
+
+    def record(self, sceneobject: SceneObject, mode: str, duration: float, guids: list, existing: Optional[set[int]] = None) -> None:
+        """Record the statistics of drawing a scene object.
+
+        Parameters
+        ----------
+        sceneobject
+            The scene object.
+        mode
+            How the pythreejs objects were obtained: "draw", "cache" if the buffer arrays were taken from the draw cache, or "update".
+        duration
+            The duration in seconds.
+        guids
+            The pythreejs objects.
+        existing
+            The ids of the widgets that existed before the draw or the update, which are not counted as created widgets.
+
+        Returns
+        -------
+        None
+
+        """
+        self.statistics[sceneobject.guid] = {
+            "name": sceneobject.name,
+            "type": type(sceneobject).__name__,
+            "mode": mode,
+            "time": duration,
+            **object_statistics(guids, existing),
+        }
+
+    def stats(self) -> StatsTable:
+        """The drawing statistics of the scene objects that are currently drawn, slowest first.
+
+        Statistics are only recorded if :attr:`profile` is True.
+
+        Returns
+        -------
+        :class:`compas_notebook.scene.profiling.StatsTable`
+
+        """
+        rows = [self.statistics[guid] for guid in list(self._drawn) + list(self._batches) if guid in self.statistics]
+        return StatsTable(sorted(rows, key=lambda row: row["time"], reverse=True))
+
+    def to_glb(self, filepath: str) -> None:
+        """Export the drawn scene objects to a binary glTF file.
+
+        The scene is drawn first if it has not been drawn before.
+        Otherwise, the scene objects are exported as they were drawn by the last call to :meth:`draw` or :meth:`draw_changed`.
+        Every scene object is written as a node with the name of the scene object,
+        and every batch of scene objects as a node with the name of the type of the scene objects.
+
+        Parameters
+        ----------
+        filepath
+            The path of the file.
+
+        Returns
+        -------
+        None
+
+        """
+        if not self._drawn:
+            self.draw()
+
+        writer = GLBWriter()
+        for sceneobject in self.objects:
+            if sceneobject.guid in self._drawn:
+                writer.add_objects(self._drawn[sceneobject.guid][1], name=sceneobject.name)
+        for name, (_, guids) in self._batches.items():
+            writer.add_objects(guids, name=name)
+        writer.write(filepath)
+
+    @memoize_digests
+    def draw(self):
+        """Draw all scene objects and store their fingerprints for subsequent calls to :meth:`draw_changed`.
+
+        Returns
+        -------
+        list[three.Object3D]
+            The pythreejs objects created.
+
+        """
+        if not self.context:
+            raise ValueError("No context detected.")
+
+        before_draw()
+
+        drawn_objects = []
+        self._drawn = {}
+        self._batches = {}
+        self.statistics = {}
+        self.updated = []
+
+        fingerprints = [(sceneobject, self.fingerprint(sceneobject)) for sceneobject in self.objects]
+        self.precompute(fingerprints)
+
+        batches = {}
+        for sceneobject, fingerprint in fingerprints:
+            if self.is_batched(sceneobject):
+                batches.setdefault(type(sceneobject), []).append((sceneobject, fingerprint))
+                self._drawn[sceneobject.guid] = fingerprint, []
+                continue
+            guids = self.draw_sceneobject(sceneobject, fingerprint) if sceneobject.show else []
+            self._drawn[sceneobject.guid] = fingerprint, guids
+            drawn_objects += guids
+
+        for cls, members in batches.items():
+            guids = self.draw_batch(cls, members)
+            self._batches[cls.__name__] = self.batch_fingerprint(members), guids
+            drawn_objects += guids
+
+        after_draw(drawn_objects)
+
+        return drawn_objects
+
+    @memoize_digests
+    def draw_changed(self):
+        """Draw only the scene objects that were added or modified since the last draw.
+
+        A scene object is considered modified if its fingerprint has changed.
+        Modified scene objects are first updated in place with :meth:`ThreeSceneObject.update`,
+        and only redrawn if that is not possible.
+        Batches of scene objects are redrawn as a whole if one of their scene objects was added, removed, or modified.
+        The pythreejs objects that were updated in place are stored in :attr:`updated`.
+
+        Returns
+        -------
+        tuple[list[three.Object3D], list[three.Object3D]]
+            The pythreejs objects of modified or removed scene objects that are no longer valid,
+            and the pythreejs objects created for added or modified scene objects.
+
+        """
+        removed = []
+        added = []
+        updated = []
+        drawn = {}
+
+        fingerprints = [(sceneobject, self.fingerprint(sceneobject)) for sceneobject in self.objects]
+
+        batches = {}
+        redraw = []
+        for sceneobject, fingerprint in fingerprints:
+            previous = self._drawn.pop(sceneobject.guid, None)
+
+            if self.is_batched(sceneobject):
+                batches.setdefault(type(sceneobject), []).append((sceneobject, fingerprint))
+                drawn[sceneobject.guid] = fingerprint, []
+                if previous:
+                    removed += previous[1]
+                continue
+
+            if previous:
+                if previous[0] == fingerprint:
+                    drawn[sceneobject.guid] = previous
+                    continue
+                if self.update_sceneobject(sceneobject, previous[0], previous[1]):
+                    drawn[sceneobject.guid] = fingerprint, previous[1]
+                    updated += previous[1]
+                    continue
+                removed += previous[1]
+
+            redraw.append((sceneobject, fingerprint))
+
+        # added scene objects, and modified scene objects that could not be updated in place
+        self.precompute(redraw)
+
+        for sceneobject, fingerprint in redraw:
+            guids = self.draw_sceneobject(sceneobject, fingerprint) if sceneobject.show else []
+            drawn[sceneobject.guid] = fingerprint, guids
+            added += guids
+
+        for guid, (_, guids) in self._drawn.items():
+            removed += guids
+            self.statistics.pop(guid, None)
+
+        drawnbatches = {}
+        for cls, members in batches.items():
+            fingerprint = self.batch_fingerprint(members)
+            previous = self._batches.pop(cls.__name__, None)
+            if previous and previous[0] == fingerprint:
+                drawnbatches[cls.__name__] = previous
+                continue
+            if previous:
+                removed += previous[1]
+            guids = self.draw_batch(cls, members)
+            drawnbatches[cls.__name__] = fingerprint, guids
+            added += guids
+
+        for name, (_, guids) in self._batches.items():
+            removed += guids
+            self.statistics.pop(name, None)
+
+        self._drawn = drawn
+        self._batches = drawnbatches
+        self.updated = updated
+        return removed, added
+
+    def is_batched(self, sceneobject: SceneObject) -> bool:
+        """Verify that a scene object is drawn in a batch with the other scene objects of its type.
+
+        Parameters
+        ----------
+        sceneobject
+            The scene object.
+
+        Returns
+        -------
+        bool
+            True if batching is enabled, and the scene object is visible and supports batching.
+
+        """
+        return self.batching and sceneobject.show and getattr(sceneobject, "batched", False)
+
+    def batch_fingerprint(self, members: list[tuple[SceneObject, str]]) -> str:
+        """Compute the fingerprint of a batch from the fingerprints of its scene objects.
+
+        Parameters
+        ----------
+        members
+            The scene objects of the batch and their fingerprints.
+
+        Returns
+        -------
+        str
+            The hexadecimal SHA256 digest of the fingerprints.
+
+        """
+        return hashlib.sha256("".join(fingerprint for _, fingerprint in members).encode()).hexdigest()
+
+    def draw_batch(self, cls: type, members: list[tuple[SceneObject, str]]) -> list:
+        """Draw the scene objects of a batch together.
+
+        The pythreejs objects of the batch are not assigned to the individual scene objects.
+
+        Parameters
+        ----------
+        cls
+            The type of the scene objects.
+        members
+            The scene objects of the batch and their fingerprints.
+
+        Returns
+        -------
+        list[three.Object3D]
+            The pythreejs objects.
+
+        """
+        if self.profile:
+            existing = set(map(id, self.pool.resources()))
+            start = time.perf_counter()
+
+        sceneobjects = [sceneobject for sceneobject, _ in members]
+        for sceneobject in sceneobjects:
+            sceneobject._guids = []
+        guids = list(cls.draw_batch(sceneobjects))
+
+        if self.profile:
+            self.statistics[cls.__name__] = {
+                "name": f"{len(sceneobjects)} x {cls.__name__}",
+                "type": cls.__name__,
+                "mode": "batch",
+                "time": time.perf_counter() - start,
+                **object_statistics(guids, existing),
+            }
+        return guids
+
+    def precompute(self, fingerprints: list[tuple[SceneObject, str]]) -> None:
+        """Compute the buffers of scene objects that have to be drawn in parallel, if more than one worker and core are available.
+
+        Scene objects that are hidden, that are in the draw cache, or that do not support precomputation are skipped,
+        and of scene objects with identical cache keys only the first one is computed.
+
+        Parameters
+        ----------
+        fingerprints
+            The scene objects and their fingerprints.
+
+        Returns
+        -------
+        None
+
+        """
+        # more worker processes than cores only add overhead
+        workers = min(self.workers, os.cpu_count() or 1)
+        if workers < 2:
+            return
+
+        sceneobjects = {}
+        for sceneobject, fingerprint in fingerprints:
+            if not sceneobject.show or not supports_parallel(sceneobject):
+                continue
+            key = self.cachekey(sceneobject, fingerprint)
+            if key not in DRAWCACHE and key not in sceneobjects:
+                sceneobjects[key] = sceneobject
+
+        precompute_buffers(list(sceneobjects.values()), workers)
+
+    def update_sceneobject(self, sceneobject: SceneObject, fingerprint: str, guids: list) -> bool:
+        """Update the pythreejs objects of a previous draw of a scene object in place.
+
+        Parameters
+        ----------
+        sceneobject
+            The scene object.
+        fingerprint
+            The fingerprint of the previous draw.
+        guids
+            The pythreejs objects of the previous draw.
+
+        Returns
+        -------
+        bool
+            True if the objects were updated, False if the scene object has to be redrawn.
+
+        """
+        if not guids or not sceneobject.show or not isinstance(sceneobject, ThreeSceneObject):
+            return False
+        if self.profile:
+            existing = set(map(id, self.pool.resources())) | set(map(id, iter_widgets(guids)))
+            start = time.perf_counter()
+        if not sceneobject.update():
+            return False
+        if self.profile:
+            self.record(sceneobject, "update", time.perf_counter() - start, guids, existing)
+        return True
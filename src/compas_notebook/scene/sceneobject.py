@@ -1,21 +1,56 @@
+from typing import Optional
 from typing import Tuple
 
 import numpy
 import pythreejs as three
 from compas.colors import Color
 from compas.geometry import Rotation
+from compas.geometry import Scale
 from compas.geometry import Transformation
 from compas.scene import SceneObject
 from compas.scene.descriptors.color import ColorAttribute
 
+from .pool import ResourcePool
+
 Rx = Rotation.from_axis_and_angle([1, 0, 0], 3.14159 / 2)
 
 
 class ThreeSceneObject(SceneObject):
-    """Base class for all PyThreeJS scene objects."""
+    """Base class for all PyThreeJS scene objects.
+
+    Attributes
+    ----------
+    batched : bool
+        True if the scene objects of this type can be drawn together with :meth:`draw_batch`,
+        when batching is enabled in the notebook scene.
+    transient : tuple[str, ...]
+        The names of the attributes that are not sent to worker processes by :meth:`worker_state`,
+        such as the references to the scene tree and the pythreejs objects of previous draws.
+
+    """
 
     color = ColorAttribute(default=Color(0.2, 0.2, 0.2))
 
+    batched = False
+
+    transient = ("_parent", "_children", "_tree", "_guids", "_shapeobjects", "_precomputed", "_pool")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._shapeobjects = None
+        self._precomputed = {}
+        self._pool = None
+
+    @property
+    def pool(self) -> ResourcePool:
+        """The pool of shared materials and geometries of the scene, or of the scene object if it is not in a notebook scene."""
+        pool = getattr(self.scene, "pool", None)
+        if pool is None:
+            if self._pool is None:
+                self._pool = ResourcePool()
+            pool = self._pool
+        return pool
+
     def y_to_z(self, transformation: Transformation) -> Transformation:
         """Convert a transformation from COMPAS to the ThreeJS coordinate system.
 
@@ -32,12 +67,33 @@ class ThreeSceneObject(SceneObject):
         """
         return transformation * Rx
 
+    @classmethod
+    def draw_batch(cls, sceneobjects: list["ThreeSceneObject"]) -> list[three.Object3D]:
+        """Draw scene objects of this type together, with fewer pythreejs objects than drawing them one by one.
+
+        The pythreejs objects of a batch are not owned by the individual scene objects,
+        and are replaced as a whole when one of the scene objects changes.
+
+        Parameters
+        ----------
+        sceneobjects
+            The scene objects.
+
+        Returns
+        -------
+        list[three.Object3D]
+            The pythreejs objects created.
+
+        """
+        raise NotImplementedError
+
     def geometry_to_objects(
         self,
         geometry: three.BufferGeometry,
         color: Color,
         contrastcolor: Color = None,
         transformation: Transformation = None,
+        scale: Optional[list[float]] = None,
     ) -> Tuple[three.Mesh, three.LineSegments]:
         """Convert a PyThreeJS geometry to a list of PyThreeJS objects.
 
@@ -51,6 +107,9 @@ class ThreeSceneObject(SceneObject):
             The RGB color of the edges.
         transformation : :class:`compas.geometry.Transformation`, optional
             The transformation to apply to the geometry.
+        scale : list[float], optional
+            The scale factors to apply to the geometry before the transformation,
+            for drawing a shape with a pooled geometry of unit size.
 
         Returns
         -------
@@ -61,15 +120,128 @@ class ThreeSceneObject(SceneObject):
         if not contrastcolor:
             contrastcolor = self.contrastcolor
 
-        edges = three.EdgesGeometry(geometry)
-        mesh = three.Mesh(geometry, three.MeshBasicMaterial(color=color.hex, side="DoubleSide"))
-        line = three.LineSegments(edges, three.LineBasicMaterial(color=contrastcolor.hex))
+        edges = self.pool.edges(geometry)
+        mesh = three.Mesh(geometry, self.pool.material(three.MeshBasicMaterial, color=color.hex, side="DoubleSide"))
+        line = three.LineSegments(edges, self.pool.material(three.LineBasicMaterial, color=contrastcolor.hex))
+
+        if scale:
+            transformation = (transformation or Transformation()) * Scale.from_factors(scale)
 
         if transformation:
-            matrix = numpy.array(transformation.matrix, dtype=numpy.float32).transpose().ravel().tolist()
+            matrix = transformation_to_matrix(transformation)
             mesh.matrix = matrix
             line.matrix = matrix
             mesh.matrixAutoUpdate = False
             line.matrixAutoUpdate = False
 
+        self._shapeobjects = mesh, line, self.shape_parameters(), scale
+
         return mesh, line
+
+    def compute_buffers(self) -> Optional[dict[str, tuple[numpy.ndarray, ...]]]:
+        """Compute the buffer arrays of the scene object, without creating pythreejs widgets.
+
+        Scene objects that implement this can be converted in a worker process, see :meth:`worker_state`.
+        The result is stored in ``_precomputed`` before :meth:`draw` is called,
+        and used by :meth:`draw` instead of computing the arrays again.
+
+        Returns
+        -------
+        dict[str, tuple[numpy.ndarray, ...]] | None
+            The buffer arrays, or None if the scene object does not support precomputation.
+
+        """
+        return None
+
+    def worker_state(self) -> dict:
+        """The attributes of the scene object that are needed for :meth:`compute_buffers` in a worker process.
+
+        A copy of the scene object is created in the worker process from these attributes,
+        which therefore have to be picklable.
+
+        Returns
+        -------
+        dict
+
+        """
+        return {name: value for name, value in vars(self).items() if name not in self.transient}
+
+    def compute_frame(self, positions: numpy.ndarray) -> Optional[list[tuple[object, str, object]]]:
+        """Compute the changes to the pythreejs objects of the previous draw that show new vertex positions.
+
+        The changes are computed without modifying the pythreejs objects or the data of the scene object,
+        such that the frames of an animation can be computed ahead of time, in a separate thread,
+        and shown later by applying the changes.
+
+        Parameters
+        ----------
+        positions
+            The (N, 3) vertex positions.
+
+        Returns
+        -------
+        list[tuple[object, str, object]] | None
+            The pythreejs widgets, the names of their traits, and the new values,
+            or None if the scene object does not support frames of vertex positions.
+
+        """
+        return None
+
+    def shape_parameters(self) -> dict:
+        """The parameters of the shape geometry that are not captured by its transformation.
+
+        Returns
+        -------
+        dict
+
+        """
+        return {key: value for key, value in self.geometry.__data__.items() if key != "frame"}
+
+    def update(self) -> bool:
+        """Update the pythreejs objects of the previous draw in place.
+
+        The base implementation supports shapes drawn with :meth:`geometry_to_objects`.
+        If the shape parameters did not change, the new transformation is applied by resetting the object matrices,
+        and the pooled materials of the new colors are assigned to the objects.
+
+        Returns
+        -------
+        bool
+            True if the objects were updated, False if the scene object has to be redrawn.
+
+        """
+        if not self._shapeobjects or self._shapeobjects[0] not in self.guids:
+            return False
+
+        mesh, line, parameters, scale = self._shapeobjects
+        if parameters != self.shape_parameters():
+            return False
+
+        transformation = self.y_to_z(self.geometry.transformation)
+        if scale:
+            transformation = transformation * Scale.from_factors(scale)
+        matrix = transformation_to_matrix(transformation)
+        mesh.matrix = matrix
+        line.matrix = matrix
+        mesh.matrixAutoUpdate = False
+        line.matrixAutoUpdate = False
+        mesh.material = self.pool.material(three.MeshBasicMaterial, color=self.color.hex, side="DoubleSide")
+        line.material = self.pool.material(three.LineBasicMaterial, color=self.contrastcolor.hex)
+
+        return True
+
+
+def transformation_to_matrix(transformation: Transformation) -> list[float]:
+    """Convert a COMPAS transformation to a column-major ThreeJS object matrix.
+
+    Parameters
+    ----------
+    transformation : :class:`compas.geometry.Transformation`
+        The transformation to convert.
+
+    Returns
+    -------
+    list[float]
+
+    """
+    return numpy.array(transformation.matrix, dtype=numpy.float32).transpose().ravel().tolist()
@@ -1,6 +1,7 @@
+import pythreejs as three
 from compas.scene import GeometryObject
 
-from compas_notebook.conversions import sphere_to_threejs
+from compas_notebook.conversions import shapes_to_instancebuffers
 
 from .sceneobject import ThreeSceneObject
 
@@ -8,6 +9,28 @@ from .sceneobject import ThreeSceneObject
 class ThreeSphereObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing sphere."""
 
+    batched = True
+
+    @classmethod
+    def draw_batch(cls, sceneobjects: list["ThreeSphereObject"]) -> list[three.Object3D]:
+        """Draw spheres as instances of shared unit geometries, with the colors of the individual scene objects.
+
+        Parameters
+        ----------
+        sceneobjects
+            The scene objects.
+
+        Returns
+        -------
+        list[three.Mesh, three.LineSegments]
+            One mesh and one line segments object per unit geometry.
+
+        """
+        shapes = [sceneobject.geometry for sceneobject in sceneobjects]
+        colors = [sceneobject.color for sceneobject in sceneobjects]
+        edgecolors = [sceneobject.contrastcolor for sceneobject in sceneobjects]
+        return shapes_to_instancebuffers(shapes, colors, edgecolors)
+
     def draw(self):
         """Draw the sphere associated with the scene object.
 
@@ -17,12 +40,14 @@ class ThreeSphereObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        geometry = sphere_to_threejs(self.geometry)
+        geometry = self.pool.geometry(three.SphereGeometry, radius=1, widthSegments=32, heightSegments=32)
         transformation = self.y_to_z(self.geometry.transformation)
+        radius = self.geometry.radius
 
         self._guids = self.geometry_to_objects(
             geometry,
             self.color,
             transformation=transformation,
+            scale=[radius, radius, radius],
         )
         return self.guids
@@ -7,7 +7,28 @@ from .sceneobject import ThreeSceneObject
 
 
 class ThreeSurfaceObject(ThreeSceneObject, GeometryObject):
-    """Scene object for drawing surfaces."""
+    """Scene object for drawing surfaces.
+
+    Parameters
+    ----------
+    resolution_u : int, optional
+        The number of divisions of the surface in the U direction.
+    resolution_v : int, optional
+        The number of divisions of the surface in the V direction.
+
+    """
+
+    def __init__(self, resolution_u: int = 20, resolution_v: int = 20, **kwargs):
+        super().__init__(**kwargs)
+        self.resolution_u = resolution_u
+        self.resolution_v = resolution_v
+
+    @property
+    def settings(self) -> dict:
+        settings = super().settings
+        settings["resolution_u"] = self.resolution_u
+        settings["resolution_v"] = self.resolution_v
+        return settings
 
     def draw(self) -> list[three.Object3D]:
         """Draw the surface as mesh with edges.
@@ -18,6 +39,6 @@ class ThreeSurfaceObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        self._guids = surface_to_threejs(self.geometry)
+        self._guids = surface_to_threejs(self.geometry, self.resolution_u, self.resolution_v)
 
         return self.guids
@@ -0,0 +1,276 @@
+from typing import Optional
+
+import numpy
+import pythreejs as three
+
+
+def box_arrays(geometry: three.BoxGeometry) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Tessellate a box geometry as three.js does in the browser.
+
+    Parameters
+    ----------
+    geometry
+        The box geometry.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The (V, 3) vertices and the (T, 3) triangles.
+
+    """
+    width, height, depth = geometry.width, geometry.height, geometry.depth
+    segments = geometry.widthSegments, geometry.heightSegments, geometry.depthSegments
+
+    # the axes, directions, and sizes of the six sides, in the order of three.BoxBufferGeometry
+    planes = [
+        (2, 1, 0, -1, -1, depth, height, width, segments[2], segments[1]),
+        (2, 1, 0, 1, -1, depth, height, -width, segments[2], segments[1]),
+        (0, 2, 1, 1, 1, width, depth, height, segments[0], segments[2]),
+        (0, 2, 1, 1, -1, width, depth, -height, segments[0], segments[2]),
+        (0, 1, 2, 1, -1, width, height, depth, segments[0], segments[1]),
+        (0, 1, 2, -1, -1, width, height, -depth, segments[0], segments[1]),
+    ]
+
+    vertices = []
+    triangles = []
+    count = 0
+    for u, v, w, udir, vdir, pwidth, pheight, pdepth, gridx, gridy in planes:
+        x = numpy.linspace(-pwidth / 2, pwidth / 2, gridx + 1)
+        y = numpy.linspace(-pheight / 2, pheight / 2, gridy + 1)
+        xx, yy = numpy.meshgrid(x, y)
+        points = numpy.empty((xx.size, 3))
+        points[:, u] = xx.ravel() * udir
+        points[:, v] = yy.ravel() * vdir
+        points[:, w] = pdepth / 2
+        vertices.append(points)
+
+        index = count + numpy.arange((gridx + 1) * (gridy + 1)).reshape(gridy + 1, gridx + 1)
+        a = index[:-1, :-1].ravel()
+        b = index[1:, :-1].ravel()
+        c = index[1:, 1:].ravel()
+        d = index[:-1, 1:].ravel()
+        triangles.append(numpy.column_stack([a, b, d, b, c, d]).reshape(-1, 3))
+        count += len(points)
+
+    return numpy.vstack(vertices), numpy.vstack(triangles)
+
+
+def sphere_arrays(geometry: three.SphereGeometry) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Tessellate a sphere geometry as three.js does in the browser.
+
+    Parameters
+    ----------
+    geometry
+        The sphere geometry.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The (V, 3) vertices and the (T, 3) triangles.
+
+    """
+    ws, hs = geometry.widthSegments, geometry.heightSegments
+    theta_end = geometry.thetaStart + geometry.thetaLength
+
+    phi = geometry.phiStart + numpy.linspace(0, 1, ws + 1) * geometry.phiLength
+    theta = geometry.thetaStart + numpy.linspace(0, 1, hs + 1) * geometry.thetaLength
+    phi, theta = numpy.meshgrid(phi, theta)
+
+    r = geometry.radius
+    vertices = numpy.column_stack(
+        [
+            (-r * numpy.cos(phi) * numpy.sin(theta)).ravel(),
+            (r * numpy.cos(theta)).ravel(),
+            (r * numpy.sin(phi) * numpy.sin(theta)).ravel(),
+        ]
+    )
+
+    index = numpy.arange((ws + 1) * (hs + 1)).reshape(hs + 1, ws + 1)
+    a = index[:-1, 1:]
+    b = index[:-1, :-1]
+    c = index[1:, :-1]
+    d = index[1:, 1:]
+
+    # the degenerate triangles at the poles are skipped
+    upper = numpy.ones(hs, dtype=bool)
+    lower = numpy.ones(hs, dtype=bool)
+    if geometry.thetaStart <= 0:
+        upper[0] = False
+    if theta_end >= numpy.pi:
+        lower[-1] = False
+
+    triangles = numpy.full((hs, ws, 2, 3), -1)
+    triangles[upper, :, 0] = numpy.stack([a, b, d], axis=-1)[upper]
+    triangles[lower, :, 1] = numpy.stack([b, c, d], axis=-1)[lower]
+    triangles = triangles.reshape(-1, 3)
+    return vertices, triangles[triangles[:, 0] >= 0]
+
+
+def cylinder_arrays(geometry: three.CylinderGeometry) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Tessellate a cylinder geometry, which includes cones, as three.js does in the browser.
+
+    Parameters
+    ----------
+    geometry
+        The cylinder geometry.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The (V, 3) vertices and the (T, 3) triangles.
+
+    """
+    rs, hs = geometry.radialSegments, geometry.heightSegments
+    half = geometry.height / 2
+    theta = geometry.thetaStart + numpy.linspace(0, 1, rs + 1) * geometry.thetaLength
+    sin, cos = numpy.sin(theta), numpy.cos(theta)
+
+    v = numpy.linspace(0, 1, hs + 1)
+    radius = v * (geometry.radiusBottom - geometry.radiusTop) + geometry.radiusTop
+    vertices = [
+        numpy.column_stack(
+            [
+                numpy.outer(radius, sin).ravel(),
+                numpy.repeat(-v * geometry.height + half, rs + 1),
+                numpy.outer(radius, cos).ravel(),
+            ]
+        )
+    ]
+
+    index = numpy.arange((hs + 1) * (rs + 1)).reshape(hs + 1, rs + 1)
+    a = index[:-1, :-1].ravel()
+    b = index[1:, :-1].ravel()
+    c = index[1:, 1:].ravel()
+    d = index[:-1, 1:].ravel()
+    triangles = [numpy.column_stack([a, b, d, b, c, d]).reshape(-1, 3)]
+    count = index.size
+
+    if not geometry.openEnded:
+        for top, radius in ((True, geometry.radiusTop), (False, geometry.radiusBottom)):
+            if radius <= 0:
+                continue
+            y = half if top else -half
+            centers = numpy.column_stack([numpy.zeros(rs), numpy.full(rs, y), numpy.zeros(rs)])
+            rim = numpy.column_stack([radius * sin, numpy.full(rs + 1, y), radius * cos])
+            vertices += [centers, rim]
+
+            center = count + numpy.arange(rs)
+            i = count + rs + numpy.arange(rs)
+            if top:
+                triangles.append(numpy.column_stack([i, i + 1, center]))
+            else:
+                triangles.append(numpy.column_stack([i + 1, i, center]))
+            count += len(centers) + len(rim)
+
+    return numpy.vstack(vertices), numpy.vstack(triangles)
+
+
+def torus_arrays(geometry: three.TorusGeometry) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Tessellate a torus geometry as three.js does in the browser.
+
+    Parameters
+    ----------
+    geometry
+        The torus geometry.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The (V, 3) vertices and the (T, 3) triangles.
+
+    """
+    rs, ts = geometry.radialSegments, geometry.tubularSegments
+    u = numpy.linspace(0, 1, ts + 1) * geometry.arc
+    v = numpy.linspace(0, 1, rs + 1) * 2 * numpy.pi
+    u, v = numpy.meshgrid(u, v)
+
+    ring = geometry.radius + geometry.tube * numpy.cos(v)
+    vertices = numpy.column_stack([(ring * numpy.cos(u)).ravel(), (ring * numpy.sin(u)).ravel(), (geometry.tube * numpy.sin(v)).ravel()])
+
+    index = numpy.arange((rs + 1) * (ts + 1)).reshape(rs + 1, ts + 1)
+    a = index[1:, :-1].ravel()
+    b = index[:-1, :-1].ravel()
+    c = index[:-1, 1:].ravel()
+    d = index[1:, 1:].ravel()
+    return vertices, numpy.column_stack([a, b, d, b, c, d]).reshape(-1, 3)
+
+
+def edges_arrays(vertices: numpy.ndarray, triangles: numpy.ndarray, threshold: float = 1.0) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Extract the feature edges of a triangle mesh as :class:`three.EdgesGeometry` does in the browser.
+
+    Vertices at the same position, up to four decimals, are merged first.
+    An edge is a feature edge if it belongs to one triangle only,
+    or if the normals of its two triangles differ by at least the threshold angle.
+
+    Parameters
+    ----------
+    vertices
+        The (V, 3) vertices.
+    triangles
+        The (T, 3) triangles.
+    threshold
+        The threshold angle in degrees.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The (V, 3) merged vertices and the (E, 2) feature edges.
+
+    """
+    vertices = numpy.asarray(vertices, dtype=numpy.float64).reshape(-1, 3)
+    keys = numpy.round(vertices * 1e4).astype(numpy.int64)
+    _, first, merged = numpy.unique(keys, axis=0, return_index=True, return_inverse=True)
+    merged = merged.ravel()
+    points = vertices[first]
+
+    triangles = merged[numpy.asarray(triangles, dtype=numpy.int64).reshape(-1, 3)]
+    degenerate = (triangles[:, 0] == triangles[:, 1]) | (triangles[:, 1] == triangles[:, 2]) | (triangles[:, 2] == triangles[:, 0])
+    triangles = triangles[~degenerate]
+    if not len(triangles):
+        return points, numpy.zeros((0, 2), dtype=numpy.int64)
+
+    a, b, c = points[triangles[:, 0]], points[triangles[:, 1]], points[triangles[:, 2]]
+    normals = numpy.cross(b - a, c - a)
+    lengths = numpy.linalg.norm(normals, axis=1, keepdims=True)
+    normals /= numpy.where(lengths > 0, lengths, 1)
+
+    edges = numpy.stack([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]], axis=1).reshape(-1, 2)
+    edges.sort(axis=1)
+    faces = numpy.repeat(numpy.arange(len(triangles)), 3)
+
+    keys = edges[:, 0] * len(points) + edges[:, 1]
+    order = numpy.argsort(keys, kind="stable")
+    keys, edges, faces = keys[order], edges[order], faces[order]
+    starts = numpy.flatnonzero(numpy.r_[True, keys[1:] != keys[:-1]])
+    counts = numpy.diff(numpy.r_[starts, len(keys)])
+
+    second = numpy.where(counts > 1, faces[numpy.minimum(starts + 1, len(faces) - 1)], -1)
+    dots = (normals[faces[starts]] * normals[second]).sum(axis=1)
+    feature = (counts == 1) | (dots <= numpy.cos(numpy.radians(threshold)))
+    return points, edges[starts[feature]]
+
+
+def geometry_arrays(geometry: three.BaseGeometry) -> Optional[tuple[numpy.ndarray, numpy.ndarray]]:
+    """Tessellate one of the parametric geometries used by the conversions.
+
+    Parameters
+    ----------
+    geometry
+        A box, sphere, cylinder, or torus geometry.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray] | None
+        The (V, 3) vertices and the (T, 3) triangles,
+        or None if the geometry is not supported.
+
+    """
+    if isinstance(geometry, three.BoxGeometry):
+        return box_arrays(geometry)
+    if isinstance(geometry, three.SphereGeometry):
+        return sphere_arrays(geometry)
+    if isinstance(geometry, three.CylinderGeometry):
+        return cylinder_arrays(geometry)
+    if isinstance(geometry, three.TorusGeometry):
+        return torus_arrays(geometry)
+    return None
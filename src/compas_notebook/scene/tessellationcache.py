@@ -0,0 +1,246 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Optional
+
+import compas
+import numpy
+
+# increase when the layout of the cached buffers changes
+VERSION = 1
+
+
+def default_directory() -> str:
+    """The default directory of the tessellation cache, in the user cache directory.
+
+    Returns
+    -------
+    str
+
+    """
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "compas_notebook", "tessellation")
+
+
+class TessellationCache:
+    """Persistent, content-addressed cache of tessellations on disk.
+
+    Every tessellation is stored as a compressed NumPy archive,
+    named after the SHA256 digest of the serialized geometry and the tessellation settings.
+    Since the key depends only on the content, cached tessellations survive kernel restarts,
+    and are shared by all notebooks that use the same cache directory.
+    If the total size of the archives exceeds the limit, the least recently used archives are deleted.
+
+    Parameters
+    ----------
+    directory
+        The cache directory.
+        If None, the cache is stored in ``compas_notebook/tessellation`` in the user cache directory.
+    maxbytes
+        The maximum total size of the archives on disk.
+        A value of zero disables the cache.
+
+    Attributes
+    ----------
+    hits : int
+        The number of successful lookups.
+    misses : int
+        The number of failed lookups.
+
+    """
+
+    def __init__(self, directory: Optional[str] = None, maxbytes: int = 1024 * 1024 * 1024):
+        self.directory = directory
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def path(self) -> str:
+        """The path of the cache directory."""
+        return self.directory or default_directory()
+
+    @property
+    def nbytes(self) -> int:
+        """The total size of the archives on disk."""
+        return sum(size for _, _, size in self._entries())
+
+    @property
+    def stats(self) -> dict:
+        """Summary of the state of the cache."""
+        entries = self._entries()
+        return {
+            "path": self.path,
+            "size": len(entries),
+            "nbytes": sum(size for _, _, size in entries),
+            "maxbytes": self.maxbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def key(self, geometry, settings: dict) -> str:
+        """Compute the key of the tessellation of a geometry with specific settings.
+
+        Parameters
+        ----------
+        geometry
+            The geometry, which should be serializable by :func:`compas.json_dumps`.
+        settings
+            The tessellation settings.
+
+        Returns
+        -------
+        str
+            The hexadecimal SHA256 digest of the serialized geometry and settings.
+
+        """
+        data = compas.json_dumps(geometry, minimal=True) + json.dumps([VERSION, type(geometry).__name__, settings], sort_keys=True)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def filepath(self, key: str) -> str:
+        """The path of the archive of a key.
+
+        Parameters
+        ----------
+        key
+            The key of the tessellation.
+
+        Returns
+        -------
+        str
+
+        """
+        return os.path.join(self.path, f"{key}.npz")
+
+    def get(self, key: str) -> Optional[dict[str, tuple[numpy.ndarray, ...]]]:
+        """Load a cached tessellation, and mark it as most recently used.
+
+        Parameters
+        ----------
+        key
+            The key of the tessellation.
+
+        Returns
+        -------
+        dict[str, tuple[numpy.ndarray, ...]] | None
+            The buffer arrays, or None if the key is not in the cache or the archive cannot be read.
+
+        """
+        if self.maxbytes <= 0:
+            return None
+
+        filepath = self.filepath(key)
+        try:
+            with numpy.load(filepath, allow_pickle=False) as archive:
+                buffers = {}
+                for name in sorted(archive.files, key=lambda name: int(name.rsplit("_", 1)[1])):
+                    group = name.rsplit("_", 1)[0]
+                    buffers[group] = buffers.get(group, ()) + (archive[name],)
+            os.utime(filepath)
+        except (OSError, ValueError, KeyError):
+            # missing, or corrupted by an interrupted write of another process
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return buffers
+
+    def put(self, key: str, buffers: dict[str, tuple[numpy.ndarray, ...]]) -> None:
+        """Store a tessellation, evicting the least recently used tessellations if necessary.
+
+        The archive is written to a temporary file first and then moved into place,
+        such that concurrent readers never see a partial archive.
+
+        Parameters
+        ----------
+        key
+            The key of the tessellation.
+        buffers
+            The buffer arrays, grouped by name.
+
+        Returns
+        -------
+        None
+
+        """
+        if self.maxbytes <= 0:
+            return
+
+        arrays = {f"{group}_{i}": array for group, items in buffers.items() for i, array in enumerate(items)}
+
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            fd, tmppath = tempfile.mkstemp(suffix=".tmp", dir=self.path)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    numpy.savez_compressed(f, **arrays)
+                if os.path.getsize(tmppath) > self.maxbytes:
+                    os.remove(tmppath)
+                    return
+                os.replace(tmppath, self.filepath(key))
+            except BaseException:
+                if os.path.exists(tmppath):
+                    os.remove(tmppath)
+                raise
+        except OSError:
+            # a read-only or full disk should not prevent drawing
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used archives until the cache is within its size limit.
+
+        Returns
+        -------
+        None
+
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        nbytes = sum(size for _, _, size in entries)
+        for filepath, _, size in entries:
+            if nbytes <= self.maxbytes:
+                break
+            try:
+                os.remove(filepath)
+            except OSError:
+                continue
+            nbytes -= size
+
+    def clear(self) -> None:
+        """Delete all archives and reset the counters.
+
+        Returns
+        -------
+        None
+
+        """
+        for filepath, _, _ in self._entries():
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+        self.hits = 0
+        self.misses = 0
+
+    def _entries(self) -> list[tuple[str, float, int]]:
+        entries = []
+        try:
+            names = os.listdir(self.path)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(".npz"):
+                continue
+            filepath = os.path.join(self.path, name)
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                continue
+            entries.append((filepath, stat.st_mtime, stat.st_size))
+        return entries
+
+
+# disabled until enabled with the tessellation option of the cache configuration
+TESSELLATIONCACHE = TessellationCache(maxbytes=0)
@@ -23,17 +23,32 @@ class ThreeTorusObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        geometry = three.TorusGeometry(
-            radius=self.geometry.radius_axis,
-            tube=self.geometry.radius_pipe,
-            radialSegments=v,
-            tubularSegments=u,
-        )
+        # only the ratio of the radii of a torus cannot be applied as a scale
+        radius = self.geometry.radius_axis
+        if radius:
+            geometry = self.pool.geometry(
+                three.TorusGeometry,
+                radius=1,
+                tube=round(self.geometry.radius_pipe / radius, 6),
+                radialSegments=v,
+                tubularSegments=u,
+            )
+            scale = [radius, radius, radius]
+        else:
+            # a torus without axis radius has no ratio of radii
+            geometry = three.TorusGeometry(
+                radius=radius,
+                tube=self.geometry.radius_pipe,
+                radialSegments=v,
+                tubularSegments=u,
+            )
+            scale = None
         transformation = self.y_to_z(self.geometry.transformation)
 
         self._guids = self.geometry_to_objects(
             geometry,
             self.color,
             transformation=transformation,
+            scale=scale,
         )
         return self.guids
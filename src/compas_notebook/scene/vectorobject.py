@@ -10,7 +10,7 @@ class ThreeVectorObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing vectors as arrows."""
 
     def draw(self) -> list[three.Object3D]:
-        """Draw the vector as arrow (line + cone head).
+        """Draw the vector as arrow (line segments + cone head).
 
         Returns
         -------
@@ -18,6 +18,10 @@ class ThreeVectorObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        self._guids = vector_to_threejs(self.geometry)
+        self._guids = vector_to_threejs(
+            self.geometry,
+            material=self.pool.material(three.LineBasicMaterial, vertexColors="VertexColors"),
+            headmaterial=self.pool.material(three.MeshBasicMaterial, color="blue"),
+        )
 
         return self.guids
@@ -1,12 +1,22 @@
+import asyncio
+
 import ipywidgets as widgets
 import pythreejs as three
 from compas.colors import Color
 from compas.scene import Scene
+from compas.scene import SceneObject
 from IPython.display import display as ipydisplay
 
 from .config import Config
 from .controller import Controller
+from .scene import DRAWCACHE
+from .scene import TESSELLATIONCACHE
 from .scene import NotebookScene
+from .scene.culling import BVH
+from .scene.culling import camera_frustum
+from .scene.culling import object_aabb
+from .scene.playback import Playback
+from .scene.profiling import StatsTable
 
 
 class Viewer:
@@ -46,12 +56,39 @@ class Viewer:
         self.config = config or Config()
         self.controller = controller or Controller(viewer=self)
 
+        # the draw cache is shared by all viewers
+        DRAWCACHE.maxsize = self.config.cache.maxsize
+        DRAWCACHE.maxbytes = self.config.cache.maxbytes
+        DRAWCACHE.evict()
+
+        # the tessellation cache is shared by all viewers, and persists on disk if enabled
+        TESSELLATIONCACHE.directory = self.config.cache.tessellation_directory
+        TESSELLATIONCACHE.maxbytes = self.config.cache.tessellation_maxbytes if self.config.cache.tessellation else 0
+
         # move this to a UI class
         self.toolbar = None
         self.main = None
         self.statusbar = None
         self.statustext = None
 
+        # frustum culling
+        self.objects3 = []
+        self._bvh = None
+        self._bvhobjects = []
+        self._bvhindex = {}
+        self._unbounded = {}
+        self._culling_handle = None
+
+        # playback of animations
+        self.playback = Playback(
+            fps=self.config.playback.fps,
+            buffersize=self.config.playback.buffersize,
+            loop=self.config.playback.loop,
+        )
+        self.playback.callback = self.on_frame
+        self.playbackcontrols = None
+        self.playbackslider = None
+
     # =============================================================================
     # System methods
     # =============================================================================
@@ -60,45 +97,292 @@ class Viewer:
     def scene(self):
         if self._scene is None:
             self._scene = NotebookScene()
+            self._scene.profile = self.config.profile.enabled
+            self._scene.workers = self.config.parallel.workers
+            self._scene.batching = self.config.view.batching
+        self._scene.progress = self.show_progress
         return self._scene
 
     @scene.setter
     def scene(self, scene: Scene) -> None:
         scene = scene or NotebookScene()
         self._scene: NotebookScene = NotebookScene.__from_data__(scene.__data__)
+        self._scene.profile = self.config.profile.enabled
+        self._scene.workers = self.config.parallel.workers
+        self._scene.batching = self.config.view.batching
+        self._scene.progress = self.show_progress
+
+    def stats(self) -> StatsTable:
+        """The drawing statistics of the scene objects, slowest first.
+
+        For every scene object, the table lists the duration of the draw,
+        the number of triangles, segments, and points, the size of the buffers, and the number of pythreejs widgets created,
+        which does not include pooled materials and geometries that were reused.
+        Statistics are only recorded if ``config.profile.enabled`` is True.
+
+        Returns
+        -------
+        :class:`compas_notebook.scene.profiling.StatsTable`
+
+        """
+        return self.scene.stats()
+
+    def to_glb(self, filepath: str) -> None:
+        """Export the scene to a binary glTF file, which can be opened without a running kernel.
+
+        Parameters
+        ----------
+        filepath
+            The path of the file.
+
+        Returns
+        -------
+        None
+
+        See Also
+        --------
+        :meth:`compas_notebook.scene.NotebookScene.to_glb`
+
+        """
+        self.scene.to_glb(filepath)
 
     def show(self) -> None:
         """Display the viewer in the notebook."""
         self.init_webgl()
         self.init_ui()
 
-        self.scene.draw()
-        for o in self.scene.objects:
-            for o3 in o.guids:
+        self.scene.camera = self.camera3
+        self.scene.viewheight = self.config.view.height
+        self.objects3 = self.scene.draw()
+
+        if self.config.view.culling:
+            self.camera3.observe(self.on_camera_change, names=["position", "zoom"])
+            self.controls3.observe(self.on_camera_change, names=["target"])
+            self.cull()
+        else:
+            for o3 in self.objects3:
                 self.scene3.add(o3)
 
+        self.show_stats()
         ipydisplay(self.ui)
 
-    # this could be handled better,
-    # by only removing and re-adding objects that have changed.
-    # in any case, visibility should just be updateable...
     def update(self) -> None:
-        """Update an existing viewer instance."""
-        for child in self.scene3.children:
-            self.scene3.remove(child)
+        """Update an existing viewer instance.
 
-        self.scene3.children = []
+        Only scene objects that were added, removed, or modified since the previous draw are redrawn.
+        The pythreejs objects of unchanged scene objects stay in place,
+        and the grid and the axes are shown or hidden according to ``config.view.show_grid`` and ``config.view.show_axes``.
 
-        if self.config.view.show_grid:
-            self.scene3.add(self.grid3)
-        if self.config.view.show_axes:
-            self.scene3.add(self.axes3)
+        Changes of the settings of scene objects and of the content of their data items are detected automatically,
+        except for data items that were marked with :meth:`NotebookScene.touch`,
+        which have to be marked again after every modification.
 
-        self.scene.draw()
+        Examples
+        --------
+        >>> mesh.vertex_attribute(0, "z", 1.0)  # doctest: +SKIP
+        >>> viewer.update()  # doctest: +SKIP
 
-        for o in self.scene.objects:
-            for o3 in o.guids:
-                self.scene3.add(o3)
+        """
+        self.update_helpers()
+        removed, added = self.scene.draw_changed()
+        self.show_stats()
+
+        if self.config.view.culling:
+            self.reindex_objects(removed, added, self.scene.updated)
+            removed = set(map(id, removed))
+            self.objects3 = [o3 for o3 in self.objects3 if id(o3) not in removed] + added
+            children = tuple(child for child in self.scene3.children if id(child) not in removed)
+            if children != self.scene3.children:
+                self.scene3.children = children
+            self.cull()
+            return
+
+        if not removed and not added:
+            return
+
+        removed = set(map(id, removed))
+        children = [child for child in self.scene3.children if id(child) not in removed]
+        self.scene3.children = tuple(children + added)
+
+    # =============================================================================
+    # Culling
+    # =============================================================================
+
+    def cull(self) -> None:
+        """Attach only the objects that intersect the view frustum of the camera to the scene.
+
+        The bounding boxes of the objects are stored in a bounding volume hierarchy,
+        which is built on the first call, and updated by :meth:`update` for the objects that were added, removed, or updated in place.
+        Objects without bounds are always attached.
+
+        """
+        if self._bvh is None:
+            self.index_objects()
+
+        visible = set(self._unbounded)
+        visible.update(id(self._bvhobjects[i]) for i in self._bvh.query(camera_frustum(self.camera3, self.controls3.target)))
+
+        objects = set(map(id, self.objects3))
+        helpers = [child for child in self.scene3.children if id(child) not in objects]
+        children = tuple(helpers + [o3 for o3 in self.objects3 if id(o3) in visible])
+
+        if children != self.scene3.children:
+            self.scene3.children = children
+
+    def index_objects(self) -> None:
+        """Build the bounding volume hierarchy of the bounding boxes of all objects."""
+        boxes = []
+        self._bvhobjects = []
+        self._bvhindex = {}
+        self._unbounded = {}
+        for o3 in self.objects3:
+            box = object_aabb(o3)
+            if box is None:
+                self._unbounded[id(o3)] = o3
+            else:
+                self._bvhindex[id(o3)] = len(boxes)
+                self._bvhobjects.append(o3)
+                boxes.append(box)
+        self._bvh = BVH(boxes)
+
+    def reindex_objects(self, removed: list, added: list, updated: list) -> None:
+        """Update the bounding volume hierarchy for objects that were removed, added, or updated in place.
+
+        Only the bounding boxes of these objects are computed.
+        The hierarchy is rebuilt on the next call to :meth:`cull` once more boxes were inserted or removed than it contains.
+
+        Parameters
+        ----------
+        removed
+            The objects that were removed.
+        added
+            The objects that were added.
+        updated
+            The objects that were updated in place, and may have moved.
+
+        Returns
+        -------
+        None
+
+        """
+        if self._bvh is None:
+            return
+
+        deleted = []
+        for o3 in removed:
+            self._unbounded.pop(id(o3), None)
+            index = self._bvhindex.pop(id(o3), None)
+            if index is not None:
+                self._bvhobjects[index] = None
+                deleted.append(index)
+
+        moved = []
+        boxes = []
+        inserted = []
+        for o3 in updated:
+            box = object_aabb(o3)
+            index = self._bvhindex.get(id(o3))
+            if index is not None and box is not None:
+                moved.append(index)
+                boxes.append(box)
+            elif index is not None:
+                self._bvhindex.pop(id(o3))
+                self._bvhobjects[index] = None
+                deleted.append(index)
+                self._unbounded[id(o3)] = o3
+            elif box is not None:
+                self._unbounded.pop(id(o3), None)
+                inserted.append((o3, box))
+        for o3 in added:
+            box = object_aabb(o3)
+            if box is None:
+                self._unbounded[id(o3)] = o3
+            else:
+                inserted.append((o3, box))
+
+        if deleted:
+            self._bvh.remove(deleted)
+        if moved:
+            self._bvh.refit(moved, boxes)
+        if inserted:
+            indices = self._bvh.insert([box for _, box in inserted])
+            for (o3, _), index in zip(inserted, indices):
+                self._bvhindex[id(o3)] = int(index)
+                self._bvhobjects.append(o3)
+
+        if self._bvh.changes > len(self._bvh):
+            self._bvh = None
+
+    def on_camera_change(self, change: dict) -> None:
+        """Schedule culling after the camera has stopped changing for ``config.view.culling_delay`` seconds."""
+        if self._culling_handle:
+            self._culling_handle.cancel()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.cull()
+        else:
+            self._culling_handle = loop.call_later(self.config.view.culling_delay, self.cull)
+
+    # =============================================================================
+    # Playback
+    # =============================================================================
+
+    def animate(self, sceneobject: SceneObject, frames: list) -> None:
+        """Add an animation of a scene object, for playback with :meth:`play` or with the playback controls of the toolbar.
+
+        The frames are shown by updating the buffers and matrices of the drawn pythreejs objects,
+        without redrawing the scene object and without modifying its data.
+
+        Parameters
+        ----------
+        sceneobject
+            The animated scene object.
+        frames
+            The (N, 3) vertex positions of every frame, for meshes and graphs,
+            in the order of the vertices or nodes at the time of the draw,
+            or the :class:`compas.geometry.Transformation` of every frame, for any scene object,
+            which is applied on top of the drawn geometry.
+
+        Returns
+        -------
+        None
+
+        """
+        self.playback.add(sceneobject, frames)
+        self.update_playbackcontrols()
+
+    def play(self) -> None:
+        """Start the playback of the animations at the current frame."""
+        self.playback.play()
+
+    def pause(self) -> None:
+        """Pause the playback of the animations at the current frame."""
+        self.playback.pause()
+
+    def seek(self, index: int) -> None:
+        """Show a frame of the animations.
+
+        Parameters
+        ----------
+        index
+            The index of the frame.
+
+        """
+        self.playback.show(index)
+
+    def on_frame(self, index: int) -> None:
+        """Move the playback slider to the frame that is shown."""
+        if self.playbackslider and self.playbackslider.value != index:
+            self.playbackslider.value = index
+
+    def update_playbackcontrols(self) -> None:
+        """Show the playback controls if there are animations, and set the range of the playback slider."""
+        if not self.playbackcontrols:
+            return
+        length = len(self.playback)
+        self.playbackslider.max = max(length - 1, 0)
+        self.playbackcontrols.layout.display = "flex" if length else "none"
 
     # =============================================================================
     # WebGL
@@ -111,19 +395,16 @@ class Viewer:
 
         self.scene3 = three.Scene(background=self.config.view.background.hex)
 
-        if self.config.view.show_grid:
-            self.grid3 = three.GridHelper(
-                size=20,
-                divisions=20,
-                colorCenterLine=Color.grey().hex,
-                colorGrid=Color.grey().lightened(50).hex,
-            )
-            self.grid3.rotateX(3.14159 / 2)
-            self.scene3.add(self.grid3)
-
-        if self.config.view.show_axes:
-            self.axes3 = three.AxesHelper(size=0.5)
-            self.scene3.add(self.axes3)
+        # the helpers are always created, such that they can be shown later by changing the config
+        self.grid3 = three.GridHelper(
+            size=20,
+            divisions=20,
+            colorCenterLine=Color.grey().hex,
+            colorGrid=Color.grey().lightened(50).hex,
+        )
+        self.grid3.rotateX(3.14159 / 2)
+        self.axes3 = three.AxesHelper(size=0.5)
+        self.update_helpers()
 
         # camera and controls
 
@@ -175,6 +456,18 @@ class Viewer:
             antialias=True,
         )
 
+    def update_helpers(self) -> None:
+        """Show or hide the grid and the axes according to ``config.view.show_grid`` and ``config.view.show_axes``."""
+        helpers = []
+        if self.config.view.show_grid:
+            helpers.append(self.grid3)
+        if self.config.view.show_axes:
+            helpers.append(self.axes3)
+
+        children = tuple(helpers + [child for child in self.scene3.children if child is not self.grid3 and child is not self.axes3])
+        if children != self.scene3.children:
+            self.scene3.children = children
+
     # =============================================================================
     # UI
     # =============================================================================
@@ -338,6 +631,37 @@ class Viewer:
         zoom_out_button.on_click(lambda x: self.controller.zoom_out())
         buttons.append(zoom_out_button)
 
+        play_button = widgets.Button(
+            icon="play",
+            tooltip="Play",
+            layout=widgets.Layout(width="48px", height="32px"),
+        )
+        play_button.on_click(lambda x: self.controller.play())
+
+        pause_button = widgets.Button(
+            icon="pause",
+            tooltip="Pause",
+            layout=widgets.Layout(width="48px", height="32px"),
+        )
+        pause_button.on_click(lambda x: self.controller.pause())
+
+        self.playbackslider = widgets.IntSlider(
+            value=self.playback.index,
+            min=0,
+            max=0,
+            description="Frame",
+            continuous_update=True,
+            layout=widgets.Layout(width="400px", height="32px"),
+        )
+        self.playbackslider.observe(self.controller.seek, names="value")
+
+        # the playback controls are hidden until an animation is added
+        self.playbackcontrols = widgets.HBox(children=[play_button, pause_button, self.playbackslider])
+        self.playbackcontrols.layout.align_items = "center"
+        self.playbackcontrols.layout.margin = "0px 0px 0px 16px"
+        self.update_playbackcontrols()
+        buttons.append(self.playbackcontrols)
+
         toolbar = widgets.HBox()
         toolbar.layout.display = "flex"
         toolbar.layout.flex_flow = "row"
@@ -354,6 +678,18 @@ class Viewer:
     # Actions
     # =============================================================================
 
+    def show_stats(self) -> None:
+        """Show a summary of the drawing statistics in the status bar, if profiling is enabled."""
+        if self.config.profile.enabled and self.config.profile.show_statusbar:
+            self.set_statustext(self.stats().summary())
+
+    def show_progress(self, sceneobject: SceneObject, done: int, total: int) -> None:
+        """Show the progress of the progressive upload of a scene object in the status bar."""
+        if done < total:
+            self.set_statustext(f"Uploading {sceneobject.name}: {done} of {total} chunks")
+        else:
+            self.set_statustext(f"Uploaded {sceneobject.name} in {total} chunks")
+
     def set_statustext(self, text: str) -> None:
         """Set the text of the status bar."""
         if self.statustext:
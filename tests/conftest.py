@@ -0,0 +1,187 @@
+import json
+import os
+import time
+import tracemalloc
+
+import numpy
+import pytest
+
+BASELINE = os.path.join(os.path.dirname(__file__), "benchmarks.json")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf", "conversion benchmarks")
+    group.addoption("--perf", action="store_true", default=False, help="Run the conversion benchmarks and report the measurements.")
+    group.addoption("--perf-save", action="store_true", default=False, help="Write the benchmark results to the baseline.")
+    group.addoption(
+        "--perf-check",
+        action="store_true",
+        default=False,
+        help="Fail benchmarks that regressed with respect to the baseline, instead of only reporting them.",
+    )
+    group.addoption("--perf-baseline", default=BASELINE, help="The path of the benchmark baseline.")
+    group.addoption(
+        "--perf-tolerance",
+        type=float,
+        default=0.5,
+        help="The relative increase of time, peak memory, or output size over the baseline that counts as a regression.",
+    )
+    group.addoption(
+        "--perf-min-time",
+        type=float,
+        default=0.01,
+        help="The minimum absolute increase of wall time in seconds that counts as a regression.",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--perf"):
+        return
+    skip = pytest.mark.skip(reason="Benchmarks only run with --perf.")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_configure(config):
+    config._perf = {}
+    config._perf_regressions = {}
+    config._perf_calibration = None
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if not config.getoption("--perf-save") or not config._perf:
+        return
+    path = config.getoption("--perf-baseline")
+    baseline = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            baseline = json.load(f)
+    baseline.update(config._perf)
+    with open(path, "w") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=4)
+        f.write("\n")
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not config._perf:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'name':<60} {'time [ms]':>12} {'memory [kB]':>12} {'nbytes [kB]':>12}  regressions")
+    for name, result in config._perf.items():
+        regressions = ", ".join(config._perf_regressions.get(name, []))
+        terminalreporter.write_line(f"{name:<60} {result['time'] * 1e3:>12.3f} {result['memory'] / 1024:>12.1f} {result['nbytes'] / 1024:>12.1f}  {regressions}")
+
+
+def calibration_time(rounds: int = 5) -> float:
+    """Measure the best wall time of a fixed mix of NumPy and pure Python work on the current machine.
+
+    Benchmark times are compared with the baseline relative to this time,
+    such that a baseline recorded on a faster or slower machine can still be used.
+
+    """
+    rng = numpy.random.default_rng(0)
+    array = rng.random(200_000)
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        numpy.sort(array)
+        total = 0
+        for i in range(200_000):
+            total += i % 7
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def output_nbytes(output) -> int:
+    """Compute the total size of the buffer arrays in the output of a conversion."""
+    if isinstance(output, numpy.ndarray):
+        return output.nbytes
+    if isinstance(output, (list, tuple)):
+        return sum(output_nbytes(item) for item in output)
+    nbytes = 0
+    geometry = getattr(output, "geometry", None)
+    if geometry is not None:
+        nbytes += output_nbytes(geometry)
+    attributes = getattr(output, "attributes", None)
+    if attributes:
+        nbytes += sum(attribute.array.nbytes for attribute in attributes.values())
+    return nbytes
+
+
+def measure(func, args, kwargs, mintime=0.5, maxrounds=100):
+    """Measure the best wall time over a number of rounds, and the peak memory of one extra round."""
+    times = []
+    while len(times) < maxrounds and sum(times) < mintime:
+        start = time.perf_counter()
+        output = func(*args, **kwargs)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return output, {"time": min(times), "memory": peak, "nbytes": output_nbytes(output)}
+
+
+def regressions(result: dict, reference: dict, tolerance: float, mintime: float) -> list[str]:
+    """Compare a measurement with its baseline.
+
+    The time of the baseline is first scaled by the ratio of the calibration times of the current machine and the baseline machine.
+    Peak memory and output size do not depend on the machine, and are compared directly.
+
+    """
+    found = []
+    for key in ("time", "memory", "nbytes"):
+        value = result[key]
+        expected = reference.get(key)
+        if expected is None:
+            continue
+        if key == "time":
+            if reference.get("calibration"):
+                expected *= result["calibration"] / reference["calibration"]
+            if value - expected < mintime:
+                continue
+        if value > expected * (1 + tolerance):
+            found.append(f"{key}: {value:.6g} > {expected:.6g}")
+    return found
+
+
+@pytest.fixture
+def perf(request):
+    """Run a conversion and record its wall time, peak memory and output size.
+
+    The measurements are reported at the end of the session, together with the regressions with respect to the baseline.
+    Regressions only fail the benchmark with ``--perf-check``.
+
+    """
+    config = request.config
+    path = config.getoption("--perf-baseline")
+    tolerance = config.getoption("--perf-tolerance")
+    mintime = config.getoption("--perf-min-time")
+    baseline = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            baseline = json.load(f)
+    if config._perf_calibration is None:
+        config._perf_calibration = calibration_time()
+
+    def run(func, *args, **kwargs):
+        name = request.node.name
+        output, result = measure(func, args, kwargs)
+        result["calibration"] = config._perf_calibration
+        config._perf[name] = result
+
+        if config.getoption("--perf-save") or name not in baseline:
+            return output
+
+        found = regressions(result, baseline[name], tolerance, mintime)
+        if found:
+            config._perf_regressions[name] = found
+            if config.getoption("--perf-check"):
+                pytest.fail(f"{name} regressed beyond a tolerance of {tolerance:.0%}: " + ", ".join(found))
+        return output
+
+    return run
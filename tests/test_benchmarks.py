@@ -0,0 +1,305 @@
+"""Benchmarks of the conversions to pythreejs.
+
+The benchmarks are skipped unless pytest is run with ``--perf``.
+Every benchmark records the best wall time, the peak memory, and the size of the buffers produced,
+and reports them at the end of the session, together with the values that exceed the baseline in ``tests/benchmarks.json``
+by more than ``--perf-tolerance``.
+Times are compared relative to a calibration workload, such that the baseline can be used on other machines.
+
+Run the benchmarks::
+
+    pytest tests/test_benchmarks.py --perf
+
+Fail on regressions::
+
+    pytest tests/test_benchmarks.py --perf --perf-check
+
+Update the baseline after an intentional change::
+
+    pytest tests/test_benchmarks.py --perf --perf-save
+
+"""
+
+from functools import lru_cache
+
+import numpy
+import pytest
+from compas.colors import Color
+from compas.datastructures import Mesh
+from compas.geometry import Box
+from compas.geometry import Circle
+from compas.geometry import Cone
+from compas.geometry import Cylinder
+from compas.geometry import Ellipse
+from compas.geometry import Frame
+from compas.geometry import Line
+from compas.geometry import PlanarSurface
+from compas.geometry import Plane
+from compas.geometry import Point
+from compas.geometry import Pointcloud
+from compas.geometry import Polyline
+from compas.geometry import Sphere
+from compas.geometry import Torus
+
+from compas_notebook.conversions import box_to_threejs
+from compas_notebook.conversions import cone_to_threejs
+from compas_notebook.conversions import cylinder_to_threejs
+from compas_notebook.conversions import dots_to_threejs
+from compas_notebook.conversions import faces_to_edges
+from compas_notebook.conversions import line_to_threejs
+from compas_notebook.conversions import nodes_and_edges_to_threejs
+from compas_notebook.conversions import nodes_to_threejs
+from compas_notebook.conversions import point_to_threejs
+from compas_notebook.conversions import pointcloud_to_threejs
+from compas_notebook.conversions import polyline_to_threejs
+from compas_notebook.conversions import quantize_positions
+from compas_notebook.conversions import shapes_to_edgesbuffer
+from compas_notebook.conversions import shapes_to_facesbuffer
+from compas_notebook.conversions import shapes_to_instancebuffers
+from compas_notebook.conversions import sphere_to_threejs
+from compas_notebook.conversions import torus_to_threejs
+from compas_notebook.conversions import triangulate_faces
+from compas_notebook.conversions import vertices_and_edges_to_threejs
+from compas_notebook.conversions import vertices_and_faces_to_threejs
+from compas_notebook.conversions import vertices_to_threejs
+from compas_notebook.conversions import voxel_pyramid
+from compas_notebook.conversions.geometry import circle_to_threejs
+from compas_notebook.conversions.geometry import ellipse_to_threejs
+from compas_notebook.conversions.geometry import frame_to_threejs
+from compas_notebook.conversions.geometry import plane_to_threejs
+from compas_notebook.conversions.geometry import surface_to_threejs
+from compas_notebook.geometry import Dot
+
+pytestmark = pytest.mark.perf
+
+FACES = [1_000, 10_000, 100_000, 1_000_000]
+POINTS = [10_000, 100_000, 1_000_000, 10_000_000]
+POINTCLOUDS = [10_000, 100_000, 1_000_000]
+SHAPES = [100, 1_000, 10_000]
+
+
+# =============================================================================
+# Inputs
+# =============================================================================
+
+
+@lru_cache(maxsize=1)
+def quadgrid(faces: int) -> tuple[list[list[float]], list[list[int]], list[tuple[int, int]]]:
+    """A square grid of quads with approximately the given number of faces, as vertex, face, and edge lists."""
+    n = int(round(faces**0.5))
+    x, y = numpy.meshgrid(numpy.arange(n + 1, dtype=numpy.float64), numpy.arange(n + 1, dtype=numpy.float64))
+    vertices = numpy.column_stack([x.ravel(), y.ravel(), numpy.sin(x.ravel() / 10)])
+
+    index = numpy.arange((n + 1) ** 2).reshape(n + 1, n + 1)
+    a = index[:-1, :-1].ravel()
+    b = index[:-1, 1:].ravel()
+    c = index[1:, 1:].ravel()
+    d = index[1:, :-1].ravel()
+    faces = numpy.column_stack([a, b, c, d])
+
+    horizontal = numpy.column_stack([index[:, :-1].ravel(), index[:, 1:].ravel()])
+    vertical = numpy.column_stack([index[:-1, :].ravel(), index[1:, :].ravel()])
+    edges = numpy.vstack([horizontal, vertical])
+
+    return vertices.tolist(), faces.tolist(), [tuple(edge) for edge in edges.tolist()]
+
+
+@lru_cache(maxsize=1)
+def points(count: int) -> numpy.ndarray:
+    """Points sampled on a wavy surface, like the points of a terrain scan."""
+    rng = numpy.random.default_rng(0)
+    xy = rng.random((count, 2), dtype=numpy.float32) * 100
+    return numpy.column_stack([xy, numpy.sin(xy[:, 0] / 10) * 5]).astype(numpy.float32)
+
+
+@lru_cache(maxsize=1)
+def pointcloud(count: int) -> Pointcloud:
+    return Pointcloud(points(count).tolist())
+
+
+@lru_cache(maxsize=1)
+def shapes(count: int) -> list:
+    """A mix of boxes, spheres, cylinders, cones, and small meshes."""
+    rng = numpy.random.default_rng(0)
+    result = []
+    for i, point in enumerate((rng.random((count, 3)) * 100).tolist()):
+        frame = Frame(point)
+        kind = i % 5
+        if kind == 0:
+            result.append(Box(1, 2, 3, frame=frame))
+        elif kind == 1:
+            result.append(Sphere(1, frame=frame))
+        elif kind == 2:
+            result.append(Cylinder(1, 2, frame=frame))
+        elif kind == 3:
+            result.append(Cone(1, 2, frame=frame))
+        else:
+            result.append(Mesh.from_shape(Box(1, frame=frame)))
+    return result
+
+
+# =============================================================================
+# Meshes
+# =============================================================================
+
+
+@pytest.mark.parametrize("faces", FACES)
+def test_triangulate_faces(perf, faces):
+    vertices, faces, _ = quadgrid(faces)
+    perf(triangulate_faces, vertices, faces)
+
+
+@pytest.mark.parametrize("faces", FACES)
+def test_faces_to_edges(perf, faces):
+    _, faces, _ = quadgrid(faces)
+    perf(faces_to_edges, faces)
+
+
+@pytest.mark.parametrize("faces", FACES)
+def test_vertices_and_faces_to_threejs(perf, faces):
+    vertices, faces, _ = quadgrid(faces)
+    perf(vertices_and_faces_to_threejs, vertices, faces)
+
+
+@pytest.mark.parametrize("faces", FACES)
+def test_quantize_positions(perf, faces):
+    vertices, _, _ = quadgrid(faces)
+    perf(quantize_positions, vertices)
+
+
+@pytest.mark.parametrize("faces", FACES)
+def test_vertices_and_edges_to_threejs(perf, faces):
+    vertices, _, edges = quadgrid(faces)
+    perf(vertices_and_edges_to_threejs, vertices, edges)
+
+
+@pytest.mark.parametrize("count", POINTS)
+def test_vertices_to_threejs(perf, count):
+    perf(vertices_to_threejs, points(count))
+
+
+# =============================================================================
+# Graphs
+# =============================================================================
+
+
+@pytest.mark.parametrize("faces", FACES)
+def test_nodes_and_edges_to_threejs(perf, faces):
+    vertices, _, edges = quadgrid(faces)
+    perf(nodes_and_edges_to_threejs, vertices, edges)
+
+
+@pytest.mark.parametrize("faces", FACES)
+def test_nodes_to_threejs(perf, faces):
+    vertices, _, _ = quadgrid(faces)
+    perf(nodes_to_threejs, vertices)
+
+
+# =============================================================================
+# Pointclouds
+# =============================================================================
+
+
+@pytest.mark.parametrize("count", POINTCLOUDS)
+def test_pointcloud_to_threejs(perf, count):
+    perf(pointcloud_to_threejs, pointcloud(count))
+
+
+@pytest.mark.parametrize("count", POINTS)
+def test_voxel_pyramid(perf, count):
+    perf(voxel_pyramid, points(count))
+
+
+# =============================================================================
+# Buffers
+# =============================================================================
+
+
+@pytest.mark.parametrize("count", SHAPES)
+def test_shapes_to_edgesbuffer(perf, count):
+    perf(shapes_to_edgesbuffer, shapes(count), Color.black())
+
+
+@pytest.mark.parametrize("count", SHAPES)
+def test_shapes_to_facesbuffer(perf, count):
+    perf(shapes_to_facesbuffer, shapes(count), Color.grey())
+
+
+@pytest.mark.parametrize("count", SHAPES)
+def test_shapes_to_instancebuffers(perf, count):
+    primitives = [shape for shape in shapes(count) if not isinstance(shape, Mesh)]
+    perf(shapes_to_instancebuffers, primitives, Color.grey(), Color.black())
+
+
+@pytest.mark.parametrize("count", SHAPES)
+def test_dots_to_threejs(perf, count):
+    dots = [Dot(point, f"node {i}") for i, point in enumerate(points(count).tolist())]
+    perf(dots_to_threejs, dots)
+
+
+# =============================================================================
+# Geometry
+# =============================================================================
+
+
+@pytest.mark.parametrize("count", [100, 10_000, 1_000_000])
+def test_polyline_to_threejs(perf, count):
+    polyline = Polyline(points(count).tolist())
+    perf(polyline_to_threejs, polyline)
+
+
+@pytest.mark.parametrize("resolution", [10, 50, 200])
+def test_surface_to_threejs(perf, resolution):
+    perf(surface_to_threejs, PlanarSurface(10, 10), resolution, resolution)
+
+
+def test_point_to_threejs(perf):
+    perf(point_to_threejs, Point(1, 2, 3))
+
+
+def test_line_to_threejs(perf):
+    perf(line_to_threejs, Line([0, 0, 0], [1, 2, 3]))
+
+
+def test_frame_to_threejs(perf):
+    perf(frame_to_threejs, Frame.worldXY())
+
+
+def test_plane_to_threejs(perf):
+    perf(plane_to_threejs, Plane.worldXY())
+
+
+def test_circle_to_threejs(perf):
+    perf(circle_to_threejs, Circle(1))
+
+
+def test_ellipse_to_threejs(perf):
+    perf(ellipse_to_threejs, Ellipse(2, 1))
+
+
+def test_circle_to_threejs_adaptive(perf):
+    perf(circle_to_threejs, Circle(1), tolerance=1e-3)
+
+
+def test_ellipse_to_threejs_adaptive(perf):
+    perf(ellipse_to_threejs, Ellipse(2, 1), tolerance=1e-3)
+
+
+def test_box_to_threejs(perf):
+    perf(box_to_threejs, Box(1, 2, 3))
+
+
+def test_cone_to_threejs(perf):
+    perf(cone_to_threejs, Cone(1, 2))
+
+
+def test_cylinder_to_threejs(perf):
+    perf(cylinder_to_threejs, Cylinder(1, 2))
+
+
+def test_sphere_to_threejs(perf):
+    perf(sphere_to_threejs, Sphere(1))
+
+
+def test_torus_to_threejs(perf):
+    perf(torus_to_threejs, Torus(1, 0.2))
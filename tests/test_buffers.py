@@ -0,0 +1,95 @@
+import numpy
+from compas.colors import Color
+from compas.datastructures import Mesh
+from compas.geometry import Box
+from compas.geometry import Polygon
+from compas.geometry import earclip_polygon
+
+from compas_notebook.conversions import shapes_to_edgesbuffer
+from compas_notebook.conversions import shapes_to_facesbuffer
+
+
+def baseline_faces(vertices, faces):
+    """The positions of the original per-face loop of ``shape_to_facesbuffer``, with the ear clipped corners mapped to the face vertices."""
+    positions = []
+    for face in faces:
+        if len(face) == 3:
+            triangles = [[0, 1, 2]]
+        elif len(face) == 4:
+            triangles = [[0, 1, 2], [0, 2, 3]]
+        else:
+            triangles = earclip_polygon(Polygon([vertices[v] for v in face]))
+        for triangle in triangles:
+            positions += [vertices[face[corner]] for corner in triangle]
+    return positions
+
+
+def baseline_edges(vertices, edges):
+    """The positions of the original per-edge loop of ``shape_to_edgesbuffer``."""
+    positions = []
+    for u, v in edges:
+        positions += [vertices[u], vertices[v]]
+    return positions
+
+
+def shapes():
+    mesh = Mesh.from_polygons(
+        [
+            [[0, 0, 0], [1, 0, 0], [1, 1, 0]],
+            [[1, 0, 0], [2, 0, 0], [2, 1, 0], [1, 1, 0]],
+            [[2, 0, 0], [3, 0, 0], [3, 1, 0], [2.5, 0.5, 0], [2, 1, 0]],
+        ]
+    )
+    # the first vertex is removed, such that the vertex keys are not the vertex indices
+    mesh.delete_face(0)
+    mesh.remove_unused_vertices()
+    return [mesh, Box(1), Box(2, 1, 3)]
+
+
+def shape_arrays(shape):
+    if isinstance(shape, Mesh):
+        vertex_index = shape.vertex_index()
+        vertices = shape.vertices_attributes("xyz")
+        faces = [[vertex_index[vertex] for vertex in shape.face_vertices(face)] for face in shape.faces()]
+        edges = [(vertex_index[u], vertex_index[v]) for u, v in shape.edges()]
+        return vertices, faces, edges
+    vertices, faces = shape.to_vertices_and_faces()
+    edges = [(u, v) for u, v in shape.edges]
+    return vertices, faces, edges
+
+
+def test_shapes_to_facesbuffer_matches_baseline():
+    expected = []
+    for shape in shapes():
+        vertices, faces, _ = shape_arrays(shape)
+        expected += baseline_faces(vertices, faces)
+
+    obj = shapes_to_facesbuffer(shapes(), Color.red())
+
+    attributes = obj.geometry.attributes
+    index = attributes["index"].array.reshape(-1)
+    assert "color" not in attributes
+    assert numpy.allclose(attributes["position"].array[index], expected)
+    assert obj.material.color == Color.red().hex
+
+
+def segments(positions):
+    """The line segments of a list of positions, as a sorted list of undirected segments."""
+    points = numpy.round(numpy.asarray(positions, dtype=numpy.float64).reshape(-1, 2, 3), 6).tolist()
+    return sorted(tuple(sorted(map(tuple, segment))) for segment in points)
+
+
+def test_shapes_to_edgesbuffer_matches_baseline():
+    expected = []
+    for shape in shapes():
+        vertices, _, edges = shape_arrays(shape)
+        expected += baseline_edges(vertices, edges)
+
+    obj = shapes_to_edgesbuffer(shapes(), Color.blue())
+
+    attributes = obj.geometry.attributes
+    index = attributes["index"].array.reshape(-1)
+    # the edges of meshes are extracted from their faces, in a different order than the halfedges
+    assert len(index) == len(expected)
+    assert segments(attributes["position"].array[index]) == segments(expected)
+    assert obj.material.color == Color.blue().hex
@@ -0,0 +1,73 @@
+import numpy
+from compas.colors import Color
+from compas.colors import ColorDict
+
+from compas_notebook.conversions import colors_to_array
+from compas_notebook.conversions import uniform_color
+
+
+def baseline_colors(color, ids):
+    """The colors of the original per-element lookups."""
+    return numpy.array([color[int(i)].rgb for i in ids], dtype=numpy.float32).reshape(-1, 3)
+
+
+def colordict():
+    colors = ColorDict(Color.grey())
+    colors[7] = Color.red()
+    colors[3] = Color.blue()
+    colors[40] = Color.green()
+    return colors
+
+
+def test_colors_to_array_matches_baseline():
+    colors = colordict()
+    ids = numpy.array([40, 12, 3, 7, 25, 0])
+
+    assert numpy.array_equal(colors_to_array(colors, ids), baseline_colors(colors, ids))
+
+
+def test_colors_to_array_repeated_ids():
+    colors = colordict()
+    ids = numpy.array([7, 3, 7, 12, 3, 7])
+
+    assert numpy.array_equal(colors_to_array(colors, ids), baseline_colors(colors, ids))
+
+
+def test_colors_to_array_single_color():
+    colors = colors_to_array(Color.red(), numpy.arange(4))
+
+    assert colors.dtype == numpy.float32
+    assert colors.tolist() == [[1.0, 0.0, 0.0]] * 4
+
+
+def test_colors_to_array_mapping_without_default():
+    colors = colors_to_array({1: Color.white(), "name": Color.red()}, numpy.array([0, 1]))
+
+    assert colors.tolist() == [[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]]
+
+
+def test_colors_to_array_key_function():
+    colors = ColorDict(Color.black())
+    colors[5, 2] = Color.red()
+    colors[3, 4] = Color.blue()
+
+    # the keys of edges are stored as the sorted vertices joined by a comma
+    def key(edge):
+        u, v = edge.split(",")
+        return int(u) * 10 + int(v)
+
+    ids = numpy.array([2 * 10 + 5, 1 * 10 + 2, 3 * 10 + 4])
+    assert colors_to_array(colors, ids, key).tolist() == [[1.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 0.0, 1.0]]
+
+
+def test_colors_to_array_empty():
+    assert colors_to_array(colordict(), numpy.array([], dtype=int)).shape == (0, 3)
+    assert colors_to_array(ColorDict(Color.white()), numpy.arange(2)).tolist() == [[1.0, 1.0, 1.0]] * 2
+
+
+def test_uniform_color():
+    colors = colors_to_array(colordict(), numpy.array([12, 25]))
+
+    assert uniform_color(colors) == Color.grey()
+    assert uniform_color(colors_to_array(colordict(), numpy.array([12, 7]))) is None
+    assert uniform_color(numpy.zeros((0, 3))) is None
@@ -0,0 +1,89 @@
+import numpy
+from compas.colors import Color
+from compas.geometry import Box
+from compas.geometry import Frame
+
+from compas_notebook.config import Config
+from compas_notebook.scene.culling import BVH
+from compas_notebook.viewer import Viewer
+
+
+def random_boxes(rng, count):
+    corners = rng.uniform(-10, 10, (count, 3))
+    sizes = rng.uniform(0.1, 2, (count, 3))
+    return numpy.stack([corners, corners + sizes], axis=1)
+
+
+def brute_force(boxes, active, planes):
+    normals = planes[:, :3]
+    corners = numpy.where(normals >= 0, boxes[:, 1:2], boxes[:, 0:1])
+    outside = ((corners * normals).sum(axis=2) + planes[:, 3] < 0).any(axis=1)
+    return numpy.flatnonzero(~outside & active)
+
+
+def test_bvh_query_after_refit_remove_and_insert():
+    rng = numpy.random.default_rng(1)
+    boxes = random_boxes(rng, 200)
+    active = numpy.ones(200, dtype=bool)
+    # a box from -2 to 2 along all axes
+    planes = numpy.array([[1, 0, 0, 2], [-1, 0, 0, 2], [0, 1, 0, 2], [0, -1, 0, 2], [0, 0, 1, 2], [0, 0, -1, 2]], dtype=float)
+
+    bvh = BVH(boxes)
+    assert numpy.array_equal(bvh.query(planes), brute_force(boxes, active, planes))
+
+    moved = rng.choice(200, 50, replace=False)
+    boxes[moved] = random_boxes(rng, 50)
+    bvh.refit(moved, boxes[moved])
+    assert numpy.array_equal(bvh.query(planes), brute_force(boxes, active, planes))
+
+    removed = rng.choice(200, 30, replace=False)
+    active[removed] = False
+    bvh.remove(removed)
+    assert numpy.array_equal(bvh.query(planes), brute_force(boxes, active, planes))
+
+    inserted = random_boxes(rng, 40)
+    indices = bvh.insert(inserted)
+    boxes = numpy.concatenate([boxes, inserted])
+    active = numpy.concatenate([active, numpy.ones(40, dtype=bool)])
+    assert indices.tolist() == list(range(200, 240))
+    assert numpy.array_equal(bvh.query(planes), brute_force(boxes, active, planes))
+    assert len(bvh) == 210
+    assert bvh.changes == 70
+
+
+def test_bvh_insert_into_empty():
+    bvh = BVH(numpy.zeros((0, 2, 3)))
+    bvh.insert([[[0, 0, 0], [1, 1, 1]]])
+    planes = numpy.array([[1, 0, 0, 0.5]], dtype=float)
+
+    assert bvh.query(planes).tolist() == [0]
+
+
+def test_viewer_update_with_culling():
+    config = Config()
+    config.view.culling = True
+    viewer = Viewer(config=config)
+    boxes = [viewer.scene.add(Box(1, frame=Frame([i * 3, 0, 0], [1, 0, 0], [0, 1, 0]))) for i in range(3)]
+    viewer.init_webgl()
+    viewer.objects3 = viewer.scene.draw()
+    viewer.cull()
+    bvh = viewer._bvh
+    assert len(viewer.scene3.children) == 2 + 6
+
+    # recolored objects are updated in place, and the hierarchy is refit instead of rebuilt
+    boxes[0].color = Color.red()
+    viewer.update()
+    assert viewer._bvh is bvh
+    assert len(viewer.scene3.children) == 2 + 6
+
+    # removed objects are detached from the scene
+    viewer.scene.remove(boxes[1])
+    viewer.update()
+    assert len(viewer.scene3.children) == 2 + 4
+    assert not set(map(id, boxes[1].guids)) & set(map(id, viewer.scene3.children))
+
+    # objects moved out of view are culled
+    boxes[2].geometry.frame = Frame([1000, 0, 0], [1, 0, 0], [0, 1, 0])
+    viewer.scene.touch(boxes[2].geometry)
+    viewer.update()
+    assert len(viewer.scene3.children) == 2 + 2
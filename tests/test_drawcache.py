@@ -0,0 +1,98 @@
+import numpy
+from compas.colors import Color
+from compas.datastructures import Mesh
+
+from compas_notebook.scene import DRAWCACHE
+from compas_notebook.scene import DrawCache
+from compas_notebook.scene import NotebookScene
+
+
+def test_drawcache_evicts_least_recently_used():
+    cache = DrawCache(maxsize=2)
+    buffers = {"vertices": (numpy.zeros((4, 3), dtype=numpy.float32),)}
+    cache.put("a", buffers)
+    cache.put("b", buffers)
+    assert cache.get("a") is buffers
+    cache.put("c", buffers)
+
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.nbytes == 2 * 48
+    assert cache.stats["hits"] == 1
+
+
+def test_drawcache_respects_maxbytes():
+    cache = DrawCache(maxbytes=100)
+    cache.put("a", {"vertices": (numpy.zeros((10, 3), dtype=numpy.float32),)})
+
+    assert "a" not in cache
+    assert cache.nbytes == 0
+
+
+def test_cache_hits_create_separate_objects():
+    DRAWCACHE.clear()
+    mesh = Mesh.from_meshgrid(dx=1, nx=3)
+    scene = NotebookScene()
+    first = scene.add(mesh)
+    second = scene.add(mesh)
+    other = NotebookScene()
+    third = other.add(mesh)
+
+    guids = scene.draw() + other.draw()
+
+    assert DRAWCACHE.hits == 2
+    assert len(set(map(id, guids))) == len(guids)
+    assert not set(map(id, first.guids)) & set(map(id, second.guids))
+    assert not set(map(id, first.guids)) & set(map(id, third.guids))
+
+
+def test_cache_hits_can_be_updated_in_place():
+    DRAWCACHE.clear()
+    mesh = Mesh.from_meshgrid(dx=1, nx=3)
+    scene = NotebookScene()
+    drawn = scene.add(mesh)
+    scene.draw()
+    positions = drawn.guids[-1].geometry.attributes["position"].array.copy()
+
+    other = NotebookScene()
+    cached = other.add(mesh)
+    other.draw()
+    assert DRAWCACHE.hits == 1
+
+    cached.facecolor = Color.red()
+    mesh.vertex_attribute(0, "z", 1.0)
+    other.touch(mesh)
+    removed, added = other.draw_changed()
+
+    assert not removed and not added
+    assert cached.guids[-1].material.color == Color.red().hex
+    assert cached.guids[-1].geometry.attributes["position"].array[:, 2].max() == 1.0
+    # the objects of the first draw, and the cached arrays they were created from, are not modified
+    assert numpy.array_equal(drawn.guids[-1].geometry.attributes["position"].array, positions)
+
+
+def test_cache_is_keyed_on_content():
+    DRAWCACHE.clear()
+    mesh = Mesh.from_meshgrid(dx=1, nx=3)
+    scene = NotebookScene()
+    scene.add(mesh)
+    scene.draw()
+
+    # a rebuilt mesh with the same content is taken from the cache
+    other = NotebookScene()
+    other.add(Mesh.from_meshgrid(dx=1, nx=3))
+    other.draw()
+    assert DRAWCACHE.hits == 1
+
+    # a mesh modified in place is not
+    mesh.vertex_attribute(0, "z", 1.0)
+    scene.touch(mesh)
+    new = NotebookScene()
+    drawn = new.add(mesh)
+    new.draw()
+    assert DRAWCACHE.hits == 1
+    assert drawn.guids[-1].geometry.attributes["position"].array[:, 2].max() == 1.0
+
+    # the key does not depend on the version counters of the scene
+    scene.draw()
+    assert DRAWCACHE.hits == 2
+    assert scene.objects[0].guids[-1].geometry.attributes["position"].array[:, 2].max() == 1.0
@@ -0,0 +1,77 @@
+import json
+import struct
+
+import numpy
+from compas.colors import Color
+from compas.geometry import Box
+from compas.geometry import Frame
+from compas.geometry import Sphere
+
+from compas_notebook.conversions import shapes_to_instancebuffers
+from compas_notebook.scene.gltf import GLBWriter
+from compas_notebook.scene.gltf import decompose_matrices
+from compas_notebook.scene.gltf import srgb_to_linear
+
+
+def quaternion_matrices(quaternions):
+    x, y, z, w = quaternions.T
+    return numpy.stack(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+        ]
+    ).transpose(2, 0, 1)
+
+
+def gltf_json(writer):
+    data = writer.to_bytes()
+    length, _ = struct.unpack_from("<II", data, 12)
+    return json.loads(data[20 : 20 + length])
+
+
+def test_decompose_matrices_round_trip():
+    rng = numpy.random.default_rng(0)
+    rotations, _ = numpy.linalg.qr(rng.normal(size=(100, 3, 3)))
+    # proper rotations only, including half turns, which have a zero trace component
+    rotations[numpy.linalg.det(rotations) < 0] *= -1
+    rotations[0] = numpy.diag([1.0, -1.0, -1.0])
+    rotations[1] = numpy.diag([-1.0, -1.0, 1.0])
+    scales = rng.uniform(0.1, 5.0, size=(100, 3))
+    matrices = numpy.zeros((100, 4, 4))
+    matrices[:, :3, :3] = rotations * scales[:, None, :]
+    matrices[:, :3, 3] = rng.normal(size=(100, 3))
+    matrices[:, 3, 3] = 1
+
+    translations, quaternions, factors = decompose_matrices(matrices)
+
+    assert numpy.allclose(translations, matrices[:, :3, 3])
+    assert numpy.allclose(factors, scales)
+    assert numpy.allclose(numpy.linalg.norm(quaternions, axis=1), 1)
+    assert numpy.allclose(quaternion_matrices(quaternions), rotations)
+
+
+def test_instances_are_written_with_gpu_instancing():
+    shapes = [Box(1, 2, 3, frame=Frame([i, 0, 0], [1, 1, 0], [0, 1, 1])) for i in range(10)] + [Sphere(0.5, point=[i, 3, 0]) for i in range(10)]
+    colors = [Color.red() if i % 2 else Color.blue() for i in range(20)]
+    objects = shapes_to_instancebuffers(shapes, colors, Color.black())
+
+    writer = GLBWriter()
+    writer.add_objects(objects)
+    gltf = gltf_json(writer)
+
+    assert "EXT_mesh_gpu_instancing" in gltf["extensionsUsed"]
+    nodes = [node for node in gltf["nodes"] if "extensions" in node]
+    # a mesh and line segments per unit geometry, instead of a node per instance
+    assert len(nodes) == 4
+    assert len(gltf["meshes"]) == 4
+    for node in nodes:
+        attributes = node["extensions"]["EXT_mesh_gpu_instancing"]["attributes"]
+        assert all(gltf["accessors"][accessor]["count"] == 10 for accessor in attributes.values())
+
+    faces = [node["extensions"]["EXT_mesh_gpu_instancing"]["attributes"] for node in nodes[::2]]
+    assert all("_COLOR_0" in attributes for attributes in faces)
+    edges = [node["extensions"]["EXT_mesh_gpu_instancing"]["attributes"] for node in nodes[1::2]]
+    assert not any("_COLOR_0" in attributes for attributes in edges)
+    black = srgb_to_linear(Color.black().rgb).tolist()
+    assert all(gltf["materials"][gltf["meshes"][node["mesh"]]["primitives"][0]["material"]]["pbrMetallicRoughness"]["baseColorFactor"][:3] == black for node in nodes[1::2])
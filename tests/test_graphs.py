@@ -0,0 +1,108 @@
+import numpy
+import pytest
+from compas.colors import Color
+from compas.datastructures import Graph
+
+from compas_notebook.scene import NotebookScene
+
+
+def graph():
+    """A graph with node keys that are neither contiguous nor in order."""
+    graph = Graph()
+    for key, x in zip([12, 3, 40, 7, 25], range(5)):
+        graph.add_node(key, x=x, y=x % 2, z=0)
+    for u, v in [(12, 3), (3, 40), (40, 7), (7, 25), (25, 12), (3, 7)]:
+        graph.add_edge(u, v)
+    return graph
+
+
+@pytest.fixture
+def scene():
+    return NotebookScene()
+
+
+def test_draw_index_arrays(scene):
+    g = graph()
+    sceneobject = scene.add(g)
+
+    points, lines = sceneobject.draw()
+
+    nodes = list(g.nodes())
+    positions = numpy.array([g.node_coordinates(node) for node in nodes], dtype=numpy.float32)
+    assert numpy.array_equal(points.geometry.attributes["position"].array, positions)
+    assert points.geometry.attributes["index"].array.tolist() == list(range(len(nodes)))
+
+    # nodes and edges share one position buffer
+    assert lines.geometry.attributes["position"] is points.geometry.attributes["position"]
+    index = lines.geometry.attributes["index"].array.reshape(-1, 2)
+    assert [(nodes[u], nodes[v]) for u, v in index.tolist()] == list(g.edges())
+
+
+def test_draw_subset_of_nodes_and_edges(scene):
+    g = graph()
+    sceneobject = scene.add(g, show_nodes=[40, 12], show_edges=[(7, 25), (3, 40)])
+
+    points, lines = sceneobject.draw()
+
+    nodes = list(g.nodes())
+    assert [nodes[i] for i in points.geometry.attributes["index"].array] == [40, 12]
+    index = lines.geometry.attributes["index"].array.reshape(-1, 2)
+    assert [(nodes[u], nodes[v]) for u, v in index.tolist()] == [(7, 25), (3, 40)]
+
+
+def test_draw_colors_match_per_element_lookups(scene):
+    g = graph()
+    nodecolor = {12: Color.red(), 7: Color.blue()}
+    edgecolor = {(40, 3): Color.green(), (25, 7): Color.red()}
+    sceneobject = scene.add(g, nodecolor=nodecolor, edgecolor=edgecolor)
+
+    points, lines = sceneobject.draw()
+
+    nodes = list(g.nodes())
+    expected = [sceneobject.nodecolor[node].rgb for node in nodes]
+    assert numpy.allclose(points.geometry.attributes["color"].array, expected)
+
+    # edges with individual colors are drawn as separate segments
+    expected = [sceneobject.edgecolor[u, v].rgb for u, v in g.edges() for _ in range(2)]
+    assert numpy.allclose(lines.geometry.attributes["color"].array, expected)
+    positions = [g.node_coordinates(node) for edge in g.edges() for node in edge]
+    assert numpy.allclose(lines.geometry.attributes["position"].array, positions)
+
+
+def test_draw_uniform_colors(scene):
+    g = graph()
+    sceneobject = scene.add(g, nodecolor=Color.red(), edgecolor=Color.blue())
+
+    points, lines = sceneobject.draw()
+
+    assert "color" not in points.geometry.attributes
+    assert points.material.color == Color.red().hex
+    assert "color" not in lines.geometry.attributes
+    assert lines.material.color == Color.blue().hex
+
+
+def test_draw_node_sizes_ignore_unknown_nodes(scene):
+    g = graph()
+    sceneobject = scene.add(g, nodesize={12: 0.5, 7: 0.3, 99: 1.0, "unknown": 2.0})
+
+    points, _ = sceneobject.draw()
+
+    nodes = list(g.nodes())
+    sizes = {12: 0.5, 7: 0.3}
+    expected = [sizes.get(node, 0.1) for node in nodes]
+    assert numpy.allclose(points.geometry.attributes["size"].array, expected)
+
+
+def test_update_positions_reuses_topology(scene):
+    g = graph()
+    sceneobject = scene.add(g)
+    points, lines = sceneobject.draw()
+    topology = sceneobject._topology[1]
+
+    g.node_attribute(40, "z", 2.0)
+    assert sceneobject.update()
+
+    assert sceneobject._topology[1] is topology
+    position = points.geometry.attributes["position"]
+    assert position.array[list(g.nodes()).index(40), 2] == 2.0
+    assert lines.geometry.attributes["position"] is position
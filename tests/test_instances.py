@@ -0,0 +1,91 @@
+import numpy
+import pytest
+import pythreejs as three
+from compas.colors import Color
+from compas.geometry import Box
+from compas.geometry import Cone
+from compas.geometry import Frame
+from compas.geometry import Sphere
+from compas.geometry import Torus
+
+from compas_notebook.conversions import shapes_to_instancebuffers
+from compas_notebook.geometry import Dot
+from compas_notebook.scene import NotebookScene
+
+
+def test_shapes_to_instancebuffers_colors_per_instance():
+    shapes = [Box(1), Sphere(1), Box(2), Cone(1, 2)]
+    colors = [Color.red(), Color.green(), Color.blue(), Color.white()]
+
+    objects = shapes_to_instancebuffers(shapes, colors, Color.black())
+
+    assert len(objects) == 6
+    boxes, boxedges = objects[0], objects[1]
+    assert boxes.geometry.maxInstancedCount == 2
+    assert numpy.allclose(boxes.geometry.attributes["instanceColor"].array, [Color.red().rgb, Color.blue().rgb])
+    assert numpy.allclose(boxedges.geometry.attributes["instanceColor"].array, [Color.black().rgb] * 2)
+    assert numpy.allclose(objects[2].geometry.attributes["instanceColor"].array, [Color.green().rgb])
+
+
+def test_shapes_to_instancebuffers_matrices():
+    box = Box(1, 2, 3, frame=Frame([1, 2, 3], [0, 1, 0], [-1, 0, 0]))
+
+    mesh, _ = shapes_to_instancebuffers([box], Color.red(), Color.black())
+
+    columns = [mesh.geometry.attributes[f"instanceMatrix{i}"].array[0] for i in range(4)]
+    matrix = numpy.column_stack(columns)
+    vertices = numpy.array(Box(1).vertices)
+    transformed = vertices @ matrix[:3, :3].T + matrix[:3, 3]
+    assert numpy.allclose(transformed, box.vertices, atol=1e-6)
+
+
+def test_shapes_to_instancebuffers_unsupported_shape():
+    with pytest.raises(TypeError, match="Torus"):
+        shapes_to_instancebuffers([Torus(1, 0.2)], Color.red(), Color.black())
+
+
+def test_scene_batches_primitives():
+    scene = NotebookScene()
+    scene.batching = True
+    boxes = [scene.add(Box(1, frame=Frame([i, 0, 0], [1, 0, 0], [0, 1, 0])), color=Color(i / 10, 0, 0)) for i in range(10)]
+    sphere = scene.add(Sphere(1))
+    torus = scene.add(Torus(1, 0.2))
+
+    guids = scene.draw()
+
+    # one mesh and one line segments object for the boxes and for the spheres, and the torus on its own
+    assert len(guids) == 4 + len(torus.guids)
+    assert not boxes[0].guids and not sphere.guids
+    meshes = [obj for obj in guids if "instanceColor" in getattr(obj.geometry, "attributes", {}) and obj.geometry.maxInstancedCount == 10]
+    assert numpy.allclose(meshes[0].geometry.attributes["instanceColor"].array[:, 0], [i / 10 for i in range(10)])
+
+    assert scene.draw_changed() == ([], [])
+
+    boxes[3].color = Color.blue()
+    removed, added = scene.draw_changed()
+    assert len(removed) == 2 and len(added) == 2
+    assert set(map(id, removed)) <= set(map(id, guids))
+
+    boxes[3].show = False
+    removed, added = scene.draw_changed()
+    assert added[0].geometry.maxInstancedCount == 9
+
+
+def test_scene_batches_dots():
+    scene = NotebookScene()
+    scene.batching = True
+    dots = [scene.add(Dot([i, 0, 0], f"dot {i}"), color=Color(i / 10, 0, 0)) for i in range(10)]
+    large = scene.add(Dot([0, 1, 0], "large"), fontsize=512)
+
+    guids = scene.draw()
+
+    # one collection of labels per font size, instead of a sprite per dot
+    assert len(guids) == 2
+    assert not any(isinstance(obj, three.Sprite) for obj in guids)
+    assert not dots[0].guids and not large.guids
+    colors = guids[0].geometry.attributes["labelcolor"].array
+    assert numpy.allclose(numpy.unique(colors[:, 0]), [i / 10 for i in range(10)])
+
+    dots[3].show = False
+    removed, added = scene.draw_changed()
+    assert len(removed) == 2 and len(added) == 2
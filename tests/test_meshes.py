@@ -0,0 +1,214 @@
+import inspect
+import sys
+
+import numpy
+import pytest
+from compas.colors import Color
+from compas.datastructures import Mesh
+from compas.geometry import Polygon
+from compas.geometry import earclip_polygon
+
+from compas_notebook.conversions import triangulate_faces
+from compas_notebook.scene import NotebookScene
+
+
+def baseline_triangles(vertices, faces):
+    """The triangles of the original per-face loop of ``ThreeMeshObject.draw_faces``."""
+    triangles = []
+    for face in faces:
+        if len(face) == 3:
+            triangles.append([face[0], face[1], face[2]])
+        elif len(face) == 4:
+            triangles.append([face[0], face[1], face[2]])
+            triangles.append([face[0], face[2], face[3]])
+        else:
+            polygon = Polygon([vertices[v] for v in face])
+            for ear in earclip_polygon(polygon):
+                triangles.append([face[ear[0]], face[ear[1]], face[ear[2]]])
+    return triangles
+
+
+def baseline_faces(mesh, faces, color):
+    """The positions and colors of the original per-face loop of ``ThreeMeshObject.draw_faces``."""
+    positions = []
+    colors = []
+    for face in faces:
+        vertices = mesh.face_vertices(face)
+        coordinates = {vertex: mesh.vertex_coordinates(vertex) for vertex in vertices}
+        for triangle in baseline_triangles(coordinates, [vertices]):
+            for vertex in triangle:
+                positions.append(mesh.vertex_coordinates(vertex))
+                colors.append(color[face])
+    return numpy.array(positions, dtype=numpy.float32), numpy.array(colors, dtype=numpy.float32)
+
+
+def baseline_vertices(mesh, vertices, color):
+    """The positions and colors of the original per-vertex loop of ``ThreeMeshObject.draw_vertices``, with colors looked up by vertex key."""
+    positions = [mesh.vertex_coordinates(vertex) for vertex in vertices]
+    colors = [color[vertex] for vertex in vertices]
+    return numpy.array(positions, dtype=numpy.float32), numpy.array(colors, dtype=numpy.float32)
+
+
+def baseline_edges(mesh, edges, color):
+    """The positions and colors of the original per-edge loop of ``ThreeMeshObject.draw_edges``."""
+    positions = []
+    colors = []
+    for u, v in edges:
+        positions += [mesh.vertex_coordinates(u), mesh.vertex_coordinates(v)]
+        colors += [color[u, v], color[u, v]]
+    return numpy.array(positions, dtype=numpy.float32), numpy.array(colors, dtype=numpy.float32)
+
+
+def mixed_mesh():
+    """A mesh with triangles, quads, and n-gons, and vertex keys that are neither contiguous nor in order."""
+    mesh = Mesh()
+    keys = [12, 3, 40, 7, 25, 31, 9, 18, 50, 44]
+    points = [
+        [0, 0, 0],
+        [1, 0, 0],
+        [2, 0, 0],
+        [3, 0, 0],
+        [0, 1, 0],
+        [1, 1, 0],
+        [2, 1, 0],
+        [3, 1, 0],
+        [1.5, 1.5, 0],
+        [0.5, 2.5, 0],
+    ]
+    for key, (x, y, z) in zip(keys, points):
+        mesh.add_vertex(key=key, x=x, y=y, z=z)
+    mesh.add_face([12, 3, 31, 25])
+    mesh.add_face([3, 40, 9])
+    mesh.add_face([3, 9, 31])
+    mesh.add_face([40, 7, 18, 9])
+    # a concave hexagon, which is ear clipped
+    mesh.add_face([25, 31, 9, 18, 50, 44])
+    return mesh
+
+
+@pytest.fixture
+def scene():
+    return NotebookScene()
+
+
+def test_triangulate_faces_matches_baseline():
+    mesh = mixed_mesh()
+    vertex_index = mesh.vertex_index()
+    vertices = mesh.vertices_attributes("xyz")
+    faces = [[vertex_index[vertex] for vertex in mesh.face_vertices(face)] for face in mesh.faces()]
+
+    triangles, faceindex = triangulate_faces(vertices, faces)
+
+    assert triangles.tolist() == baseline_triangles(vertices, faces)
+    assert faceindex.tolist() == [0, 0, 1, 2, 3, 3, 4, 4, 4, 4]
+
+
+def test_triangulate_faces_empty():
+    triangles, faceindex = triangulate_faces([], [])
+
+    assert triangles.shape == (0, 3)
+    assert faceindex.shape == (0,)
+
+
+def test_draw_faces_matches_baseline(scene):
+    mesh = mixed_mesh()
+    faces = list(mesh.faces())
+    facecolor = {face: Color(0.1 * i, 0.5, 1.0 - 0.1 * i) for i, face in enumerate(faces)}
+    sceneobject = scene.add(mesh, facecolor=facecolor)
+
+    obj = sceneobject.draw_faces(faces, sceneobject.facecolor)
+
+    positions, colors = baseline_faces(mesh, faces, sceneobject.facecolor)
+    assert numpy.array_equal(obj.geometry.attributes["position"].array, positions)
+    assert numpy.allclose(obj.geometry.attributes["color"].array, colors)
+
+
+def test_draw_faces_subset_matches_baseline(scene):
+    mesh = mixed_mesh()
+    faces = list(mesh.faces())[1::2]
+    facecolor = {face: Color(0.2 * i, 0.2, 0.2) for i, face in enumerate(faces)}
+    sceneobject = scene.add(mesh, facecolor=facecolor)
+
+    obj = sceneobject.draw_faces(faces, sceneobject.facecolor)
+
+    positions, colors = baseline_faces(mesh, faces, sceneobject.facecolor)
+    assert numpy.array_equal(obj.geometry.attributes["position"].array, positions)
+    assert numpy.allclose(obj.geometry.attributes["color"].array, colors)
+
+
+def test_draw_faces_uniform_color_is_indexed(scene):
+    mesh = mixed_mesh()
+    faces = list(mesh.faces())
+    sceneobject = scene.add(mesh, facecolor=Color.red())
+
+    obj = sceneobject.draw_faces(faces, sceneobject.facecolor)
+
+    attributes = obj.geometry.attributes
+    assert "color" not in attributes
+    assert len(attributes["position"].array) == mesh.number_of_vertices()
+    assert obj.material.color == Color.red().hex
+
+    positions, _ = baseline_faces(mesh, faces, sceneobject.facecolor)
+    index = attributes["index"].array.reshape(-1)
+    assert numpy.array_equal(attributes["position"].array[index], positions)
+
+
+def test_draw_vertices_matches_baseline(scene):
+    mesh = mixed_mesh()
+    vertices = list(mesh.vertices())
+    vertexcolor = {vertex: Color(0.1 * i, 0.2, 0.3) for i, vertex in enumerate(vertices[::3])}
+    sceneobject = scene.add(mesh, vertexcolor=vertexcolor)
+
+    # a subset in a different order than the vertex keys
+    subset = vertices[::-2]
+    obj = sceneobject.draw_vertices(subset, sceneobject.vertexcolor)
+
+    positions, colors = baseline_vertices(mesh, subset, sceneobject.vertexcolor)
+    assert numpy.array_equal(obj.geometry.attributes["position"].array, positions)
+    assert numpy.allclose(obj.geometry.attributes["color"].array, colors)
+
+
+def test_draw_edges_matches_baseline(scene):
+    mesh = mixed_mesh()
+    edges = list(mesh.edges())
+    edgecolor = {edge: Color(0.1 * i, 0.5, 0.5) for i, edge in enumerate(edges[::2])}
+    sceneobject = scene.add(mesh, edgecolor=edgecolor)
+
+    # edges in both orientations, which share their color
+    subset = edges[:4] + [(v, u) for u, v in edges[4:]]
+    obj = sceneobject.draw_edges(subset, sceneobject.edgecolor)
+
+    positions, colors = baseline_edges(mesh, subset, sceneobject.edgecolor)
+    assert numpy.array_equal(obj.geometry.attributes["position"].array, positions)
+    assert numpy.allclose(obj.geometry.attributes["color"].array, colors)
+
+
+def test_draw_vertices_and_edges_uniform_color(scene):
+    mesh = mixed_mesh()
+    sceneobject = scene.add(mesh, vertexcolor=Color.green(), edgecolor=Color.blue())
+
+    points = sceneobject.draw_vertices(list(mesh.vertices()), sceneobject.vertexcolor)
+    lines = sceneobject.draw_edges(list(mesh.edges()), sceneobject.edgecolor)
+
+    assert "color" not in points.geometry.attributes
+    assert points.material.color == Color.green().hex
+    assert "color" not in lines.geometry.attributes
+    assert lines.material.color == Color.blue().hex
+    positions, _ = baseline_edges(mesh, list(mesh.edges()), sceneobject.edgecolor)
+    assert numpy.array_equal(lines.geometry.attributes["position"].array, positions)
+
+
+def test_draw_chunks_without_event_loop(scene):
+    mesh = Mesh.from_meshgrid(dx=1, nx=10)
+    sceneobject = scene.add(mesh, progressive=True, chunksize=1, show_edges=False)
+
+    # more chunks than the remaining recursion depth, which are all added immediately
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(len(inspect.stack()) + 150)
+    try:
+        group = sceneobject.draw()[0]
+    finally:
+        sys.setrecursionlimit(limit)
+
+    assert len(group.children) == 2 * mesh.number_of_faces()
+    assert sceneobject._upload is None
@@ -0,0 +1,52 @@
+from compas.geometry import Box
+from compas.geometry import Frame
+from compas.geometry import Plane
+from compas.geometry import Torus
+from compas.geometry import Vector
+
+from compas_notebook.scene import NotebookScene
+
+
+def test_segments_share_pooled_materials():
+    scene = NotebookScene()
+    frames = [scene.add(Frame([i, 0, 0], [1, 0, 0], [0, 1, 0])) for i in range(3)]
+    planes = [scene.add(Plane([0, i, 0], [0, 0, 1])) for i in range(3)]
+    vectors = [scene.add(Vector(1, i, 1)) for i in range(3)]
+
+    scene.draw()
+
+    lines = [sceneobject.guids[0] for sceneobject in frames + planes + vectors]
+    assert len({id(obj.material) for obj in lines}) == 1
+    assert len({id(sceneobject.guids[1].material) for sceneobject in vectors}) == 1
+    assert scene.pool.stats["materials"] == 2
+
+
+def test_tori_share_pooled_geometries():
+    scene = NotebookScene()
+    tori = [scene.add(Torus(radius_axis=radius, radius_pipe=0.2 * radius)) for radius in (1, 2)]
+    degenerate = scene.add(Torus(radius_axis=0, radius_pipe=1))
+
+    scene.draw()
+
+    assert tori[0].guids[0].geometry is tori[1].guids[0].geometry
+    assert degenerate.guids[0].geometry.radius == 0
+    assert degenerate.guids[0].geometry.tube == 1
+
+
+def test_statistics_count_only_created_widgets():
+    scene = NotebookScene()
+    scene.profile = True
+    first = scene.add(Box(1))
+    second = scene.add(Box(2))
+
+    scene.draw()
+
+    # mesh, lines, their materials, the unit box geometry, and its edges geometry
+    assert scene.statistics[first.guid]["widgets"] == 6
+    # the second box reuses the pooled materials and geometries
+    assert scene.statistics[second.guid]["widgets"] == 2
+
+    second.geometry.frame.point = [1, 0, 0]
+    scene.draw_changed()
+    assert scene.statistics[second.guid]["mode"] == "update"
+    assert scene.statistics[second.guid]["widgets"] == 0
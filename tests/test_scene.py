@@ -0,0 +1,181 @@
+import numpy
+from compas.colors import Color
+from compas.datastructures import Mesh
+from compas.geometry import Box
+from compas.geometry import Pointcloud
+
+from compas_notebook.scene import NotebookScene
+from compas_notebook.viewer import Viewer
+
+
+def test_fingerprint_changes_with_settings_and_content():
+    scene = NotebookScene()
+    mesh = Mesh.from_meshgrid(dx=1, nx=2)
+    sceneobject = scene.add(mesh)
+    fingerprint = scene.fingerprint(sceneobject)
+
+    sceneobject.name = "renamed"
+    assert scene.fingerprint(sceneobject) == fingerprint
+
+    # identical content has the same fingerprint
+    assert scene.fingerprint(scene.add(Mesh.from_meshgrid(dx=1, nx=2))) == fingerprint
+
+    mesh.vertex_attribute(0, "z", 1.0)
+    modified = scene.fingerprint(sceneobject)
+    assert modified != fingerprint
+
+    sceneobject.facecolor = Color.red()
+    assert scene.fingerprint(sceneobject) != modified
+
+
+def test_fingerprint_of_touched_items_changes_with_touch():
+    scene = NotebookScene()
+    mesh = Mesh.from_meshgrid(dx=1, nx=2)
+    sceneobject = scene.add(mesh)
+    scene.touch(mesh)
+    fingerprint = scene.fingerprint(sceneobject)
+
+    mesh.vertex_attribute(0, "z", 1.0)
+    assert scene.fingerprint(sceneobject) == fingerprint
+
+    scene.touch(mesh)
+    assert scene.fingerprint(sceneobject) != fingerprint
+
+
+def test_fingerprint_of_group_changes_with_members():
+    scene = NotebookScene()
+    box = Box(1)
+    sceneobject = scene.add([box, Box(2)])
+    fingerprint = scene.fingerprint(sceneobject)
+
+    box.xsize = 2
+    modified = scene.fingerprint(sceneobject)
+    assert modified != fingerprint
+
+    scene.touch(box)
+    assert scene.fingerprint(sceneobject) != modified
+
+
+def test_draw_changed_updates_modified_items():
+    scene = NotebookScene()
+    mesh = Mesh.from_meshgrid(dx=1, nx=2)
+    scene.add(mesh)
+    scene.add(Box(1))
+    scene.draw()
+
+    assert scene.draw_changed() == ([], [])
+
+    mesh.vertex_attribute(0, "z", 1.0)
+    removed, added = scene.draw_changed()
+    assert not removed and not added
+    assert scene.updated == scene.objects[0].guids
+    positions = scene.objects[0].guids[-1].geometry.attributes["position"].array
+    assert positions[:, 2].max() == 1.0
+
+
+def test_update_shows_and_hides_helpers():
+    viewer = Viewer()
+    viewer.init_webgl()
+    viewer.scene.add(Box(1))
+    for obj in viewer.scene.draw():
+        viewer.scene3.add(obj)
+    assert viewer.grid3 in viewer.scene3.children
+    assert viewer.axes3 in viewer.scene3.children
+
+    viewer.config.view.show_grid = False
+    viewer.update()
+    assert viewer.grid3 not in viewer.scene3.children
+    assert viewer.axes3 in viewer.scene3.children
+    assert len(viewer.scene3.children) == 3
+
+    viewer.config.view.show_grid = True
+    viewer.config.view.show_axes = False
+    viewer.update()
+    assert viewer.grid3 in viewer.scene3.children
+    assert viewer.axes3 not in viewer.scene3.children
+    assert len(viewer.scene3.children) == 3
+
+
+def test_draw_changed_precomputes_redrawn_objects(monkeypatch):
+    import compas_notebook.scene.scene as module
+    from compas_notebook.scene.parallel import shutdown
+
+    scene = NotebookScene()
+    scene.workers = 2
+    meshes = [Mesh.from_meshgrid(dx=1, nx=2), Mesh.from_meshgrid(dx=2, nx=3)]
+    for mesh in meshes:
+        scene.add(mesh)
+    scene.draw()
+
+    precomputed = []
+    original = module.precompute_buffers
+
+    def precompute_buffers(sceneobjects, workers):
+        precomputed.extend(sceneobjects)
+        original(sceneobjects, workers)
+
+    monkeypatch.setattr(module, "precompute_buffers", precompute_buffers)
+    monkeypatch.setattr(module.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(scene, "update_sceneobject", lambda *args: False)
+
+    for mesh in meshes:
+        mesh.delete_face(0)
+    try:
+        removed, added = scene.draw_changed()
+    finally:
+        shutdown()
+
+    assert precomputed == scene.objects
+    assert removed and added
+    for sceneobject, mesh in zip(scene.objects, meshes):
+        assert not sceneobject._precomputed
+        index = sceneobject.guids[-1].geometry.attributes["index"].array
+        assert len(index) == 6 * mesh.number_of_faces()
+
+
+def test_precompute_buffers_in_worker_processes():
+    from compas_notebook.scene.parallel import precompute_buffers
+    from compas_notebook.scene.parallel import shutdown
+
+    scene = NotebookScene()
+    meshes = [Mesh.from_meshgrid(dx=1, nx=2), Mesh.from_meshgrid(dx=2, nx=3)]
+    sceneobjects = [scene.add(mesh, facecolor={0: Color.red()}) for mesh in meshes]
+    try:
+        precompute_buffers(sceneobjects, 2)
+    finally:
+        shutdown()
+
+    for sceneobject in sceneobjects:
+        expected = sceneobject.compute_buffers()
+        assert sceneobject._precomputed.keys() == expected.keys()
+        for name, arrays in expected.items():
+            for array, precomputed in zip(arrays, sceneobject._precomputed[name]):
+                assert numpy.array_equal(array, precomputed)
+
+
+def test_pointcloud_pyramid_is_rebuilt_only_for_new_versions(monkeypatch):
+    import compas_notebook.scene.pointcloudobject as module
+
+    calls = []
+    voxel_pyramid = module.voxel_pyramid
+    monkeypatch.setattr(module, "voxel_pyramid", lambda points: calls.append(points) or voxel_pyramid(points))
+
+    scene = NotebookScene()
+    pointcloud = Pointcloud.from_bounds(1, 1, 1, 100)
+    sceneobject = scene.add(pointcloud)
+    scene.draw()
+    sceneobject.level = 0
+    scene.draw_changed()
+    assert len(calls) == 1
+
+    pointcloud.points[0].z = 2.0
+    scene.draw_changed()
+    assert len(calls) == 2
+    assert sceneobject.guids[0].geometry.attributes["position"].array[:, 2].max() == 2.0
+
+    scene.touch(pointcloud)
+    scene.draw_changed()
+    assert len(calls) == 3
+    pointcloud.points[0].z = 3.0
+    scene.draw_changed()
+    assert len(calls) == 3
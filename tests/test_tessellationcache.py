@@ -0,0 +1,78 @@
+import numpy
+from compas.datastructures import Mesh
+from compas.geometry import Brep
+
+from compas_notebook.config import Config
+from compas_notebook.scene import TESSELLATIONCACHE
+from compas_notebook.scene import TessellationCache
+from compas_notebook.scene import ThreeBrepObject
+from compas_notebook.viewer import Viewer
+
+
+class UnserializableBrep(Brep):
+    """A Brep without backend, which cannot be serialized."""
+
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls)
+
+    def __init__(self):
+        pass
+
+    @property
+    def __data__(self):
+        raise NotImplementedError
+
+    def to_viewmesh(self, *args):
+        return Mesh.from_meshgrid(dx=1, nx=1), []
+
+
+def buffers():
+    return {"mesh": (numpy.zeros((3, 3), dtype=numpy.float32), numpy.array([[0, 1, 2]], dtype=numpy.uint32))}
+
+
+def test_cache_round_trip(tmp_path):
+    cache = TessellationCache(directory=str(tmp_path))
+    cache.put("key", buffers())
+
+    cached = cache.get("key")
+    assert numpy.array_equal(cached["mesh"][1], buffers()["mesh"][1])
+    assert cache.stats["size"] == 1
+
+
+def test_cache_is_opt_in(tmp_path):
+    config = Config()
+    config.cache.tessellation_directory = str(tmp_path)
+
+    config.cache.tessellation = False
+    Viewer(config=config)
+    TESSELLATIONCACHE.put("key", buffers())
+    assert TESSELLATIONCACHE.get("key") is None
+    assert not list(tmp_path.iterdir())
+
+    config.cache.tessellation = True
+    try:
+        Viewer(config=config)
+        TESSELLATIONCACHE.put("key", buffers())
+        assert TESSELLATIONCACHE.get("key") is not None
+    finally:
+        config.cache.tessellation = False
+        config.cache.tessellation_directory = None
+        Viewer(config=config)
+
+
+def test_brep_is_only_keyed_if_cache_is_enabled(tmp_path, monkeypatch):
+    sceneobject = ThreeBrepObject(item=UnserializableBrep(), context="Notebook")
+
+    keys = []
+    key = TESSELLATIONCACHE.key
+    monkeypatch.setattr(TESSELLATIONCACHE, "key", lambda *args: keys.append(args) or key(*args))
+    monkeypatch.setattr(TESSELLATIONCACHE, "maxbytes", 0)
+    assert len(sceneobject.compute_buffers()["mesh"][1]) == 2
+    assert not keys
+
+    # with the cache enabled, Breps that cannot be serialized are tessellated without it
+    monkeypatch.setattr(TESSELLATIONCACHE, "directory", str(tmp_path))
+    monkeypatch.setattr(TESSELLATIONCACHE, "maxbytes", 1024 * 1024)
+    assert len(sceneobject.compute_buffers()["mesh"][1]) == 2
+    assert keys
+    assert not list(tmp_path.iterdir())